@@ -6,6 +6,8 @@ from typing import Dict, Any, List, Optional
 import logging
 import queue
 import threading
+import time
+from enum import Enum
 from dataclasses import dataclass
 
 @dataclass
@@ -18,6 +20,26 @@ class DetectionEvent:
     location: Optional[Dict[str, float]] = None  # For future GPS integration
     camera_id: Optional[str] = None
     metadata: Optional[Dict[str, Any]] = None
+    vehicle_details: Optional[Dict[str, Any]] = None
+
+    def to_record(self) -> Dict[str, Any]:
+        """Detection dict as expected by DatabaseInterface.insert_detection"""
+        return {
+            'text': self.plate_text,
+            'confidence': self.confidence,
+            'timestamp_utc': self.timestamp_utc,
+            'timestamp_local': self.timestamp_local,
+            'camera_id': self.camera_id,
+            'location': self.location,
+            'metadata': self.metadata,
+            'vehicle_details': self.vehicle_details or {}
+        }
+
+class OverflowPolicy(Enum):
+    """What distribute_event does when a consumer queue is full"""
+    DROP_OLDEST = "drop_oldest"  # discard the oldest queued event, the new one is kept
+    DROP_NEWEST = "drop_newest"  # discard the new event
+    BLOCK = "block"              # wait up to block_timeout, then discard the new event
 
 class DataConsumer(ABC):
     """Abstract base class for database-specific consumers"""
@@ -38,96 +60,198 @@ class DataConsumer(ABC):
         pass
 
 class DataDistributor:
-    """Manages data distribution to various consumer databases"""
+    """
+    Manages data distribution to various consumer databases.
+
+    Every consumer has its own bounded queue and writer thread. A writer hands a batch to the
+    consumer once batch_size events are queued or processing_interval seconds have passed since
+    the batch was started, so producers never wait on database latency. Failed batches are retried
+    up to max_retries times, stop() drains the queues before returning.
+    """
     
-    def __init__(self, batch_size: int = 100, processing_interval: float = 1.0):
+    def __init__(self, batch_size: int = 100, processing_interval: float = 1.0,
+                 max_queue_size: int = 10000,
+                 overflow_policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+                 block_timeout: float = 0.05,
+                 max_retries: int = 3):
         self.consumers: Dict[str, DataConsumer] = {}
         self.queues: Dict[str, queue.Queue] = {}
+        self.stats: Dict[str, Dict[str, Any]] = {}
         self.batch_size = batch_size
         self.processing_interval = processing_interval
+        self.max_queue_size = max_queue_size
+        self.overflow_policy = OverflowPolicy(overflow_policy)
+        self.block_timeout = block_timeout
+        self.max_retries = max_retries
         self.is_running = False
         self.threads: Dict[str, threading.Thread] = {}
+        self._stop_event = threading.Event()
         self.logger = logging.getLogger(__name__)
 
     def register_consumer(self, name: str, consumer: DataConsumer):
         """Register a new database consumer"""
         self.consumers[name] = consumer
-        self.queues[name] = queue.Queue()
+        self.queues[name] = queue.Queue(maxsize=max(0, self.max_queue_size))
+        self.stats[name] = {'queued': 0, 'written': 0, 'dropped': 0, 'failed_batches': 0, 'batches': 0}
         self.logger.info(f"Registered new consumer: {name}")
+        if self.is_running:
+            self._start_thread(name, consumer)
+
+    def distribute_event(self, detection: DetectionEvent) -> bool:
+        """Queue a detection event for all consumers, never blocks longer than block_timeout"""
+        accepted = True
+        for name, event_queue in self.queues.items():
+            if self._enqueue(name, event_queue, detection):
+                self.stats[name]['queued'] += 1
+                self.logger.debug(f"Queued detection {detection.plate_text} for {name}")
+            else:
+                accepted = False
+        return accepted
 
-    def distribute_event(self, detection: DetectionEvent):
-        """Distribute a detection event to all consumers"""
-        for name, q in self.queues.items():
-            q.put(detection)
-            self.logger.debug(f"Queued detection {detection.plate_text} for {name}")
+    def _enqueue(self, name: str, event_queue: queue.Queue, detection: DetectionEvent) -> bool:
+        try:
+            if self.overflow_policy is OverflowPolicy.BLOCK:
+                event_queue.put(detection, timeout=self.block_timeout)
+            else:
+                event_queue.put_nowait(detection)
+            return True
+        except queue.Full:
+            pass
+
+        if self.overflow_policy is OverflowPolicy.DROP_OLDEST:
+            for _ in range(3):
+                try:
+                    self._count_dropped(name, event_queue.get_nowait())
+                except queue.Empty:
+                    pass
+                try:
+                    event_queue.put_nowait(detection)
+                    return True
+                except queue.Full:
+                    continue
+
+        self._count_dropped(name, detection)
+        return False
+
+    def _count_dropped(self, name: str, detection: DetectionEvent):
+        stats = self.stats[name]
+        stats['dropped'] += 1
+        # A stalled database drops many events, only log every 100th
+        if stats['dropped'] % 100 == 1:
+            self.logger.warning(f"Queue for {name} is full, dropped detection {detection.plate_text} "
+                                f"({stats['dropped']} dropped so far)")
 
     def start(self):
         """Start processing threads for all consumers"""
         self.is_running = True
+        self._stop_event.clear()
         for name, consumer in self.consumers.items():
-            thread = threading.Thread(
-                target=self._process_queue,
-                args=(name, consumer),
-                name=f"distributor-{name}"
-            )
-            thread.daemon = True
-            thread.start()
-            self.threads[name] = thread
-            self.logger.info(f"Started processing thread for {name}")
-
-    def stop(self):
-        """Stop all processing threads"""
+            if name not in self.threads or not self.threads[name].is_alive():
+                self._start_thread(name, consumer)
+
+    def _start_thread(self, name: str, consumer: DataConsumer):
+        thread = threading.Thread(
+            target=self._process_queue,
+            args=(name, consumer),
+            name=f"distributor-{name}"
+        )
+        thread.daemon = True
+        thread.start()
+        self.threads[name] = thread
+        self.logger.info(f"Started processing thread for {name}")
+
+    def stop(self, flush: bool = True, timeout: float = 10.0):
+        """Stop all processing threads, by default after writing out everything still queued"""
+        if not self.is_running:
+            return
+        if not flush:
+            for name, event_queue in self.queues.items():
+                while True:
+                    try:
+                        event_queue.get_nowait()
+                        self.stats[name]['dropped'] += 1
+                    except queue.Empty:
+                        break
         self.is_running = False
-        for thread in self.threads.values():
-            thread.join()
+        self._stop_event.set()
+        deadline = time.time() + timeout
+        for name, thread in self.threads.items():
+            thread.join(timeout=max(0.0, deadline - time.time()))
+            if thread.is_alive():
+                self.logger.error(f"Processing thread for {name} did not finish, "
+                                  f"{self.queues[name].qsize()} detections not written")
+        self.threads = {}
         self.logger.info("Stopped all processing threads")
 
     def _process_queue(self, name: str, consumer: DataConsumer):
         """Process queue for a specific consumer"""
-        queue = self.queues[name]
+        event_queue = self.queues[name]
         batch = []
+        retries = 0
         
-        while self.is_running:
+        while True:
             try:
-                # Collect batch of events
+                # Collect a batch until it is full or the flush interval has passed
+                deadline = time.time() + self.processing_interval
                 while len(batch) < self.batch_size:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        break
                     try:
-                        detection = queue.get_nowait()
-                        batch.append(detection)
+                        batch.append(event_queue.get(timeout=min(remaining, 0.1)))
                     except queue.Empty:
+                        if not self.is_running:
+                            break
+
+                if not batch:
+                    if not self.is_running:
                         break
+                    continue
 
-                # Process batch if we have any events
-                if batch:
-                    try:
-                        success = consumer.process_batch(batch)
-                        if not success:
-                            self.logger.error(f"Failed to process batch for {name}")
-                            # Requeue failed batch
-                            for detection in batch:
-                                queue.put(detection)
-                    except Exception as e:
-                        self.logger.error(f"Error processing batch for {name}: {str(e)}")
-                        # Requeue failed batch
-                        for detection in batch:
-                            queue.put(detection)
-                    finally:
-                        batch = []
-
-                # Sleep if queue is empty
-                if queue.empty():
-                    threading.Event().wait(self.processing_interval)
+                if self._write_batch(name, consumer, batch):
+                    batch, retries = [], 0
+                    continue
+
+                retries += 1
+                if retries > self.max_retries:
+                    self.stats[name]['dropped'] += len(batch)
+                    self.logger.error(f"Giving up on batch of {len(batch)} detections for {name} "
+                                      f"after {retries} attempts")
+                    batch, retries = [], 0
+                else:
+                    # Back off before retrying the same batch, retries are immediate once stopping
+                    self._stop_event.wait(self.processing_interval * retries)
                     
             except Exception as e:
                 self.logger.error(f"Error in processing thread for {name}: {str(e)}")
 
+    def _write_batch(self, name: str, consumer: DataConsumer, batch: List[DetectionEvent]) -> bool:
+        stats = self.stats[name]
+        count = len(batch)
+        try:
+            success = consumer.process_batch(batch)
+        except Exception as e:
+            self.logger.error(f"Error processing batch for {name}: {str(e)}")
+            success = False
+        stats['batches'] += 1
+        if success:
+            stats['written'] += count
+        else:
+            # Consumers may remove the events they did write from a failed batch
+            stats['written'] += count - len(batch)
+            stats['failed_batches'] += 1
+            self.logger.error(f"Failed to process batch for {name}")
+        return success
+
     def get_status(self) -> Dict[str, Any]:
         """Get current status of all consumers"""
         return {
             name: {
                 'queue_size': self.queues[name].qsize(),
+                'max_queue_size': self.queues[name].maxsize,
                 'last_processed': consumer.get_last_processed_time(),
-                'is_running': name in self.threads and self.threads[name].is_alive()
+                'is_running': name in self.threads and self.threads[name].is_alive(),
+                **self.stats[name]
             }
             for name, consumer in self.consumers.items()
-        }
\ No newline at end of file
+        }
@@ -0,0 +1,55 @@
+# app/database/distribution/database_consumer.py
+
+import logging
+from datetime import datetime, timezone
+from typing import List, Optional
+from .core import DataConsumer, DetectionEvent
+
+logger = logging.getLogger(__name__)
+
+
+class DatabaseConsumer(DataConsumer):
+    """Writes detection events to one of the DatabaseFactory databases (postgres, timeseries)"""
+
+    def __init__(self, database, name: Optional[str] = None):
+        self.database = database
+        self.name = name or database.__class__.__name__
+        self.last_processed_time = None
+
+    def process_detection(self, detection: DetectionEvent) -> bool:
+        """Process a single detection event"""
+        return self.process_batch([detection])
+
+    def process_batch(self, detections: List[DetectionEvent]) -> bool:
+        """
+        Insert the events in one transaction when the database has insert_detections, one by one
+        otherwise. On failure the events already written are removed from the list, so a retry
+        of the batch does not store them twice.
+        """
+        if hasattr(self.database, 'insert_detections'):
+            try:
+                self.database.insert_detections([detection.to_record() for detection in detections],
+                                                return_ids=False)
+                self.last_processed_time = datetime.now(timezone.utc)
+                return True
+            except Exception as e:
+                logger.error(f"Error writing {len(detections)} detections to {self.name}: {str(e)}")
+                return False
+
+        written = 0
+        try:
+            for detection in detections:
+                # TimeSeriesDB reports failures by returning False, PostgresDB raises
+                if self.database.insert_detection(detection.to_record()) is False:
+                    raise RuntimeError(f"insert_detection failed for {detection.plate_text}")
+                written += 1
+            self.last_processed_time = datetime.now(timezone.utc)
+            return True
+        except Exception as e:
+            logger.error(f"Error writing detections to {self.name}: {str(e)}")
+            del detections[:written]
+            return False
+
+    def get_last_processed_time(self) -> datetime:
+        """Get the timestamp of the last processed event"""
+        return self.last_processed_time
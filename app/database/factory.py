@@ -26,7 +26,13 @@ class DatabaseFactory:
                         url=current_app.config['INFLUXDB_URL'],
                         token=current_app.config['INFLUXDB_TOKEN'],
                         org=current_app.config['INFLUXDB_ORG'],
-                        bucket=current_app.config['INFLUXDB_BUCKET']
+                        bucket=current_app.config['INFLUXDB_BUCKET'],
+                        batching=current_app.config.get('INFLUXDB_BATCHING', True),
+                        batch_size=current_app.config.get('INFLUXDB_BATCH_SIZE', 500),
+                        flush_interval_ms=current_app.config.get('INFLUXDB_FLUSH_INTERVAL_MS', 1000),
+                        jitter_interval_ms=current_app.config.get('INFLUXDB_JITTER_INTERVAL_MS', 0),
+                        retry_interval_ms=current_app.config.get('INFLUXDB_RETRY_INTERVAL_MS', 5000),
+                        max_retries=current_app.config.get('INFLUXDB_MAX_RETRIES', 5)
                     )
                 elif db_type == 'postgres':
                     db = PostgresDB(
@@ -34,7 +40,10 @@ class DatabaseFactory:
                         user=current_app.config['POSTGRES_USER'],
                         password=current_app.config['POSTGRES_PASSWORD'],
                         host=current_app.config['POSTGRES_HOST'],
-                        port=current_app.config['POSTGRES_PORT']
+                        port=current_app.config['POSTGRES_PORT'],
+                        pool_size=current_app.config.get('SQLALCHEMY_POOL_SIZE', 5),
+                        max_overflow=current_app.config.get('SQLALCHEMY_MAX_OVERFLOW', 10),
+                        pool_timeout=current_app.config.get('SQLALCHEMY_POOL_TIMEOUT', 30)
                     )
                 else:
                     raise ValueError(f"Unknown database type: {db_type}")
@@ -1,16 +1,33 @@
 # app/database/timeseries_db.py
 
 import logging
+import threading
 from datetime import datetime
-from influxdb_client import InfluxDBClient, Point
-from influxdb_client.client.write_api import SYNCHRONOUS
+from influxdb_client import InfluxDBClient, Point, WriteOptions
+from influxdb_client.client.write_api import SYNCHRONOUS, WriteType
 from .base import DatabaseInterface
-from typing import Dict, Any  # Added this import
+from typing import Dict, Any, Callable, List, Optional  # Added this import
 
 logger = logging.getLogger(__name__)
 
 class TimeSeriesDB(DatabaseInterface):
-    def __init__(self, url, token, org, bucket):
+    """
+    InfluxDB access. With batching on, writes only append points to the client's batching
+    buffer; a background thread sends them every batch_size points or flush_interval_ms,
+    retrying failed requests with exponential backoff. Delivery results are counted
+    in get_write_stats() and reported to metrics_callback(event, stats).
+    """
+
+    def __init__(self, url, token, org, bucket,
+                 batching: bool = True,
+                 batch_size: int = 500,
+                 flush_interval_ms: int = 1000,
+                 jitter_interval_ms: int = 0,
+                 retry_interval_ms: int = 5000,
+                 max_retries: int = 5,
+                 max_retry_delay_ms: int = 125000,
+                 exponential_base: int = 2,
+                 metrics_callback: Optional[Callable[[str, Dict[str, int]], None]] = None):
         super().__init__()
         self.url = url
         self.token = token
@@ -19,6 +36,21 @@ class TimeSeriesDB(DatabaseInterface):
         self.client = None
         self.write_api = None
         self._connected = False  # Add this line
+
+        self.batching = batching
+        self.write_options = WriteOptions(
+            write_type=WriteType.batching,
+            batch_size=batch_size,
+            flush_interval=flush_interval_ms,
+            jitter_interval=jitter_interval_ms,
+            retry_interval=retry_interval_ms,
+            max_retries=max_retries,
+            max_retry_delay=max_retry_delay_ms,
+            exponential_base=exponential_base
+        ) if batching else SYNCHRONOUS
+        self.metrics_callback = metrics_callback
+        self._stats_lock = threading.Lock()
+        self._stats = {'queued': 0, 'written': 0, 'failed': 0, 'retries': 0}
         
         
     def is_connected(self) -> bool:
@@ -41,8 +73,14 @@ class TimeSeriesDB(DatabaseInterface):
                 token=self.token,
                 org=self.org
             )
-            self.write_api = self.client.write_api(write_options=SYNCHRONOUS)
-            logger.info("Successfully connected to InfluxDB")
+            if self.batching:
+                self.write_api = self.client.write_api(write_options=self.write_options,
+                                                       success_callback=self._on_write_success,
+                                                       error_callback=self._on_write_error,
+                                                       retry_callback=self._on_write_retry)
+            else:
+                self.write_api = self.client.write_api(write_options=SYNCHRONOUS)
+            logger.info(f"Successfully connected to InfluxDB ({'batching' if self.batching else 'synchronous'} writes)")
         except Exception as e:
             logger.error(f"Failed to connect to InfluxDB: {str(e)}")
             raise
@@ -50,92 +88,130 @@ class TimeSeriesDB(DatabaseInterface):
     def disconnect(self):
         """Disconnect from InfluxDB"""
         try:
+            if self.write_api:
+                # Sends whatever is still buffered
+                self.write_api.close()
             if self.client:
                 self.client.close()
-                self.client = None
-                self.write_api = None
+            self.client = None
+            self.write_api = None
             logger.info("Disconnected from InfluxDB")
         except Exception as e:
             logger.error(f"Error disconnecting from InfluxDB: {str(e)}")
 
+    @staticmethod
+    def _build_point(detection_data: Dict[str, Any]) -> Point:
+        """license_plate_detection point for a detection dict"""
+        point = Point("license_plate_detection")
+        
+        # Add fields
+        point.field("plate_text", str(detection_data['text']))
+        point.field("confidence", float(detection_data['confidence']))
+        if detection_data.get('camera_id'):
+            point.tag("camera_id", str(detection_data['camera_id']))
+        
+        # Handle timestamp
+        if isinstance(detection_data.get('timestamp_utc'), datetime):
+            point.time(detection_data['timestamp_utc'])
+        
+        # Add vehicle details if available
+        vehicle_details = detection_data.get('vehicle_details') or {}
+        if vehicle_details:
+            for key in ['make', 'model', 'color', 'type']:
+                if vehicle_details.get(key):
+                    point.field(f"vehicle_{key}", str(vehicle_details[key]))
+            if vehicle_details.get('year'):
+                point.field("vehicle_year", int(vehicle_details['year']))
+        return point
+
+    def _write_points(self, points: List[Point]):
+        if not self.client or not self.write_api:
+            self.connect()
+        self.write_api.write(
+            bucket=self.bucket,
+            org=self.org,
+            record=points
+        )
+        self._count('queued' if self.batching else 'written', len(points))
+
     def insert_detection(self, detection_data):
         """Insert detection data into InfluxDB"""
         try:
-            if not self.client or not self.write_api:
-                self.connect()
-
-            # Create point
-            point = Point("license_plate_detection")
-            
-            # Add fields
-            point.field("plate_text", str(detection_data['text']))
-            point.field("confidence", float(detection_data['confidence']))
-            
-            # Handle timestamp
-            if isinstance(detection_data.get('timestamp_utc'), datetime):
-                point.time(detection_data['timestamp_utc'])
-            
-            # Add vehicle details if available
-            vehicle_details = detection_data.get('vehicle_details', {})
-            if vehicle_details:
-                for key in ['make', 'model', 'color', 'type']:
-                    if vehicle_details.get(key):
-                        point.field(f"vehicle_{key}", str(vehicle_details[key]))
-                if vehicle_details.get('year'):
-                    point.field("vehicle_year", int(vehicle_details['year']))
-
-            # Write point
-            self.write_api.write(
-                bucket=self.bucket,
-                org=self.org,
-                record=point
-            )
+            self._write_points([self._build_point(detection_data)])
             
             logger.debug(f"Successfully inserted detection: {detection_data['text']}")
             return True
             
         except Exception as e:
             logger.error(f"Error inserting data into InfluxDB: {str(e)}")
+            self._count('failed', 1)
             return False
 
-            
-            
+    def insert_detections(self, detections: List[Dict[str, Any]], return_ids: bool = False) -> List:
+        """Insert many detections with one write call, InfluxDB has no ids to return"""
+        try:
+            self._write_points([self._build_point(detection) for detection in detections])
+            logger.debug(f"Successfully inserted {len(detections)} detections")
+            return []
+        except Exception as e:
+            logger.error(f"Error inserting {len(detections)} detections into InfluxDB: {str(e)}")
+            self._count('failed', len(detections))
+            raise
+
     def _insert_detection_impl(self, detection_data: Dict[str, Any]) -> None:
         """Insert detection data into InfluxDB"""
         try:
-            # Create point
-            point = Point("license_plate_detection")
-            
-            # Add fields
-            point.field("plate_text", str(detection_data['text']))
-            point.field("confidence", float(detection_data['confidence']))
-            
-            # Handle timestamp
-            if isinstance(detection_data.get('timestamp_utc'), datetime):
-                point.time(detection_data['timestamp_utc'])
-            
-            # Add vehicle details if available
-            vehicle_details = detection_data.get('vehicle_details', {})
-            if vehicle_details:
-                for key in ['make', 'model', 'color', 'type']:
-                    if vehicle_details.get(key):
-                        point.field(f"vehicle_{key}", str(vehicle_details[key]))
-                if vehicle_details.get('year'):
-                    point.field("vehicle_year", int(vehicle_details['year']))
-
-            # Write point
-            self.write_api.write(
-                bucket=self.bucket,
-                org=self.org,
-                record=point
-            )
+            self._write_points([self._build_point(detection_data)])
             
             logger.debug(f"Successfully inserted detection: {detection_data['text']}")
             
         except Exception as e:
             logger.error(f"Error inserting data into InfluxDB: {str(e)}")
             raise
-            
+
+    def flush(self):
+        """Send buffered points now"""
+        if self.batching and self.write_api:
+            self.write_api.flush()
+
+    @staticmethod
+    def _count_lines(data) -> int:
+        if isinstance(data, bytes):
+            data = data.decode('utf-8', errors='ignore')
+        return len([line for line in str(data).split('\n') if line.strip()])
+
+    def _count(self, key: str, count: int):
+        with self._stats_lock:
+            self._stats[key] += count
+
+    def _on_write_success(self, conf, data):
+        self._count('written', self._count_lines(data))
+        self._report('written')
+
+    def _on_write_error(self, conf, data, exception):
+        count = self._count_lines(data)
+        self._count('failed', count)
+        logger.error(f"Dropped {count} points after retries failed: {str(exception)}")
+        self._report('failed')
+
+    def _on_write_retry(self, conf, data, exception):
+        self._count('retries', 1)
+        logger.warning(f"Retrying write of {self._count_lines(data)} points: {str(exception)}")
+        self._report('retry')
+
+    def _report(self, event: str):
+        if self.metrics_callback:
+            try:
+                self.metrics_callback(event, self.get_write_stats())
+            except Exception as e:
+                logger.error(f"Error in InfluxDB metrics callback: {str(e)}")
+
+    def get_write_stats(self) -> Dict[str, int]:
+        """Points handed to the writer, delivered, dropped after retries and still pending"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['pending'] = max(0, stats['queued'] - stats['written'] - stats['failed']) if self.batching else 0
+        return stats
 
     def update_detection(self, detection_id, update_data):
         """
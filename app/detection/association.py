@@ -0,0 +1,89 @@
+# app/detection/association.py
+
+import logging
+import numpy as np
+from typing import List, Optional, Sequence
+from .tracker import greedy_match
+
+logger = logging.getLogger(__name__)
+
+
+def containment_matrix(plate_boxes: np.ndarray, vehicle_boxes: np.ndarray, margin: float = 0) -> np.ndarray:
+    """Fraction of each plate's area inside each vehicle box grown by margin pixels, plates x vehicles"""
+    plate_boxes = np.asarray(plate_boxes, dtype=np.float64).reshape(-1, 4)
+    vehicle_boxes = np.asarray(vehicle_boxes, dtype=np.float64).reshape(-1, 4)
+    if not len(plate_boxes) or not len(vehicle_boxes):
+        return np.zeros((len(plate_boxes), len(vehicle_boxes)))
+
+    x1 = np.maximum(plate_boxes[:, None, 0], vehicle_boxes[None, :, 0] - margin)
+    y1 = np.maximum(plate_boxes[:, None, 1], vehicle_boxes[None, :, 1] - margin)
+    x2 = np.minimum(plate_boxes[:, None, 2], vehicle_boxes[None, :, 2] + margin)
+    y2 = np.minimum(plate_boxes[:, None, 3], vehicle_boxes[None, :, 3] + margin)
+    intersection = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+
+    area = (plate_boxes[:, 2] - plate_boxes[:, 0]) * (plate_boxes[:, 3] - plate_boxes[:, 1])
+    return np.where(area[:, None] > 0, intersection / np.maximum(area[:, None], 1e-9), 0.0)
+
+
+class PlateVehicleAssociator:
+    """
+    One-to-one assignment of plates to vehicles.
+
+    A plate is a candidate for every vehicle that contains at least min_containment of it
+    (the vehicle box grown by margin pixels). Candidates are scored by containment plus how well
+    the plate sits where plates usually are: horizontally centred and in the lower part of the
+    vehicle box. Overlapping vehicles in car parks and queues then get the plate that fits them
+    best rather than the first box found. Assignment is greedy on the score or, with
+    method='hungarian', optimal over all pairs.
+    """
+
+    # expected vertical position of the plate centre, as a fraction of the vehicle box height
+    PLATE_HEIGHT_RATIO = 0.8
+
+    def __init__(self, margin: float = 20, min_containment: float = 0.9, method: str = 'greedy'):
+        if method not in ('greedy', 'hungarian'):
+            raise ValueError(f"Unknown association method: {method}")
+        self.margin = margin
+        self.min_containment = min_containment
+        self.method = method
+
+    def score_matrix(self, plate_boxes: np.ndarray, vehicle_boxes: np.ndarray) -> np.ndarray:
+        """Plates x vehicles scores, 0 for pairs that can not be associated"""
+        plate_boxes = np.asarray(plate_boxes, dtype=np.float64).reshape(-1, 4)
+        vehicle_boxes = np.asarray(vehicle_boxes, dtype=np.float64).reshape(-1, 4)
+        containment = containment_matrix(plate_boxes, vehicle_boxes, self.margin)
+        if not containment.size:
+            return containment
+
+        plate_cx = (plate_boxes[:, 0] + plate_boxes[:, 2]) / 2
+        plate_cy = (plate_boxes[:, 1] + plate_boxes[:, 3]) / 2
+        vehicle_cx = (vehicle_boxes[:, 0] + vehicle_boxes[:, 2]) / 2
+        vehicle_w = np.maximum(vehicle_boxes[:, 2] - vehicle_boxes[:, 0], 1)
+        vehicle_h = np.maximum(vehicle_boxes[:, 3] - vehicle_boxes[:, 1], 1)
+
+        horizontal = 1 - np.clip(np.abs(plate_cx[:, None] - vehicle_cx[None, :]) / (vehicle_w / 2), 0, 1)
+        height_ratio = (plate_cy[:, None] - vehicle_boxes[None, :, 1]) / vehicle_h
+        vertical = 1 - np.clip(np.abs(height_ratio - self.PLATE_HEIGHT_RATIO), 0, 1)
+
+        scores = containment + 0.25 * horizontal + 0.25 * vertical
+        return np.where(containment >= self.min_containment, scores, 0.0)
+
+    def associate(self, plate_boxes: Sequence, vehicle_boxes: Sequence) -> List[Optional[int]]:
+        """Index of the vehicle of every plate, None for plates outside all vehicles"""
+        scores = self.score_matrix(plate_boxes, vehicle_boxes)
+        assignment = [None] * len(scores)
+        if not scores.size:
+            return assignment
+        for plate, vehicle in self._match(scores):
+            assignment[plate] = vehicle
+        return assignment
+
+    def _match(self, scores: np.ndarray):
+        if self.method == 'hungarian':
+            try:
+                from scipy.optimize import linear_sum_assignment
+                rows, cols = linear_sum_assignment(scores, maximize=True)
+                return [(int(row), int(col)) for row, col in zip(rows, cols) if scores[row, col] > 0]
+            except ImportError:
+                logger.warning("scipy is not available, using greedy plate-vehicle association")
+        return greedy_match(scores, 1e-9)
@@ -0,0 +1,97 @@
+# app/detection/cascade_detector.py
+
+import cv2
+import numpy as np
+import logging
+from typing import Dict, List, Tuple
+from .tracker import iou_matrix
+
+logger = logging.getLogger(__name__)
+
+
+def downscale(frame: np.ndarray, max_width: int) -> Tuple[np.ndarray, float]:
+    """Frame resized to at most max_width pixels wide, and the scale that was applied"""
+    scale = min(1.0, max_width / frame.shape[1]) if max_width else 1.0
+    if scale == 1.0:
+        return frame, scale
+    return cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA), scale
+
+
+def roi_box(bbox: Tuple[int, int, int, int], margin: float, shape: Tuple[int, ...]) -> Tuple[int, int, int, int]:
+    """Box grown by margin (fraction of its size) on every side, clipped to the image"""
+    x1, y1, x2, y2 = bbox
+    mx, my = int((x2 - x1) * margin), int((y2 - y1) * margin)
+    return max(0, x1 - mx), max(0, y1 - my), min(shape[1], x2 + mx), min(shape[0], y2 + my)
+
+
+def suppress_duplicates(bboxs: np.ndarray, iou_threshold: float = 0.5) -> np.ndarray:
+    """
+    Greedy NMS over [x1, y1, x2, y2, confidence, class] rows, overlapping vehicle ROIs
+    find the same plate more than once
+    """
+    bboxs = np.asarray(bboxs, dtype=np.float32).reshape(-1, 6)
+    if len(bboxs) < 2:
+        return bboxs
+    bboxs = bboxs[np.argsort(-bboxs[:, 4])]
+    iou = iou_matrix(bboxs[:, :4], bboxs[:, :4])
+    keep = []
+    for i in range(len(bboxs)):
+        if all(iou[i, j] < iou_threshold for j in keep):
+            keep.append(i)
+    return bboxs[keep]
+
+
+class CascadePlateLocalizer:
+    """
+    Two stage detection: vehicles on a downscaled copy of the frame, then plate localization
+    only inside the vehicle boxes, cropped from the full resolution image. The crops of the whole
+    batch go to the plate detector in a single predict() call, so distant plates get more pixels
+    and frames without vehicles skip plate localization entirely.
+    """
+
+    def __init__(self, vehicle_detector, plate_detector,
+                 vehicle_width: int = 640, roi_margin: float = 0.1, iou_threshold: float = 0.5):
+        self.vehicle_detector = vehicle_detector
+        self.plate_detector = plate_detector
+        self.vehicle_width = vehicle_width
+        self.roi_margin = roi_margin
+        self.iou_threshold = iou_threshold
+
+    def detect_batch(self, frames: List[np.ndarray],
+                     images: List[np.ndarray]) -> Tuple[List[List[Dict]], List[np.ndarray]]:
+        """
+        Vehicle detections in full resolution coordinates and plate boxes of every frame.
+        frames are the BGR frames given to the vehicle detector, images the same frames as
+        loaded for nomeroff (RGB), which the plate ROIs are cropped from
+        """
+        small_frames, scales = zip(*[downscale(frame, self.vehicle_width) for frame in frames]) if frames else ((), ())
+        vehicle_detections = self.vehicle_detector.detect_vehicles_batch(list(small_frames))
+
+        crops, offsets = [], []
+        for i, (frame, image, vehicles, scale) in enumerate(zip(frames, images, vehicle_detections, scales)):
+            for veh in vehicles:
+                self._rescale_vehicle(veh, frame, scale)
+                x1, y1, x2, y2 = roi_box(veh['bbox'], self.roi_margin, image.shape)
+                if x2 > x1 and y2 > y1:
+                    crops.append(image[y1:y2, x1:x2])
+                    offsets.append((i, x1, y1))
+
+        images_bboxs = [[] for _ in frames]
+        if crops:
+            for (i, dx, dy), bboxs in zip(offsets, self.plate_detector.predict(crops)):
+                for bbox in bboxs:
+                    images_bboxs[i].append([bbox[0] + dx, bbox[1] + dy, bbox[2] + dx, bbox[3] + dy,
+                                            bbox[4], bbox[5]])
+        logger.debug(f"Cascade: {len(crops)} vehicle ROIs in {len(frames)} frame(s)")
+        return vehicle_detections, [suppress_duplicates(bboxs, self.iou_threshold) for bboxs in images_bboxs]
+
+    @staticmethod
+    def _rescale_vehicle(veh: Dict, frame: np.ndarray, scale: float) -> None:
+        """Vehicle box and crop back in full resolution frame coordinates"""
+        if scale == 1.0:
+            return
+        height, width = frame.shape[:2]
+        x1, y1, x2, y2 = (int(round(v / scale)) for v in veh['bbox'])
+        x1, y1, x2, y2 = max(0, x1), max(0, y1), min(width, x2), min(height, y2)
+        veh['bbox'] = (x1, y1, x2, y2)
+        veh['image'] = frame[y1:y2, x1:x2].copy()
@@ -5,7 +5,6 @@ import numpy as np
 from nomeroff_net import pipeline
 from nomeroff_net.tools import unzip
 from pathlib import Path
-import tempfile
 import warnings
 import os
 import base64
@@ -13,6 +12,8 @@ import traceback
 from picamera2 import Picamera2
 from flask import current_app
 import time
+import atexit
+import threading
 import logging
 import pytz
 from datetime import datetime
@@ -20,8 +21,18 @@ from .vehicle_classifier import VehicleClassifier
 from typing import Dict, List, Tuple, Optional, Any
 
 from app.database.factory import DatabaseFactory
+from app.database.distribution.core import DataDistributor, DetectionEvent, OverflowPolicy
+from app.database.distribution.database_consumer import DatabaseConsumer
 
 from .vehicle_detector import VehicleObjectDetector
+from .unified_detector import UnifiedVehiclePlateDetector
+from .cascade_detector import CascadePlateLocalizer
+from .association import PlateVehicleAssociator
+from .stage_executor import StageExecutor
+from .frame_pipeline import FramePipeline, DropPolicy
+from .motion_gate import MotionGate
+from .tracker import SortTracker
+from .plate_consensus import PlateConsensus
 
 from app.recognition import VehicleRecognizerFactory, RecognitionType
 
@@ -35,22 +46,39 @@ warnings.filterwarnings('ignore', category=UserWarning,
                        message='Creating a tensor from a list of numpy.ndarrays is extremely slow.*')
 
 class LicensePlateDetector:
-    def __init__(self, database_factory):
+    def __init__(self, database_factory, config=None):
         logging.info("Initializing LicensePlateDetector")
+        config = config or {}
         # Path('output').mkdir(exist_ok=True)
         
         #  Initialize directories
         Path('output').mkdir(exist_ok=True)
-        self.temp_dir = Path(tempfile.mkdtemp())
         
         
         # Initialize license plate detector
+        # Frames are handed over as BGR numpy arrays, the "numpy" loader converts them to RGB in memory
         logger.info("Loading license plate detector...")
-        self.detector = pipeline("number_plate_detection_and_reading", image_loader="opencv")
+        # OCR region models are loaded when their first plate is seen unless preloaded
+        self.detector = pipeline("number_plate_detection_and_reading", image_loader="numpy",
+                                 ocr_lazy_load=config.get('OCR_LAZY_LOAD', True),
+                                 ocr_preload=config.get('OCR_PRELOAD'),
+                                 ocr_memory_budget_mb=config.get('OCR_MEMORY_BUDGET_MB'))
         
         
-        # Initialize vehicle detector
-        self.vehicle_detector = VehicleObjectDetector(confidence_threshold=0.3)
+        # Detection mode: 'separate' runs the COCO vehicle model and the plate localizer on every
+        # frame, 'unified' gets vehicles and plates from one forward pass of UNIFIED_DETECTOR_MODEL,
+        # 'cascade' localizes plates only inside vehicle boxes found on a downscaled frame
+        self.detection_mode = config.get('DETECTION_MODE', 'separate')
+        self.unified_detector_model = config.get('UNIFIED_DETECTOR_MODEL')
+        self.unified_detector = None
+        self.cascade_vehicle_width = config.get('CASCADE_VEHICLE_WIDTH', 640)
+        self.cascade_roi_margin = config.get('CASCADE_ROI_MARGIN', 0.1)
+
+        # Vehicle detector, loaded on first use so that the unified mode does not load it
+        self._vehicle_detector = None
+        if self._get_unified_detector() is None:
+            logger.info("Loading vehicle detector...")
+            self._vehicle_detector = VehicleObjectDetector(confidence_threshold=0.3)
         
         # Initialize vehicle classifier
         logger.info("Loading vehicle classifier...")
@@ -60,6 +88,14 @@ class LicensePlateDetector:
          # Database initialization
         self.database_factory = database_factory
         self.databases = None
+
+        # Detections are written by a background writer, started on the first detection
+        self.distributor = None
+        self.db_write_batch_size = 100
+        self.db_flush_interval = 1.0
+        self.db_queue_size = 10000
+        self.db_overflow_policy = 'drop_oldest'
+        self._distributor_lock = threading.Lock()
         
         
         # Video capture attributes
@@ -68,6 +104,38 @@ class LicensePlateDetector:
         self.is_processing = False
         self.detected_plates = []
 
+        # Staged capture -> inference -> encode pipeline for the video and camera feeds
+        self.frame_pipeline = None
+        self.use_frame_pipeline = True
+        self.frame_queue_size = 2
+
+        # Optional motion gate in front of process_frame for the video and camera feeds
+        self.motion_gate = None
+        self.motion_gate_enabled = False
+        self.motion_threshold = 0.01
+        self.motion_roi = None
+        self.motion_method = 'diff'
+
+        # Optional tracking: recognition once per track instead of once per frame
+        self.tracking_enabled = False
+        self.track_refresh_interval = 10
+        self.track_max_age = 15
+        self.track_iou_threshold = 0.3
+        self.trackers = {}
+
+        # Vehicle detection and the plate pipeline run concurrently, vehicle attributes fan out per plate
+        self.stage_executor = StageExecutor(max_workers=config.get('STAGE_WORKERS', 4))
+
+        # Plate to vehicle association: one-to-one, greedy or hungarian, vehicle boxes grown by margin pixels
+        self.association_margin = 20
+        self.association_method = 'greedy'
+
+        # Multi-frame OCR consensus per plate track, None keeps the per-frame readings
+        self.ocr_consensus_method = 'logits'
+        self.ocr_consensus_stable_frames = 3
+        self.ocr_consensus_min_confidence = 0.8
+        self.ocr_consensus_max_reads = 10
+
         # Processing parameters
         self.frame_count = 0
         self.last_process_time = 0
@@ -120,8 +188,80 @@ class LicensePlateDetector:
         except Exception as e:
             logging.error(f"Error initializing databases: {str(e)}", exc_info=True)
 
+    @property
+    def vehicle_detector(self):
+        """COCO vehicle detector of the separate mode"""
+        if self._vehicle_detector is None:
+            self._vehicle_detector = VehicleObjectDetector(confidence_threshold=0.3)
+        return self._vehicle_detector
+
+    def _get_unified_detector(self):
+        """Single-pass vehicle and plate detector in unified mode, None when it is off or failed to load"""
+        if self.detection_mode != 'unified':
+            return None
+        if self.unified_detector is None:
+            if not self.unified_detector_model:
+                logger.error("DETECTION_MODE is unified but UNIFIED_DETECTOR_MODEL is not set, "
+                             "using separate vehicle and plate detectors")
+                self.detection_mode = 'separate'
+                return None
+            logger.info(f"Loading unified vehicle and plate detector {self.unified_detector_model}...")
+            self.unified_detector = UnifiedVehiclePlateDetector(self.unified_detector_model,
+                                                                confidence_threshold=0.3)
+        if not self.unified_detector.initialized:
+            return None
+        return self.unified_detector
+
+    def _detect(self, frames):
+        """
+        Vehicle detections, plate bboxs and loaded images of a batch of BGR frames: one forward
+        pass in unified mode, the vehicle model and the plate localizer otherwise
+        """
+        images = [self.detector.image_loader.load(frame) for frame in frames]
+        unified_detector = self._get_unified_detector()
+        if unified_detector is not None:
+            vehicle_detections, images_bboxs = unified_detector.detect_batch(frames)
+            return vehicle_detections, images_bboxs, images
+        if self.detection_mode == 'cascade':
+            cascade = CascadePlateLocalizer(self.vehicle_detector,
+                                            self.detector.number_plate_localization.detector,
+                                            vehicle_width=self.cascade_vehicle_width,
+                                            roi_margin=self.cascade_roi_margin)
+            vehicle_detections, images_bboxs = cascade.detect_batch(frames, images)
+            return vehicle_detections, images_bboxs, images
+        results = self.stage_executor.run({
+            'vehicle_detection': (lambda: self.vehicle_detector.detect_vehicles_batch(frames), ()),
+            'plate_localization': (lambda: self.detector.localize(images), ()),
+        })
+        images_bboxs, images = results['plate_localization']
+        return results['vehicle_detection'], images_bboxs, images
+
+    def _detect_and_read(self, frames):
+        """Vehicle detections, plate bboxs and plate texts per frame"""
+        if self.detection_mode != 'cascade' and self._get_unified_detector() is None:
+            results = self.stage_executor.run({
+                'vehicle_detection': (lambda: self.vehicle_detector.detect_vehicles_batch(frames), ()),
+                'plate_reading': (lambda: self.detector(frames, batch_size=len(frames)), ()),
+            })
+            images, bboxs, points, zones, region_ids, region_names, count_lines, confidences, texts = \
+                unzip(results['plate_reading'])
+            return results['vehicle_detection'], bboxs, texts
+
+        # Unified and cascade modes: the plate boxes go straight to key points, classification and OCR
+        vehicle_detections, images_bboxs, images = self._detect(frames)
+        texts = [[] for _ in frames]
+        if any(len(bboxs) for bboxs in images_bboxs):
+            texts = unzip(self.detector.read_number_plates(images, images_bboxs))[8]
+        return vehicle_detections, images_bboxs, texts
+
     def __del__(self):
-        """Cleanup database connections"""
+        """Cleanup database connections and release the shared pipeline models"""
+        if getattr(self, 'detector', None) is not None:
+            self.detector.close()
+        if getattr(self, 'stage_executor', None) is not None:
+            self.stage_executor.shutdown()
+        if getattr(self, 'distributor', None):
+            self.distributor.stop()
         if hasattr(self, 'databases') and self.databases:
             for db in self.databases.values():
                 db.disconnect()
@@ -129,61 +269,58 @@ class LicensePlateDetector:
                 
  
 
-    def _prepare_detection_data(self, detection, vehicle_details):
-        """Prepare detection data for database storage"""
+    def _create_detection_event(self, detection, vehicle_details):
+        """Detection event for the database writer, timestamped when the plate was seen"""
         utc_time = datetime.now(pytz.UTC)
-        local_time = utc_time.astimezone(self.local_tz)
-        
-        # Base detection data
-        base_data = {
-            'text': detection['text'],
-            'confidence': detection['confidence'],
-            'timestamp_utc': utc_time,
-            'timestamp_local': local_time,
-        }
-        
-        # Add vehicle details if available
-        if vehicle_details:
-            base_data.update({
-                'vehicle_make': vehicle_details.get('make'),
-                'vehicle_model': vehicle_details.get('model'),
-                'vehicle_color': vehicle_details.get('color'),
-                'vehicle_type': vehicle_details.get('type'),
-                'vehicle_year': vehicle_details.get('year'),
-                'vehicle_image_path': vehicle_details.get('image_path'),
-                'vehicle_confidence_scores': vehicle_details.get('confidence_scores')
-            })
-        
-        # Create InfluxDB-specific version (with ISO format timestamps)
-        influx_data = base_data.copy()
-        influx_data['timestamp_utc'] = utc_time.isoformat()
-        influx_data['timestamp_local'] = local_time.isoformat()
-        
-        return base_data, influx_data
-    
-    
-        
-        # Add vehicle details if available
-        if vehicle_details:
-            base_data.update({
-                'vehicle_make': vehicle_details.get('make'),
-                'vehicle_model': vehicle_details.get('model'),
-                'vehicle_color': vehicle_details.get('color'),
-                'vehicle_type': vehicle_details.get('type'),
-                'vehicle_year': vehicle_details.get('year'),
-                'vehicle_image_path': vehicle_details.get('image_path'),
-                'vehicle_confidence_scores': vehicle_details.get('confidence_scores')
-            })
-        
-        # Create InfluxDB-specific version (with ISO format timestamps)
-        influx_data = base_data.copy()
-        influx_data['timestamp_utc'] = utc_time.isoformat()
-        influx_data['timestamp_local'] = local_time.isoformat()
-        
-        return base_data, influx_data
-                
-    
-    def process_frame(self, frame, frame_size=None):
+        metadata = None
+        if detection.get('track_id') is not None:
+            metadata = {'track_id': detection['track_id']}
+
+        return DetectionEvent(
+            plate_text=detection['text'],
+            confidence=float(detection['confidence']),
+            timestamp_utc=utc_time,
+            timestamp_local=utc_time.astimezone(self.local_tz),
+            camera_id=detection.get('camera_id'),
+            metadata=metadata,
+            vehicle_details=vehicle_details or None
+        )
+
+    def _get_distributor(self):
+        """Background writer feeding all configured databases"""
+        with self._distributor_lock:
+            if self.distributor is None and self.databases:
+                distributor = DataDistributor(
+                    batch_size=self.db_write_batch_size,
+                    processing_interval=self.db_flush_interval,
+                    max_queue_size=self.db_queue_size,
+                    overflow_policy=OverflowPolicy(self.db_overflow_policy)
+                )
+                for db_name, db in self.databases.items():
+                    distributor.register_consumer(db_name, DatabaseConsumer(db, name=db_name))
+                distributor.start()
+                # Queued detections are written out when the process exits
+                atexit.register(distributor.stop)
+                self.distributor = distributor
+                logger.info(f"Started database writer for {list(self.databases.keys())}")
+            return self.distributor
+
+    def flush_detections(self, timeout=10.0):
+        """Write out all queued detections and stop the database writer"""
+        with self._distributor_lock:
+            distributor, self.distributor = self.distributor, None
+        if distributor:
+            distributor.stop(timeout=timeout)
+
+    def get_storage_stats(self):
+        """Queue depth and write counters of the database writer and of the InfluxDB batching buffer"""
+        stats = self.distributor.get_status() if self.distributor else {}
+        for db_name, db in (self.databases or {}).items():
+            if hasattr(db, 'get_write_stats'):
+                stats.setdefault(db_name, {})['buffer'] = db.get_write_stats()
+        return stats
+
+    def process_frame(self, frame, frame_size=None, camera_id=None):
         """Process frame for both vehicles and license plates"""
         try:
             if frame is None:
@@ -193,147 +330,381 @@ class LicensePlateDetector:
             if frame_size:
                 frame = cv2.resize(frame, frame_size)
 
-            visualization = frame.copy()
-            all_detections = []
+            return self.process_frames([frame], [camera_id])[0]
 
-            # Vehicle Detection
-            logger.info("Running vehicle detection...")
-            vehicle_detections = self.vehicle_detector.detect_vehicles(frame)
-            logger.info(f"Found {len(vehicle_detections)} vehicles")
+        except Exception as e:
+            logger.error(f"Error in process_frame: {str(e)}")
+            traceback.print_exc()
+            return frame.copy() if frame is not None else None, []
 
-            # Store vehicle regions for later use
-            vehicle_regions = []
-            
-            # Process and draw vehicle detections
-            for veh in vehicle_detections:
-                vx1, vy1, vx2, vy2 = veh['bbox']
-                veh_class = veh['class']
-                veh_conf = veh['confidence']
-                
-                # Draw blue box for vehicle
-                cv2.rectangle(visualization, 
-                            (vx1, vy1), (vx2, vy2),
-                            (255, 0, 0),  # Blue
-                            3)  # Thicker line
-                
-                # Draw vehicle label
-                veh_label = f"{veh_class} ({veh_conf:.2f})"
-                label_size = cv2.getTextSize(veh_label, cv2.FONT_HERSHEY_SIMPLEX, 0.7, 2)[0]
-                
-                # Background for vehicle label
-                cv2.rectangle(visualization,
-                            (vx1, vy1 - label_size[1] - 10),
-                            (vx1 + label_size[0], vy1),
-                            (255, 0, 0),
-                            -1)
-                
-                # Vehicle label text
-                cv2.putText(visualization,
-                        veh_label,
-                        (vx1, vy1 - 5),
-                        cv2.FONT_HERSHEY_SIMPLEX,
-                        0.7,
-                        (255, 255, 255),  # White text
-                        2)
-                
-                # Store vehicle region
-                vehicle_regions.append({
-                    'bbox': (vx1, vy1, vx2, vy2),
-                    'class': veh_class,
-                    'confidence': veh_conf,
-                    'image': frame[vy1:vy2, vx1:vx2]
-                })
-
-            # License Plate Detection
-            temp_frame_path = str(self.temp_dir / "temp_frame.jpg")
-            cv2.imwrite(temp_frame_path, frame)
+    def process_frames(self, frames, camera_ids=None):
+        """
+        Process a batch of frames, possibly from different cameras, with one call per model.
+        Returns a (visualization, detections) pair per frame, detections are tagged with camera_id.
+        """
+        if camera_ids is None:
+            camera_ids = [None] * len(frames)
+
+        if self.tracking_enabled:
+            return self._process_frames_tracked(frames, camera_ids)
+
+        # Vehicle and License Plate Detection
+        logger.info(f"Running vehicle detection on {len(frames)} frame(s)...")
+        vehicle_detections, bboxs, texts = self._detect_and_read(frames)
+
+        outputs = []
+        for i, frame in enumerate(frames):
+            outputs.append(self._annotate_frame(frame,
+                                                vehicle_detections[i],
+                                                bboxs[i] if bboxs else [],
+                                                texts[i] if texts else [],
+                                                camera_id=camera_ids[i],
+                                                store=bool(self.databases)))
+        return outputs
+
+    def _annotate_frame(self, frame, vehicle_detections, plate_bboxs, plate_texts,
+                        margin=None, camera_id=None, store=True):
+        """Associate plates with vehicles, draw both and build the detection records"""
+        visualization = frame.copy()
+        all_detections = []
+        logger.info(f"Found {len(vehicle_detections)} vehicles")
+
+        # Store vehicle regions for later use
+        vehicle_regions = self._draw_vehicles(visualization, frame, vehicle_detections)
+
+        # Find associated vehicles and get their details, one batched recognition per frame
+        associated_vehicles = self._associate([bbox[:4] for bbox in plate_bboxs], vehicle_regions, margin)
+        associated = [i for i, vehicle in enumerate(associated_vehicles) if vehicle]
+        pairs = [(associated_vehicles[i], tuple(map(int, plate_bboxs[i][:4]))) for i in associated]
+        details = self.stage_executor.call('vehicle_details', self._get_associated_vehicle_details, pairs) \
+            if pairs else []
+        associated_details = [None] * len(associated_vehicles)
+        for i, vehicle_details in zip(associated, details):
+            associated_details[i] = vehicle_details
+
+        for i, bbox in enumerate(plate_bboxs):
+            x1, y1, x2, y2 = map(int, bbox[:4])
+            plate_conf = float(bbox[4])
             
-            results = self.detector([temp_frame_path])
-            images, bboxs, points, zones, region_ids, region_names, count_lines, confidences, texts = unzip(results)
-
-            if bboxs and len(bboxs[0]) > 0:
-                for i, bbox in enumerate(bboxs[0]):
-                    x1, y1, x2, y2 = map(int, bbox[:4])
-                    plate_conf = float(bbox[4])
-                    
-                    # Get plate text
-                    plate_text = ''
-                    if texts and len(texts[0]) > i:
-                        plate_text = texts[0][i]
-                        if isinstance(plate_text, list):
-                            plate_text = ' '.join(text)
-
-                    # Find associated vehicle
-                    associated_vehicle = None
-                    for veh in vehicle_regions:
-                        vx1, vy1, vx2, vy2 = veh['bbox']
-                        # Check if plate is within vehicle bounds (with some margin)
-                        margin = 20
-                        if (x1 >= vx1-margin and x2 <= vx2+margin and 
-                            y1 >= vy1-margin and y2 <= vy2+margin):
-                            associated_vehicle = veh
-                            break
-
-                    # Get vehicle details if we have an associated vehicle
-                    vehicle_details = None
-                    if associated_vehicle:
-                        vehicle_crop = associated_vehicle['image']
-                        if vehicle_crop is not None and vehicle_crop.size > 0:
-                            vehicle_details = self._get_vehicle_details(vehicle_crop, (x1-vx1, y1-vy1, x2-vx1, y2-vy1))
-
-                    # Draw green box for license plate
-                    cv2.rectangle(visualization, 
-                                (x1, y1), (x2, y2),
-                                (0, 255, 0),  # Green
-                                2)
-
-                    # Create detection info
-                    detection_info = {
-                        'text': plate_text,
-                        'confidence': plate_conf,
-                        'bbox': (x1, y1, x2, y2),
-                        'vehicle_type': associated_vehicle['class'] if associated_vehicle else 'unknown',
-                        'vehicle_confidence': associated_vehicle['confidence'] if associated_vehicle else 0.0,
-                        'vehicle_details': vehicle_details
-                    }
-
-                    # Draw plate info
-                    y_offset = y1 - 10
-                    plate_label = f"Plate: {plate_text} ({plate_conf:.2f})"
-                    cv2.putText(visualization,
-                            plate_label,
-                            (x1, y_offset),
-                            cv2.FONT_HERSHEY_SIMPLEX,
-                            0.5,
-                            (0, 255, 0),
-                            2)
-
-                    # Draw vehicle details if available
-                    if vehicle_details:
-                        details_text = f"{vehicle_details['color']} {vehicle_details['make']} {vehicle_details['model']}"
-                        y_offset -= 20
-                        cv2.putText(visualization,
-                                details_text,
-                                (x1, y_offset),
-                                cv2.FONT_HERSHEY_SIMPLEX,
-                                0.5,
-                                (0, 0, 255),  # Red
-                                2)
-
-                    all_detections.append(detection_info)
-
-                    # Store if new
-                    if self.databases:
-                        self._store_detection(detection_info, vehicle_details)
+            # Get plate text
+            plate_text = ''
+            if plate_texts is not None and len(plate_texts) > i:
+                plate_text = self._plate_text(plate_texts[i])
+            associated_vehicle = associated_vehicles[i]
+            vehicle_details = associated_details[i]
 
+            # Create detection info
+            detection_info = {
+                'text': plate_text,
+                'confidence': plate_conf,
+                'bbox': (x1, y1, x2, y2),
+                'vehicle_type': associated_vehicle['class'] if associated_vehicle else 'unknown',
+                'vehicle_confidence': associated_vehicle['confidence'] if associated_vehicle else 0.0,
+                'vehicle_details': vehicle_details,
+                'camera_id': camera_id
+            }
+
+            self._draw_plate(visualization, detection_info)
+            all_detections.append(detection_info)
+
+            # Store if new
+            if store and self.databases:
+                self._store_detection(detection_info, vehicle_details)
+
+        return visualization, all_detections
+
+    @staticmethod
+    def _plate_text(text):
+        """OCR returns a list of lines for multiline plates"""
+        if isinstance(text, list):
+            return ' '.join(text)
+        return text
+
+    def _draw_vehicles(self, visualization, frame, vehicle_detections):
+        """Draw vehicle boxes and labels, return the vehicle regions used for association"""
+        vehicle_regions = []
+        
+        # Process and draw vehicle detections
+        for veh in vehicle_detections:
+            vx1, vy1, vx2, vy2 = veh['bbox']
+            veh_class = veh['class']
+            veh_conf = veh['confidence']
+            
+            # Draw blue box for vehicle
+            cv2.rectangle(visualization, 
+                        (vx1, vy1), (vx2, vy2),
+                        (255, 0, 0),  # Blue
+                        3)  # Thicker line
+            
+            # Draw vehicle label
+            veh_label = f"{veh_class} ({veh_conf:.2f})"
+            if veh.get('track_id') is not None:
+                veh_label = f"#{veh['track_id']} {veh_label}"
+            label_size = cv2.getTextSize(veh_label, cv2.FONT_HERSHEY_SIMPLEX, 0.7, 2)[0]
             
+            # Background for vehicle label
+            cv2.rectangle(visualization,
+                        (vx1, vy1 - label_size[1] - 10),
+                        (vx1 + label_size[0], vy1),
+                        (255, 0, 0),
+                        -1)
+            
+            # Vehicle label text
+            cv2.putText(visualization,
+                    veh_label,
+                    (vx1, vy1 - 5),
+                    cv2.FONT_HERSHEY_SIMPLEX,
+                    0.7,
+                    (255, 255, 255),  # White text
+                    2)
+            
+            # Store vehicle region
+            vehicle_regions.append({
+                'bbox': (vx1, vy1, vx2, vy2),
+                'class': veh_class,
+                'confidence': veh_conf,
+                'image': frame[vy1:vy2, vx1:vx2],
+                'track': veh.get('track')
+            })
+        return vehicle_regions
+
+    def _associate(self, plate_boxes, vehicle_regions, margin=None):
+        """Vehicle region of every plate box, or None, assigned one-to-one over the whole frame"""
+        associator = PlateVehicleAssociator(margin=self.association_margin if margin is None else margin,
+                                            method=self.association_method)
+        assignment = associator.associate(plate_boxes, [veh['bbox'] for veh in vehicle_regions])
+        return [vehicle_regions[j] if j is not None else None for j in assignment]
 
-            return visualization, all_detections
+    def _get_associated_vehicle_details(self, pairs):
+        """Attribute recognition of (vehicle, plate bbox) pairs, the plates in vehicle crop coordinates"""
+        vehicle_crops, plate_bboxes = [], []
+        for vehicle, (x1, y1, x2, y2) in pairs:
+            vx1, vy1 = vehicle['bbox'][:2]
+            vehicle_crops.append(vehicle['image'])
+            plate_bboxes.append((x1-vx1, y1-vy1, x2-vx1, y2-vy1))
+        return self._get_vehicle_details_batch(vehicle_crops, plate_bboxes)
+
+    def _draw_plate(self, visualization, detection_info):
+        """Draw the plate box, text and vehicle details"""
+        x1, y1, x2, y2 = detection_info['bbox']
+        plate_text = detection_info['text']
+        plate_conf = detection_info['confidence']
+        vehicle_details = detection_info.get('vehicle_details')
+
+        # Draw green box for license plate
+        cv2.rectangle(visualization, 
+                    (x1, y1), (x2, y2),
+                    (0, 255, 0),  # Green
+                    2)
+
+        # Draw plate info
+        y_offset = y1 - 10
+        plate_label = f"Plate: {plate_text} ({plate_conf:.2f})"
+        if detection_info.get('track_id') is not None:
+            plate_label = f"#{detection_info['track_id']} {plate_label}"
+        cv2.putText(visualization,
+                plate_label,
+                (x1, y_offset),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                0.5,
+                (0, 255, 0),
+                2)
 
+        # Draw vehicle details if available
+        if vehicle_details:
+            details_text = f"{vehicle_details['color']} {vehicle_details['make']} {vehicle_details['model']}"
+            y_offset -= 20
+            cv2.putText(visualization,
+                    details_text,
+                    (x1, y_offset),
+                    cv2.FONT_HERSHEY_SIMPLEX,
+                    0.5,
+                    (0, 0, 255),  # Red
+                    2)
+
+    def _get_trackers(self, camera_id):
+        """Vehicle and plate trackers of one camera"""
+        if camera_id not in self.trackers:
+            self.trackers[camera_id] = {
+                'vehicles': SortTracker(iou_threshold=self.track_iou_threshold, max_age=self.track_max_age),
+                'plates': SortTracker(iou_threshold=self.track_iou_threshold, max_age=self.track_max_age)
+            }
+        return self.trackers[camera_id]
+
+    def _process_frames_tracked(self, frames, camera_ids):
+        """
+        Tracking mode: plates are localized every frame, but OCR and vehicle attribute recognition
+        only run for new tracks or every track_refresh_interval frames. With an OCR consensus the
+        plate is read every frame until the pooled reading is stable. A single detection is stored
+        per plate track, when the track ends.
+        """
+        # Vehicle Detection and plate localization for the whole batch
+        vehicle_detections, images_bboxs, images = self._detect(frames)
+
+        # Assign tracks and pick the plates that need (re)reading
+        frame_plate_tracks = []
+        read_bboxs = []
+        for i, frame in enumerate(frames):
+            trackers = self._get_trackers(camera_ids[i])
+
+            vehicle_tracks, finished_vehicles = trackers['vehicles'].update(
+                np.array([list(veh['bbox']) + [veh['confidence']] for veh in vehicle_detections[i]]))
+            for veh, track in zip(vehicle_detections[i], vehicle_tracks):
+                veh['track'] = track
+                veh['track_id'] = track.track_id
+
+            bboxs = np.asarray(images_bboxs[i])
+            plate_tracks, finished_plates = trackers['plates'].update(bboxs[:, :5] if len(bboxs) else bboxs)
+            frame_index = trackers['plates'].frame_index
+            selected = [j for j, track in enumerate(plate_tracks) if self._needs_reading(track, frame_index)]
+            for j in selected:
+                plate_tracks[j].mark_recognized(frame_index)
+            read_bboxs.append(bboxs[selected] if selected else bboxs[:0])
+            frame_plate_tracks.append((plate_tracks, selected))
+
+            for track in finished_plates:
+                self._finalize_track(track, camera_ids[i])
+
+        # Key points, classification and OCR only for the selected plates
+        texts = region_names = logits = [[] for _ in frames]
+        if any(len(bboxs) for bboxs in read_bboxs):
+            results = self.detector.read_number_plates(images, read_bboxs,
+                                                       return_acc=bool(self.ocr_consensus_method))
+            results = unzip(results)
+            texts, region_names = results[8], results[5]
+            if self.ocr_consensus_method:
+                logits = results[9]
+
+        outputs = []
+        for i, frame in enumerate(frames):
+            plate_tracks, selected = frame_plate_tracks[i]
+            for k, (j, text) in enumerate(zip(selected, texts[i])):
+                track = plate_tracks[j]
+                track.data.setdefault('observations', []).append((self._plate_text(text), track.score))
+                if k < len(logits[i]):
+                    self._add_to_consensus(track, logits[i][k], region_names[i][k])
+            outputs.append(self._annotate_tracked_frame(frame, vehicle_detections[i], plate_tracks, camera_ids[i]))
+        return outputs
+
+    def _annotate_tracked_frame(self, frame, vehicle_detections, plate_tracks, camera_id):
+        """Draw tracked vehicles and plates, recognition results come from the tracks"""
+        visualization = frame.copy()
+        vehicle_regions = self._draw_vehicles(visualization, frame, vehicle_detections)
+        frame_index = self._get_trackers(camera_id)['plates'].frame_index
+
+        all_detections = []
+        associated_vehicles = self._associate([track.bbox for track in plate_tracks], vehicle_regions)
+
+        # Vehicle tracks due for attribute recognition, recognized in one batch
+        refresh = []
+        for track, associated_vehicle in zip(plate_tracks, associated_vehicles):
+            if associated_vehicle and associated_vehicle['track'].needs_recognition(frame_index,
+                                                                                    self.track_refresh_interval):
+                associated_vehicle['track'].mark_recognized(frame_index)
+                refresh.append((associated_vehicle, tuple(map(int, track.bbox))))
+        details = self.stage_executor.call('vehicle_details', self._get_associated_vehicle_details, refresh) \
+            if refresh else []
+        for (associated_vehicle, _), vehicle_details in zip(refresh, details):
+            if vehicle_details:
+                associated_vehicle['track'].data['vehicle_details'] = vehicle_details
+
+        for track, associated_vehicle in zip(plate_tracks, associated_vehicles):
+            x1, y1, x2, y2 = map(int, track.bbox)
+
+            vehicle_details = None
+            if associated_vehicle:
+                vehicle_track = associated_vehicle['track']
+                vehicle_details = vehicle_track.data.get('vehicle_details')
+                track.data['vehicle_details'] = vehicle_details
+                track.data['vehicle_type'] = associated_vehicle['class']
+                track.data['vehicle_confidence'] = associated_vehicle['confidence']
+
+            detection_info = {
+                'text': self._track_text(track),
+                'confidence': track.score,
+                'bbox': (x1, y1, x2, y2),
+                'vehicle_type': associated_vehicle['class'] if associated_vehicle else 'unknown',
+                'vehicle_confidence': associated_vehicle['confidence'] if associated_vehicle else 0.0,
+                'vehicle_details': vehicle_details,
+                'camera_id': camera_id,
+                'track_id': track.track_id
+            }
+            self._draw_plate(visualization, detection_info)
+            all_detections.append(detection_info)
+
+        return visualization, all_detections
+
+    def _needs_reading(self, track, frame_index):
+        """OCR a plate track while its consensus is not stable, or on the refresh interval without one"""
+        consensus = track.data.get('consensus')
+        if consensus is None or consensus.count >= self.ocr_consensus_max_reads:
+            return track.needs_recognition(frame_index, self.track_refresh_interval)
+        return not consensus.is_stable
+
+    def _add_to_consensus(self, track, logits, region_name):
+        """Pool the raw OCR logits of one frame into the track's consensus"""
+        try:
+            consensus = track.data.get('consensus')
+            if consensus is None:
+                consensus = PlateConsensus(method=self.ocr_consensus_method,
+                                           stable_frames=self.ocr_consensus_stable_frames,
+                                           min_confidence=self.ocr_consensus_min_confidence)
+                track.data['consensus'] = consensus
+            letters = self.detector.number_plate_text_reading.detector.get_letters(region_name)
+            text, confidence = consensus.add(logits, letters, weight=track.score)
+            if consensus.is_stable and consensus.streak == consensus.stable_frames:
+                logger.debug(f"Track {track.track_id} consensus stable after {consensus.count} reads: "
+                             f"{text} ({confidence:.2f})")
         except Exception as e:
-            logger.error(f"Error in process_frame: {str(e)}")
-            traceback.print_exc()
-            return frame.copy() if frame is not None else None, []
+            logger.error(f"Error updating OCR consensus of track {track.track_id}: {str(e)}")
+
+    @staticmethod
+    def _track_text(track):
+        """Plate text of a track: the OCR consensus, or the reading with the highest summed detection confidence"""
+        consensus = track.data.get('consensus')
+        if consensus is not None and consensus.text:
+            return consensus.text
+        scores = {}
+        for text, confidence in track.data.get('observations', []):
+            if text:
+                scores[text] = scores.get(text, 0.0) + confidence
+        if not scores:
+            return ''
+        return max(scores, key=scores.get)
+
+    def _finalize_track(self, track, camera_id):
+        """Store one detection for an ended plate track"""
+        text = self._track_text(track)
+        if not text:
+            return
+        detection_info = {
+            'text': text,
+            'confidence': max(confidence for _, confidence in track.data['observations']),
+            'bbox': tuple(map(int, track.bbox)),
+            'vehicle_type': track.data.get('vehicle_type', 'unknown'),
+            'vehicle_confidence': track.data.get('vehicle_confidence', 0.0),
+            'vehicle_details': track.data.get('vehicle_details'),
+            'camera_id': camera_id,
+            'track_id': track.track_id
+        }
+        consensus = track.data.get('consensus')
+        if consensus is not None:
+            logger.info(f"Track {track.track_id} finished after {track.hits} frames: {text} "
+                        f"(OCR consensus {consensus.confidence:.2f} over {consensus.count} reads)")
+        else:
+            logger.info(f"Track {track.track_id} finished after {track.hits} frames: {text}")
+        if self.databases:
+            self._store_detection(detection_info, detection_info['vehicle_details'])
+
+    def flush_tracks(self, camera_id=None):
+        """End all tracks (of one camera, or of all cameras) and store their detections"""
+        camera_ids = list(self.trackers) if camera_id is None else [camera_id]
+        for cid in camera_ids:
+            trackers = self.trackers.pop(cid, None)
+            if not trackers:
+                continue
+            for track in trackers['plates'].flush():
+                self._finalize_track(track, cid)
     
     
     
@@ -343,9 +714,15 @@ class LicensePlateDetector:
         try:
             if not self.cap or not self.is_processing:
                 return None
+
+            if self.frame_pipeline:
+                frame = self.frame_pipeline.get()
+                if frame is None:
+                    self.is_processing = False
+                return frame
             
-            ret, frame = self.cap.read()
-            if not ret or frame is None:
+            frame = self._read_video_frame()
+            if frame is None:
                 self.is_processing = False
                 return None
         
@@ -362,6 +739,60 @@ class LicensePlateDetector:
         except Exception as e:
             logger.error(f"Error in get_frame: {str(e)}")
             return None
+
+    def _read_video_frame(self):
+        """Capture stage for video files, None once the file is exhausted"""
+        ret, frame = self.cap.read()
+        if not ret or frame is None:
+            return None
+        return frame
+
+    def _process_video_frame(self, frame):
+        """Inference stage for video files, every frame with activity is processed"""
+        if self.motion_gate is not None and not self.motion_gate.should_process(frame):
+            return frame
+        processed_frame, _ = self.process_frame(frame)
+        return processed_frame
+
+    def _start_frame_pipeline(self, read_frame, process_frame, drop_policy, name):
+        """Run capture, inference and encoding on their own threads"""
+        self._stop_frame_pipeline()
+        if not self.use_frame_pipeline:
+            return
+        self.frame_pipeline = FramePipeline(
+            read_frame,
+            process_frame,
+            queue_size=self.frame_queue_size,
+            drop_policy=drop_policy,
+            name=name
+        ).start()
+
+    def _stop_frame_pipeline(self):
+        if self.frame_pipeline:
+            self.frame_pipeline.stop()
+            self.frame_pipeline = None
+
+    def get_pipeline_stats(self):
+        """Per-stage counters and queue depths of the running frame pipeline"""
+        stats = self.frame_pipeline.get_stats() if self.frame_pipeline else {}
+        stats['frame_stages'] = self.stage_executor.get_stats()
+        if self.motion_gate is not None:
+            stats['motion_gate'] = self.motion_gate.get_stats()
+        return stats
+
+    def _configure_motion_gate(self):
+        """(Re)create the motion gate from the current settings"""
+        if not self.motion_gate_enabled:
+            self.motion_gate = None
+            return
+        try:
+            self.motion_gate = MotionGate(threshold=self.motion_threshold,
+                                          roi=self.motion_roi,
+                                          method=self.motion_method)
+            logger.info(f"Motion gate enabled ({self.motion_method}, threshold {self.motion_threshold})")
+        except Exception as e:
+            logger.error(f"Error configuring motion gate: {str(e)}")
+            self.motion_gate = None
     
 
         
@@ -370,132 +801,17 @@ class LicensePlateDetector:
         try:
             logger.info("Starting image processing...")
             
-            # Step 1: Detect Vehicles
+            # Detect Vehicles and License Plates
             logger.info("Running vehicle detection...")
-            vehicle_detections = self.vehicle_detector.detect_vehicles(image)
-            logger.info(f"Found {len(vehicle_detections)} vehicles")
-            
-            visualization = image.copy()
-            all_detections = []
-            vehicle_regions = []
-            
-            # Process vehicle detections
-            for veh in vehicle_detections:
-                vx1, vy1, vx2, vy2 = veh['bbox']
-                veh_class = veh['class']
-                veh_conf = veh['confidence']
-                
-                # Draw blue box for vehicle
-                cv2.rectangle(visualization, 
-                            (vx1, vy1), (vx2, vy2),
-                            (255, 0, 0),  # Blue
-                            3)  # Thicker line
-                
-                # Draw vehicle label
-                veh_label = f"{veh_class} ({veh_conf:.2f})"
-                label_size = cv2.getTextSize(veh_label, cv2.FONT_HERSHEY_SIMPLEX, 0.7, 2)[0]
-                
-                # Background for vehicle label
-                cv2.rectangle(visualization,
-                            (vx1, vy1 - label_size[1] - 10),
-                            (vx1 + label_size[0], vy1),
-                            (255, 0, 0),
-                            -1)
-                
-                # Vehicle label text
-                cv2.putText(visualization,
-                        veh_label,
-                        (vx1, vy1 - 5),
-                        cv2.FONT_HERSHEY_SIMPLEX,
-                        0.7,
-                        (255, 255, 255),  # White text
-                        2)
-                
-                # Store vehicle region
-                vehicle_regions.append({
-                    'bbox': (vx1, vy1, vx2, vy2),
-                    'class': veh_class,
-                    'confidence': veh_conf,
-                    'image': image[vy1:vy2, vx1:vx2]
-                })
-            
-            # Step 2: License Plate Detection
-            temp_image_path = str(self.temp_dir / "temp_image.jpg")
-            cv2.imwrite(temp_image_path, image)
-
-            results = self.detector([temp_image_path])
-            images, bboxs, points, zones, region_ids, region_names, count_lines, confidences, texts = unzip(results)
-
-            if bboxs and len(bboxs[0]) > 0:
-                for i, bbox in enumerate(bboxs[0]):
-                    x1, y1, x2, y2 = map(int, bbox[:4])
-                    plate_conf = float(bbox[4])
-                    
-                    # Get plate text
-                    plate_text = ''
-                    if texts and len(texts[0]) > i:
-                        plate_text = texts[0][i]
-                        if isinstance(plate_text, list):
-                            plate_text = ' '.join(plate_text)
-
-                    # Find associated vehicle
-                    associated_vehicle = None
-                    for veh in vehicle_regions:
-                        vx1, vy1, vx2, vy2 = veh['bbox']
-                        # Check if plate is within vehicle bounds (with some margin)
-                        margin = 50  # Increased margin for better association
-                        if (x1 >= vx1-margin and x2 <= vx2+margin and 
-                            y1 >= vy1-margin and y2 <= vy2+margin):
-                            associated_vehicle = veh
-                            break
-
-                    # Get vehicle details if we have an associated vehicle
-                    vehicle_details = None
-                    if associated_vehicle:
-                        vehicle_crop = associated_vehicle['image']
-                        if vehicle_crop is not None and vehicle_crop.size > 0:
-                            vehicle_details = self._get_vehicle_details(vehicle_crop, (x1-vx1, y1-vy1, x2-vx1, y2-vy1))
-
-                    # Draw green box for license plate
-                    cv2.rectangle(visualization, 
-                                (x1, y1), (x2, y2),
-                                (0, 255, 0),  # Green
-                                2)
-
-                    # Create detection info
-                    detection_info = {
-                        'text': plate_text,
-                        'confidence': plate_conf,
-                        'bbox': (x1, y1, x2, y2),
-                        'vehicle_type': associated_vehicle['class'] if associated_vehicle else 'unknown',
-                        'vehicle_confidence': associated_vehicle['confidence'] if associated_vehicle else 0.0,
-                        'vehicle_details': vehicle_details
-                    }
-
-                    # Draw plate info
-                    y_offset = y1 - 10
-                    plate_label = f"Plate: {plate_text} ({plate_conf:.2f})"
-                    cv2.putText(visualization,
-                            plate_label,
-                            (x1, y_offset),
-                            cv2.FONT_HERSHEY_SIMPLEX,
-                            0.5,
-                            (0, 255, 0),
-                            2)
-
-                    # Draw vehicle details if available
-                    if vehicle_details:
-                        details_text = f"{vehicle_details['color']} {vehicle_details['make']} {vehicle_details['model']}"
-                        y_offset -= 20
-                        cv2.putText(visualization,
-                                details_text,
-                                (x1, y_offset),
-                                cv2.FONT_HERSHEY_SIMPLEX,
-                                0.5,
-                                (0, 0, 255),  # Red
-                                2)
-
-                    all_detections.append(detection_info)
+            vehicle_detections, bboxs, texts = self._detect_and_read([image])
+
+            # Increased margin for better association, uploaded images are not stored
+            visualization, all_detections = self._annotate_frame(image,
+                                                                 vehicle_detections,
+                                                                 bboxs[0] if bboxs else [],
+                                                                 texts[0] if texts else [],
+                                                                 margin=50,
+                                                                 store=False)
 
             # Encode the result
             _, buffer = cv2.imencode('.jpg', visualization)
@@ -572,29 +888,15 @@ class LicensePlateDetector:
             y_offset -= text_size[1] + 10
 
     def _store_detection(self, detection, vehicle_details=None):
-        """Store detection in all configured databases"""
+        """Queue detection for all configured databases, never waits on the databases"""
         if not self.databases:
             return
 
         try:
-            # Prepare data for different databases
-            postgres_data, influx_data = self._prepare_detection_data(detection, vehicle_details)
-
-            # Store in InfluxDB
-            if 'timeseries' in self.databases:
-                try:
-                    self.databases['timeseries'].insert_detection(influx_data)
-                    logging.info("Successfully inserted detection into timeseries database")
-                except Exception as e:
-                    logging.error(f"Error storing in InfluxDB: {str(e)}")
-
-            # Store in PostgreSQL
-            if 'postgres' in self.databases:
-                try:
-                    self.databases['postgres'].insert_detection(postgres_data)
-                    logging.info("Successfully inserted detection into postgres database")
-                except Exception as e:
-                    logging.error(f"Error storing in PostgreSQL: {str(e)}")
+            distributor = self._get_distributor()
+            if distributor and not distributor.distribute_event(
+                    self._create_detection_event(detection, vehicle_details)):
+                logging.warning(f"Detection {detection['text']} dropped, database write queue is full")
 
         except Exception as e:
             logging.error(f"Error in _store_detection: {str(e)}") 
@@ -603,6 +905,7 @@ class LicensePlateDetector:
     def start_video_capture(self, video_path):
         """Start video capture from file"""
         self.detected_plates = []
+        self._stop_frame_pipeline()
 
         if self.cap:
             self.cap.release()
@@ -617,11 +920,15 @@ class LicensePlateDetector:
         
         logger.info(f"Started video capture. FPS: {self.fps}, Resolution: {self.frame_width}x{self.frame_height}")
         self.is_processing = True
+        # Files are processed frame by frame, the capture thread waits for inference
+        self._start_frame_pipeline(self._read_video_frame, self._process_video_frame, DropPolicy.NONE, 'video')
         return self
 
     
     
     def stop_video_capture(self):
+        self._stop_frame_pipeline()
+        self.flush_tracks()
         if self.cap:
             self.cap.release()
         self.is_processing = False
@@ -643,6 +950,8 @@ class LicensePlateDetector:
             self.picam2.start()
             print("Camera started")
             self.is_processing = True
+            # Live camera: stale frames are dropped so the feed stays current
+            self._start_frame_pipeline(self._read_camera_frame, self._process_camera_frame, DropPolicy.LATEST, 'camera')
             print("Camera capture started successfully")
             return self
         except Exception as e:
@@ -654,9 +963,22 @@ class LicensePlateDetector:
         if not self.is_processing:
             return None
 
+        if self.frame_pipeline:
+            return self.frame_pipeline.get()
+
+        frame = self._read_camera_frame()
+        processed_frame = self._process_camera_frame(frame)
+
+        ret, jpeg = cv2.imencode('.jpg', processed_frame)
+        return jpeg.tobytes()
+
+    def _read_camera_frame(self):
+        """Capture stage for the Pi camera"""
         frame = self.picam2.capture_array()
-        frame = cv2.cvtColor(frame, cv2.COLOR_RGBA2RGB)
+        return cv2.cvtColor(frame, cv2.COLOR_RGBA2RGB)
 
+    def _process_camera_frame(self, frame):
+        """Inference stage for the Pi camera, only every frame_skip-th frame is processed"""
         self.frame_count += 1
         current_time = time.time()
 
@@ -664,7 +986,8 @@ class LicensePlateDetector:
         detections = []
 
         if (self.frame_count % self.frame_skip == 0 and
-            current_time - self.last_process_time >= self.process_every_n_seconds):
+            current_time - self.last_process_time >= self.process_every_n_seconds and
+            (self.motion_gate is None or self.motion_gate.should_process(frame))):
             self.last_process_time = current_time
             processed_frame, detections = self.process_frame(frame)
 
@@ -673,10 +996,11 @@ class LicensePlateDetector:
                 if not any(existing['text'] == det['text'] for existing in self.detected_plates):
                     self.detected_plates.append(det)
 
-        ret, jpeg = cv2.imencode('.jpg', processed_frame)
-        return jpeg.tobytes()
+        return processed_frame
 
     def stop_camera_capture(self):
+        self._stop_frame_pipeline()
+        self.flush_tracks()
         if hasattr(self, 'picam2'):
             try:
                 self.picam2.stop()
@@ -691,37 +1015,39 @@ class LicensePlateDetector:
         
     def _get_vehicle_details(self, vehicle_crop: np.ndarray, plate_bbox: Tuple[int, int, int, int]) -> Dict[str, Any]:
         """Get vehicle details using the pre-trained recognizer"""
+        return self._get_vehicle_details_batch([vehicle_crop], [plate_bbox])[0]
+
+    def _get_vehicle_details_batch(self, vehicle_crops: List[np.ndarray],
+                                   plate_bboxes: List[Tuple[int, int, int, int]]) -> List[Optional[Dict[str, Any]]]:
+        """Vehicle details of every crop from a single recognize_batch() call, None for invalid crops"""
+        details = [None] * len(vehicle_crops)
+        valid = [i for i, crop in enumerate(vehicle_crops) if crop is not None and crop.size > 0]
+        if len(valid) < len(vehicle_crops):
+            logger.warning("Invalid vehicle crop provided")
+        if not valid:
+            return details
+
         try:
-            if vehicle_crop is None or vehicle_crop.size == 0:
-                logger.warning("Invalid vehicle crop provided")
-                return None
+            # Expanded bboxes for better vehicle recognition
+            crops = [vehicle_crops[i] for i in valid]
+            expanded_bboxes = [self._expand_bbox(crop, plate_bboxes[i]) for crop, i in zip(crops, valid)]
 
-            # Convert relative plate bbox to vehicle crop coordinates
-            x1, y1, x2, y2 = plate_bbox
-            vehicle_height, vehicle_width = vehicle_crop.shape[:2]
-            
-            # Expanded bbox for better vehicle recognition
-            expanded_bbox = self._expand_bbox(
-                vehicle_crop,
-                (x1, y1, x2, y2)
-            )
-            
-            # Get attributes using pre-trained recognizer
-            attributes = self.vehicle_recognizer.recognize(vehicle_crop, expanded_bbox)
-            
-            return {
-                'make': attributes.make,
-                'model': attributes.model,
-                'color': attributes.color,
-                'year': attributes.year,
-                'type': attributes.type,
-                'image_path': attributes.image_path,
-                'confidence_scores': attributes.confidence_scores
-            }
-            
+            # Get attributes of all vehicles using pre-trained recognizer
+            attributes = self.vehicle_recognizer.recognize_batch(crops, expanded_bboxes)
+
+            for i, attrs in zip(valid, attributes):
+                details[i] = {
+                    'make': attrs.make,
+                    'model': attrs.model,
+                    'color': attrs.color,
+                    'year': attrs.year,
+                    'type': attrs.type,
+                    'image_path': attrs.image_path,
+                    'confidence_scores': attrs.confidence_scores
+                }
         except Exception as e:
             logger.error(f"Error getting vehicle details: {str(e)}")
-            return None
+        return details
         
         
     def update_config(self, config):
@@ -737,6 +1063,61 @@ class LicensePlateDetector:
             self.max_detections_per_frame = config['MAX_DETECTIONS_PER_FRAME']
         if 'PROCESS_EVERY_N_SECONDS' in config:
             self.process_every_n_seconds = config['PROCESS_EVERY_N_SECONDS']
+        # Pipeline settings apply from the next start_video_capture/start_camera_capture
+        if 'FRAME_PIPELINE_ENABLED' in config:
+            self.use_frame_pipeline = config['FRAME_PIPELINE_ENABLED']
+        if 'FRAME_QUEUE_SIZE' in config:
+            self.frame_queue_size = config['FRAME_QUEUE_SIZE']
+        motion_keys = {
+            'MOTION_GATE_ENABLED': 'motion_gate_enabled',
+            'MOTION_THRESHOLD': 'motion_threshold',
+            'MOTION_ROI': 'motion_roi',
+            'MOTION_METHOD': 'motion_method'
+        }
+        if 'DETECTION_MODE' in config:
+            self.detection_mode = config['DETECTION_MODE']
+        if 'UNIFIED_DETECTOR_MODEL' in config and config['UNIFIED_DETECTOR_MODEL'] != self.unified_detector_model:
+            self.unified_detector_model = config['UNIFIED_DETECTOR_MODEL']
+            self.unified_detector = None
+        if 'CASCADE_VEHICLE_WIDTH' in config:
+            self.cascade_vehicle_width = config['CASCADE_VEHICLE_WIDTH']
+        if 'CASCADE_ROI_MARGIN' in config:
+            self.cascade_roi_margin = config['CASCADE_ROI_MARGIN']
+        if 'ASSOCIATION_MARGIN' in config:
+            self.association_margin = config['ASSOCIATION_MARGIN']
+        if 'ASSOCIATION_METHOD' in config:
+            self.association_method = config['ASSOCIATION_METHOD']
+        if 'STAGE_WORKERS' in config and config['STAGE_WORKERS'] != self.stage_executor.max_workers:
+            self.stage_executor.shutdown()
+            self.stage_executor = StageExecutor(max_workers=config['STAGE_WORKERS'])
+        if 'TRACKING_ENABLED' in config:
+            self.tracking_enabled = config['TRACKING_ENABLED']
+        if 'TRACK_REFRESH_INTERVAL' in config:
+            self.track_refresh_interval = config['TRACK_REFRESH_INTERVAL']
+        if 'TRACK_MAX_AGE' in config:
+            self.track_max_age = config['TRACK_MAX_AGE']
+        if 'TRACK_IOU_THRESHOLD' in config:
+            self.track_iou_threshold = config['TRACK_IOU_THRESHOLD']
+        # Database writer settings apply when the writer is (re)started
+        if 'DB_WRITE_BATCH_SIZE' in config:
+            self.db_write_batch_size = config['DB_WRITE_BATCH_SIZE']
+        if 'DB_FLUSH_INTERVAL' in config:
+            self.db_flush_interval = config['DB_FLUSH_INTERVAL']
+        if 'DB_WRITE_QUEUE_SIZE' in config:
+            self.db_queue_size = config['DB_WRITE_QUEUE_SIZE']
+        if 'DB_OVERFLOW_POLICY' in config:
+            self.db_overflow_policy = config['DB_OVERFLOW_POLICY']
+        if 'OCR_CONSENSUS_METHOD' in config:
+            self.ocr_consensus_method = config['OCR_CONSENSUS_METHOD'] or None
+        if 'OCR_CONSENSUS_STABLE_FRAMES' in config:
+            self.ocr_consensus_stable_frames = config['OCR_CONSENSUS_STABLE_FRAMES']
+        if 'OCR_CONSENSUS_MIN_CONFIDENCE' in config:
+            self.ocr_consensus_min_confidence = config['OCR_CONSENSUS_MIN_CONFIDENCE']
+        if any(key in config for key in motion_keys):
+            for key, attribute in motion_keys.items():
+                if key in config:
+                    setattr(self, attribute, config[key])
+            self._configure_motion_gate()
 
             
     
@@ -0,0 +1,246 @@
+# app/detection/frame_pipeline.py
+
+import cv2
+import queue
+import threading
+import time
+import logging
+from enum import Enum
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Marker passed down the stages once the source is exhausted
+END_OF_STREAM = object()
+
+
+class DropPolicy(Enum):
+    """What a stage does when the queue in front of the next stage is full"""
+    LATEST = "latest"  # live sources: drop the oldest queued item, newest frame wins
+    NONE = "none"      # files: block the producer, every frame is processed
+
+
+class StageQueue:
+    """Bounded queue between two pipeline stages with a drop policy and depth metrics"""
+
+    def __init__(self, name: str, maxsize: int, drop_policy: DropPolicy):
+        self.name = name
+        self.drop_policy = drop_policy
+        self.queue = queue.Queue(maxsize=max(1, maxsize))
+        self.dropped = 0
+        self.max_depth = 0
+
+    def put(self, item: Any, stop_event: threading.Event) -> bool:
+        """Put an item respecting the drop policy. Returns False if the pipeline was stopped."""
+        if self.drop_policy is DropPolicy.LATEST and item is not END_OF_STREAM:
+            while not stop_event.is_set():
+                try:
+                    self.queue.put_nowait(item)
+                    break
+                except queue.Full:
+                    try:
+                        self.queue.get_nowait()
+                        self.dropped += 1
+                    except queue.Empty:
+                        pass
+        else:
+            while not stop_event.is_set():
+                try:
+                    self.queue.put(item, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+        self.max_depth = max(self.max_depth, self.queue.qsize())
+        return not stop_event.is_set()
+
+    def get(self, stop_event: threading.Event, timeout: Optional[float] = None) -> Any:
+        """Get the next item, or None if the pipeline was stopped or the timeout expired"""
+        deadline = None if timeout is None else time.time() + timeout
+        while not stop_event.is_set():
+            if deadline is not None and time.time() >= deadline:
+                return None
+            try:
+                return self.queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return None
+
+    def get_nowait(self) -> Any:
+        """Get the next item if one is queued, None otherwise"""
+        try:
+            return self.queue.get_nowait()
+        except queue.Empty:
+            return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'depth': self.queue.qsize(),
+            'max_depth': self.max_depth,
+            'capacity': self.queue.maxsize,
+            'dropped': self.dropped
+        }
+
+
+class StageStats:
+    """Counters for a single pipeline stage"""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.busy_time = 0.0
+
+    def add(self, elapsed: float):
+        self.count += 1
+        self.busy_time += elapsed
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'avg_ms': (self.busy_time / self.count * 1000) if self.count else 0.0
+        }
+
+
+def encode_jpeg(frame) -> Optional[bytes]:
+    """Default encoder stage: JPEG bytes for the multipart feeds"""
+    ret, jpeg = cv2.imencode('.jpg', frame)
+    if not ret:
+        return None
+    return jpeg.tobytes()
+
+
+class FramePipeline:
+    """
+    Capture -> inference -> encode pipeline, one thread per stage, connected by bounded queues.
+
+    read_frame() returns the next frame or None once the source is exhausted, process_frame(frame)
+    returns the frame to encode and encode_frame(frame) returns the bytes handed to the consumer
+    through get(). Throughput is bounded by the slowest stage rather than the sum of all stages.
+    """
+
+    def __init__(self,
+                 read_frame: Callable[[], Any],
+                 process_frame: Callable[[Any], Any],
+                 encode_frame: Callable[[Any], Optional[bytes]] = encode_jpeg,
+                 queue_size: int = 2,
+                 drop_policy: DropPolicy = DropPolicy.NONE,
+                 name: str = 'frames'):
+        self.read_frame = read_frame
+        self.process_frame = process_frame
+        self.encode_frame = encode_frame
+        self.drop_policy = drop_policy
+        self.name = name
+
+        self.queues = {
+            'capture': StageQueue('capture', queue_size, drop_policy),
+            'inference': StageQueue('inference', queue_size, drop_policy),
+            'encode': StageQueue('encode', queue_size, drop_policy)
+        }
+        self.stages = {
+            'capture': StageStats(),
+            'inference': StageStats(),
+            'encode': StageStats()
+        }
+
+        self._stop_event = threading.Event()
+        self._threads = []
+        self._finished = False
+        self._started_at = None
+
+    def start(self):
+        """Start the stage threads"""
+        if self._threads:
+            return self
+        self._started_at = time.time()
+        targets = {
+            'capture': self._capture_loop,
+            'inference': self._inference_loop,
+            'encode': self._encode_loop
+        }
+        for stage, target in targets.items():
+            thread = threading.Thread(target=target, name=f"{self.name}-{stage}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"Started {self.name} frame pipeline ({self.drop_policy.value} drop policy)")
+        return self
+
+    def stop(self, timeout: float = 2.0):
+        """Stop all stages and wait for the threads to exit"""
+        self._stop_event.set()
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout=timeout)
+        self._threads = []
+        logger.info(f"Stopped {self.name} frame pipeline")
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self._threads) and not self._stop_event.is_set() and not self._finished
+
+    def get(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        """Next encoded frame, or None once the source is exhausted or the pipeline is stopped"""
+        if self._finished:
+            return None
+        item = self.queues['encode'].get(self._stop_event, timeout)
+        if item is END_OF_STREAM:
+            self._finished = True
+            return None
+        return item
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-stage counters and queue depths"""
+        elapsed = time.time() - self._started_at if self._started_at else 0.0
+        delivered = self.stages['encode'].count
+        return {
+            'name': self.name,
+            'running': self.is_running,
+            'drop_policy': self.drop_policy.value,
+            'fps': (delivered / elapsed) if elapsed > 0 else 0.0,
+            'stages': {name: stats.get_stats() for name, stats in self.stages.items()},
+            'queues': {name: stage_queue.get_stats() for name, stage_queue in self.queues.items()}
+        }
+
+    def _capture_loop(self):
+        stats = self.stages['capture']
+        while not self._stop_event.is_set():
+            start = time.time()
+            try:
+                frame = self.read_frame()
+            except Exception as e:
+                logger.error(f"Error in {self.name} capture stage: {str(e)}")
+                stats.errors += 1
+                frame = None
+            if frame is None:
+                break
+            stats.add(time.time() - start)
+            if not self.queues['capture'].put(frame, self._stop_event):
+                return
+        self.queues['capture'].put(END_OF_STREAM, self._stop_event)
+
+    def _inference_loop(self):
+        self._run_stage('inference', self.queues['capture'], self.queues['inference'], self.process_frame)
+
+    def _encode_loop(self):
+        self._run_stage('encode', self.queues['inference'], self.queues['encode'], self.encode_frame)
+
+    def _run_stage(self, name: str, source: StageQueue, target: StageQueue, function: Callable):
+        stats = self.stages[name]
+        while not self._stop_event.is_set():
+            item = source.get(self._stop_event)
+            if item is None:
+                continue
+            if item is END_OF_STREAM:
+                target.put(END_OF_STREAM, self._stop_event)
+                return
+            start = time.time()
+            try:
+                result = function(item)
+            except Exception as e:
+                logger.error(f"Error in {self.name} {name} stage: {str(e)}")
+                stats.errors += 1
+                continue
+            stats.add(time.time() - start)
+            if result is None:
+                continue
+            if not target.put(result, self._stop_event):
+                return
@@ -0,0 +1,108 @@
+# app/detection/motion_gate.py
+
+import cv2
+import logging
+import numpy as np
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class MotionGate:
+    """
+    Cheap activity check run before the detection models.
+
+    Frames are converted to grayscale, downscaled to downscale_width and cropped to the region of
+    interest, then compared with the previous frame (method 'diff') or fed to a MOG2 background
+    model (method 'mog2'). A frame passes when the fraction of changed ROI pixels reaches threshold.
+    The ROI is (x1, y1, x2, y2) as fractions of the frame size, so it survives resolution changes.
+    """
+
+    METHODS = ('diff', 'mog2')
+
+    def __init__(self,
+                 threshold: float = 0.01,
+                 roi: Optional[Tuple[float, float, float, float]] = None,
+                 method: str = 'diff',
+                 downscale_width: int = 160,
+                 pixel_threshold: int = 25):
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown motion gate method: {method}")
+        if roi is not None:
+            x1, y1, x2, y2 = roi
+            if not (0 <= x1 < x2 <= 1 and 0 <= y1 < y2 <= 1):
+                raise ValueError(f"ROI must be fractions (x1, y1, x2, y2) with x1 < x2 and y1 < y2, got {roi}")
+        self.threshold = threshold
+        self.roi = tuple(roi) if roi is not None else None
+        self.method = method
+        self.downscale_width = downscale_width
+        self.pixel_threshold = pixel_threshold
+
+        self.processed = 0
+        self.gated = 0
+        self.last_activity = 0.0
+        self._previous = None
+        self._subtractor = None
+
+    def reset(self):
+        """Forget the background, the next frame passes"""
+        self._previous = None
+        self._subtractor = None
+
+    def _prepare(self, frame: np.ndarray) -> np.ndarray:
+        gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        height, width = gray.shape[:2]
+        if width > self.downscale_width:
+            scale = self.downscale_width / width
+            gray = cv2.resize(gray, (self.downscale_width, max(1, int(height * scale))),
+                              interpolation=cv2.INTER_AREA)
+        if self.roi is not None:
+            height, width = gray.shape[:2]
+            x1, y1, x2, y2 = self.roi
+            gray = gray[int(y1 * height):max(int(y2 * height), int(y1 * height) + 1),
+                        int(x1 * width):max(int(x2 * width), int(x1 * width) + 1)]
+        return cv2.GaussianBlur(gray, (5, 5), 0)
+
+    def measure(self, frame: np.ndarray) -> Optional[float]:
+        """Fraction of changed ROI pixels, None when there is no background yet"""
+        small = self._prepare(frame)
+        if self.method == 'mog2':
+            if self._subtractor is None:
+                self._subtractor = cv2.createBackgroundSubtractorMOG2(history=200, detectShadows=True)
+                self._subtractor.apply(small)
+                return None
+            # Shadows are marked 127 by MOG2, only count confident foreground
+            mask = self._subtractor.apply(small) > 200
+            return float(mask.mean())
+
+        previous, self._previous = self._previous, small
+        if previous is None or previous.shape != small.shape:
+            return None
+        return float((cv2.absdiff(small, previous) > self.pixel_threshold).mean())
+
+    def should_process(self, frame: np.ndarray) -> bool:
+        """True when the models should run on this frame"""
+        try:
+            activity = self.measure(frame)
+        except Exception as e:
+            logger.error(f"Error in motion gate: {str(e)}")
+            activity = None
+        if activity is None or activity >= self.threshold:
+            self.processed += 1
+            self.last_activity = activity or 0.0
+            return True
+        self.gated += 1
+        self.last_activity = activity
+        return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.processed + self.gated
+        return {
+            'method': self.method,
+            'threshold': self.threshold,
+            'roi': self.roi,
+            'processed': self.processed,
+            'gated': self.gated,
+            'gated_ratio': (self.gated / total) if total else 0.0,
+            'last_activity': self.last_activity
+        }
@@ -0,0 +1,148 @@
+# app/detection/plate_consensus.py
+
+import logging
+import numpy as np
+from collections import deque
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+from nomeroff_net.tools.ocr_tools import StrLabelConverter, ctc_greedy_decode_batch
+
+logger = logging.getLogger(__name__)
+
+
+def softmax(logits: np.ndarray) -> np.ndarray:
+    logits = np.asarray(logits, dtype=np.float64)
+    exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+@lru_cache(maxsize=None)
+def _letters_lookup(letters: str) -> np.ndarray:
+    return StrLabelConverter(letters, 0).lookup
+
+
+def decode_probs(probs_list: List[np.ndarray], letters: str) -> List[Tuple[str, List[float]]]:
+    """
+    Best path CTC decoding of (seq_len, letters_max) probability matrices, blank is index 0.
+    Matrices of the same shape are decoded in one ctc_greedy_decode_batch call, on their log so its
+    softmax gives the probabilities back. Returns the upper-cased text of every matrix and one
+    confidence per character (max probability over its run).
+    """
+    lookup = _letters_lookup(letters)
+    decoded = [None] * len(probs_list)
+    by_shape = {}
+    for i, probs in enumerate(probs_list):
+        by_shape.setdefault(probs.shape, []).append(i)
+    for indexes in by_shape.values():
+        stacked = np.stack([probs_list[i] for i in indexes], axis=1)
+        texts, char_confidences, _ = ctc_greedy_decode_batch(np.log(np.maximum(stacked, 1e-12)), lookup,
+                                                             return_confidences=True)
+        for i, text, confidences in zip(indexes, texts, char_confidences):
+            decoded[i] = (text.upper(), [float(c) for c in confidences])
+    return decoded
+
+
+class PlateConsensus:
+    """
+    Pools the OCR outputs of one plate track into a single reading.
+
+    Each observation is the raw (seq_len, letters_max) logits of one frame plus a weight, usually the
+    plate detection score. Method 'logits' averages the weighted softmax outputs before CTC decoding,
+    method 'vote' decodes every frame and votes per character position, each vote weighted by the
+    character probability. Observations are grouped by OCR alphabet, the heaviest group wins.
+    The reading is stable once it came out the same, at min_confidence or better, stable_frames times in a row.
+    """
+
+    METHODS = ('logits', 'vote')
+
+    def __init__(self,
+                 method: str = 'logits',
+                 stable_frames: int = 3,
+                 min_confidence: float = 0.8,
+                 max_observations: int = 20):
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown consensus method: {method}")
+        self.method = method
+        self.stable_frames = stable_frames
+        self.min_confidence = min_confidence
+        self.max_observations = max_observations
+
+        self.observations: Dict[str, deque] = {}
+        self.count = 0
+        self.text = ''
+        self.confidence = 0.0
+        self.streak = 0
+
+    @property
+    def is_stable(self) -> bool:
+        return self.streak >= self.stable_frames
+
+    def add(self, logits: np.ndarray, letters: str, weight: float = 1.0) -> Tuple[str, float]:
+        """Add the logits of one frame and return the updated (text, confidence)"""
+        group = self.observations.setdefault(letters, deque(maxlen=self.max_observations))
+        group.append((softmax(logits), max(float(weight), 1e-6)))
+        self.count += 1
+
+        text, confidence = self.result()
+        if text and text == self.text and confidence >= self.min_confidence:
+            self.streak += 1
+        else:
+            self.streak = 1 if text and confidence >= self.min_confidence else 0
+        self.text, self.confidence = text, confidence
+        return text, confidence
+
+    def result(self) -> Tuple[str, float]:
+        """Consensus text and its mean character confidence"""
+        if not self.observations:
+            return '', 0.0
+        letters, group = max(self.observations.items(),
+                             key=lambda item: sum(weight for _, weight in item[1]))
+        if self.method == 'vote':
+            return self._vote(group, letters)
+        return self._average(group, letters)
+
+    @staticmethod
+    def _average(group, letters: str) -> Tuple[str, float]:
+        # Frames of the same model share seq_len, the modal shape is used should they ever differ
+        shapes = [probs.shape for probs, _ in group]
+        shape = max(set(shapes), key=shapes.count)
+        weights = np.array([weight for probs, weight in group if probs.shape == shape])
+        stacked = np.stack([probs for probs, _ in group if probs.shape == shape])
+        averaged = np.tensordot(weights, stacked, axes=1) / weights.sum()
+
+        text, confidences = decode_probs([averaged], letters)[0]
+        return text, float(np.mean(confidences)) if confidences else 0.0
+
+    @staticmethod
+    def _vote(group, letters: str) -> Tuple[str, float]:
+        decoded = zip(decode_probs([probs for probs, _ in group], letters), [weight for _, weight in group])
+        decoded = [(text, confidences, weight) for (text, confidences), weight in decoded if text]
+        if not decoded:
+            return '', 0.0
+
+        # Only readings of the best supported length take part in the position vote
+        length_weights = {}
+        for text, _, weight in decoded:
+            length_weights[len(text)] = length_weights.get(len(text), 0.0) + weight
+        length = max(length_weights, key=length_weights.get)
+        decoded = [item for item in decoded if len(item[0]) == length]
+        total = sum(weight for _, _, weight in decoded)
+
+        chars, confidences = [], []
+        for position in range(length):
+            votes = {}
+            for text, char_confidences, weight in decoded:
+                votes[text[position]] = votes.get(text[position], 0.0) + weight * char_confidences[position]
+            char = max(votes, key=votes.get)
+            chars.append(char)
+            confidences.append(votes[char] / total)
+        return ''.join(chars), float(np.mean(confidences))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'method': self.method,
+            'observations': self.count,
+            'text': self.text,
+            'confidence': self.confidence,
+            'stable': self.is_stable
+        }
@@ -11,6 +11,7 @@ import logging
 from werkzeug.utils import secure_filename
 from app.detection import bp
 from app.detection.detector import LicensePlateDetector
+from app.detection.stream_manager import StreamManager
 from app.database.factory import DatabaseFactory
 
 logger = logging.getLogger(__name__)
@@ -18,11 +19,23 @@ logger = logging.getLogger(__name__)
 def get_detector():
     """Get or create detector instance"""
     if 'detector' not in current_app.extensions:
-        detector = LicensePlateDetector(DatabaseFactory)
+        detector = LicensePlateDetector(DatabaseFactory, current_app.config)
         detector.initialize_databases()
+        detector.update_config(current_app.config)
         current_app.extensions['detector'] = detector
     return current_app.extensions['detector']
 
+def get_stream_manager():
+    """Get or create the multi-camera stream manager sharing the detector's models"""
+    if 'stream_manager' not in current_app.extensions:
+        manager = StreamManager(
+            get_detector(),
+            batch_size=current_app.config.get('STREAM_BATCH_SIZE', 4),
+            max_streams=current_app.config.get('MAX_STREAMS', 8)
+        )
+        current_app.extensions['stream_manager'] = manager
+    return current_app.extensions['stream_manager']
+
 def get_db():
     """Get database instance with error handling"""
     try:
@@ -239,7 +252,11 @@ def update_config():
         valid_keys = [
             'FRAME_SKIP', 'RESIZE_WIDTH', 'RESIZE_HEIGHT',
             'CONFIDENCE_THRESHOLD', 'MAX_DETECTIONS_PER_FRAME',
-            'PROCESS_EVERY_N_SECONDS'
+            'PROCESS_EVERY_N_SECONDS', 'FRAME_PIPELINE_ENABLED',
+            'FRAME_QUEUE_SIZE', 'MOTION_GATE_ENABLED', 'MOTION_THRESHOLD',
+            'MOTION_ROI', 'MOTION_METHOD', 'TRACKING_ENABLED',
+            'TRACK_REFRESH_INTERVAL', 'TRACK_MAX_AGE', 'TRACK_IOU_THRESHOLD',
+            'OCR_CONSENSUS_METHOD', 'OCR_CONSENSUS_STABLE_FRAMES', 'OCR_CONSENSUS_MIN_CONFIDENCE'
         ]
         
         for key, value in data.items():
@@ -260,7 +277,20 @@ def get_config():
             'RESIZE_HEIGHT': current_app.config['RESIZE_HEIGHT'],
             'CONFIDENCE_THRESHOLD': current_app.config['CONFIDENCE_THRESHOLD'],
             'MAX_DETECTIONS_PER_FRAME': current_app.config['MAX_DETECTIONS_PER_FRAME'],
-            'PROCESS_EVERY_N_SECONDS': current_app.config['PROCESS_EVERY_N_SECONDS']
+            'PROCESS_EVERY_N_SECONDS': current_app.config['PROCESS_EVERY_N_SECONDS'],
+            'FRAME_PIPELINE_ENABLED': current_app.config['FRAME_PIPELINE_ENABLED'],
+            'FRAME_QUEUE_SIZE': current_app.config['FRAME_QUEUE_SIZE'],
+            'MOTION_GATE_ENABLED': current_app.config['MOTION_GATE_ENABLED'],
+            'MOTION_THRESHOLD': current_app.config['MOTION_THRESHOLD'],
+            'MOTION_ROI': current_app.config.get('MOTION_ROI'),
+            'MOTION_METHOD': current_app.config['MOTION_METHOD'],
+            'TRACKING_ENABLED': current_app.config['TRACKING_ENABLED'],
+            'TRACK_REFRESH_INTERVAL': current_app.config['TRACK_REFRESH_INTERVAL'],
+            'TRACK_MAX_AGE': current_app.config['TRACK_MAX_AGE'],
+            'TRACK_IOU_THRESHOLD': current_app.config['TRACK_IOU_THRESHOLD'],
+            'OCR_CONSENSUS_METHOD': current_app.config['OCR_CONSENSUS_METHOD'],
+            'OCR_CONSENSUS_STABLE_FRAMES': current_app.config['OCR_CONSENSUS_STABLE_FRAMES'],
+            'OCR_CONSENSUS_MIN_CONFIDENCE': current_app.config['OCR_CONSENSUS_MIN_CONFIDENCE']
         }
         return jsonify(config)
     except Exception as e:
@@ -280,6 +310,87 @@ def detected_plates():
         return jsonify({'error': str(e)}), 500
 
         
+
+@bp.route('/pipeline_stats')
+def pipeline_stats():
+    """Get per-stage counters and queue depths of the running frame pipeline"""
+    try:
+        detector = get_detector()
+        return jsonify({'pipeline': detector.get_pipeline_stats()})
+    except Exception as e:
+        logger.error(f"Error getting pipeline stats: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+
+@bp.route('/storage_stats')
+def storage_stats():
+    """Get queue depths and write counters of the background database writer"""
+    try:
+        detector = get_detector()
+        return jsonify({'storage': detector.get_storage_stats()})
+    except Exception as e:
+        logger.error(f"Error getting storage stats: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+        
+@bp.route('/streams', methods=['GET'])
+def list_streams():
+    """Get registered cameras with their counters"""
+    try:
+        return jsonify(get_stream_manager().get_stats())
+    except Exception as e:
+        logger.error(f"Error listing streams: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/streams', methods=['POST'])
+def add_stream():
+    """Register a source (file, RTSP URL, device index or 'picamera') under a camera id"""
+    try:
+        data = request.json or {}
+        camera_id = data.pop('camera_id', None)
+        source = data.pop('source', None)
+        if not camera_id or source is None:
+            return jsonify({'error': 'camera_id and source are required'}), 400
+        for key in ('frame_size', 'motion_roi'):
+            if data.get(key):
+                data[key] = tuple(data[key])
+
+        get_stream_manager().add_stream(camera_id, source, **data)
+        return jsonify({'success': f'Stream {camera_id} started'})
+    except (ValueError, TypeError) as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error adding stream: {str(e)}")
+        return jsonify({'error': f'Error adding stream: {str(e)}'}), 500
+
+@bp.route('/streams/<camera_id>', methods=['DELETE'])
+def remove_stream(camera_id):
+    try:
+        get_stream_manager().remove_stream(camera_id)
+        return jsonify({'success': f'Stream {camera_id} stopped'})
+    except KeyError as e:
+        return jsonify({'error': str(e)}), 404
+
+@bp.route('/streams/<camera_id>/feed')
+def stream_feed(camera_id):
+    stream = get_stream_manager().get_stream(camera_id)
+    if stream is None:
+        return jsonify({'error': f'Unknown camera {camera_id}'}), 404
+    def generate():
+        while True:
+            frame = stream.get_frame()
+            if frame is None:
+                break
+            yield (b'--frame\r\n'
+                   b'Content-Type: image/jpeg\r\n\r\n' + frame + b'\r\n')
+    return Response(generate(), mimetype='multipart/x-mixed-replace; boundary=frame')
+
+@bp.route('/streams/<camera_id>/plates')
+def stream_plates(camera_id):
+    stream = get_stream_manager().get_stream(camera_id)
+    if stream is None:
+        return jsonify({'error': f'Unknown camera {camera_id}'}), 404
+    return jsonify({'camera_id': stream.camera_id, 'plates': stream.detected_plates})
         
 
 # Add to app/detection/routes.py
@@ -0,0 +1,97 @@
+# app/detection/stage_executor.py
+
+import time
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+from .frame_pipeline import StageStats
+
+logger = logging.getLogger(__name__)
+
+
+class StageExecutor:
+    """
+    Runs the independent stages of one frame concurrently on a shared thread pool.
+
+    run() takes a small DAG, {name: (func, dependencies)}: a stage starts as soon as all of its
+    dependencies finished and is called with their results as keyword arguments. map() fans a
+    function out over items. The models spend most of their time in torch and OpenCV with the
+    GIL released, so threads overlap well. Stages must not call run() or map() themselves,
+    nested waits on the same pool could run out of workers. With max_workers <= 1 everything
+    runs inline in the calling thread, still timed.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+        self.pool = None
+        if max_workers > 1:
+            self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='stage')
+        self.stages: Dict[str, StageStats] = {}
+        self._lock = threading.Lock()
+
+    def _record(self, name: str, elapsed: float, failed: bool = False):
+        with self._lock:
+            stats = self.stages.setdefault(name, StageStats())
+            if failed:
+                stats.errors += 1
+            else:
+                stats.add(elapsed)
+
+    def _timed(self, name: str, func: Callable, *args, **kwargs) -> Any:
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            self._record(name, 0.0, failed=True)
+            raise
+        self._record(name, time.perf_counter() - start)
+        return result
+
+    def run(self, stages: Dict[str, Tuple[Callable, Sequence[str]]]) -> Dict[str, Any]:
+        """Run a DAG of stages, returns {name: result}. The first stage error is raised."""
+        unknown = {dep for _, deps in stages.values() for dep in deps} - set(stages)
+        if unknown:
+            raise ValueError(f"Unknown stage dependencies: {sorted(unknown)}")
+
+        results, running, pending = {}, {}, dict(stages)
+        if self.pool is None:
+            while pending:
+                ready = [name for name, (_, deps) in pending.items() if all(dep in results for dep in deps)]
+                if not ready:
+                    raise ValueError(f"Stage dependency cycle: {sorted(pending)}")
+                for name in ready:
+                    func, deps = pending.pop(name)
+                    results[name] = self._timed(name, func, **{dep: results[dep] for dep in deps})
+            return results
+
+        while pending or running:
+            for name in [name for name, (_, deps) in pending.items() if all(dep in results for dep in deps)]:
+                func, deps = pending.pop(name)
+                running[self.pool.submit(self._timed, name, func, **{dep: results[dep] for dep in deps})] = name
+            if not running:
+                raise ValueError(f"Stage dependency cycle: {sorted(pending)}")
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[running.pop(future)] = future.result()
+        return results
+
+    def map(self, name: str, func: Callable, items: Iterable) -> List[Any]:
+        """func over items on the pool, results in order, each call timed as stage name"""
+        items = list(items)
+        if self.pool is None or len(items) < 2:
+            return [self._timed(name, func, item) for item in items]
+        return list(self.pool.map(lambda item: self._timed(name, func, item), items))
+
+    def call(self, name: str, func: Callable, *args, **kwargs) -> Any:
+        """func in the calling thread, timed as stage name"""
+        return self._timed(name, func, *args, **kwargs)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-stage counters and mean duration"""
+        with self._lock:
+            return {name: stats.get_stats() for name, stats in self.stages.items()}
+
+    def shutdown(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=False)
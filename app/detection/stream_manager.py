@@ -0,0 +1,324 @@
+# app/detection/stream_manager.py
+
+import cv2
+import time
+import threading
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from .frame_pipeline import StageQueue, DropPolicy, END_OF_STREAM, encode_jpeg
+from .motion_gate import MotionGate
+
+logger = logging.getLogger(__name__)
+
+# Source name for the Raspberry Pi camera, everything else is opened through cv2.VideoCapture
+PICAMERA_SOURCE = 'picamera'
+
+
+@dataclass
+class StreamConfig:
+    """Per-camera processing settings"""
+    frame_skip: int = 1
+    process_every_n_seconds: float = 0.0
+    frame_size: Optional[Tuple[int, int]] = None
+    queue_size: int = 2
+    motion_gate: bool = False
+    motion_threshold: float = 0.01
+    motion_roi: Optional[Tuple[float, float, float, float]] = None
+    motion_method: str = 'diff'
+
+
+def is_live_source(source: Any) -> bool:
+    """Cameras and network streams are live, anything else is treated as a file"""
+    source = str(source)
+    return (source == PICAMERA_SOURCE or source.isdigit() or
+            source.lower().startswith(('rtsp://', 'rtmp://', 'http://', 'https://')))
+
+
+class CameraStream:
+    """A registered source: its capture thread, frame queues and per-camera state"""
+
+    def __init__(self, camera_id: str, source: Any, config: StreamConfig):
+        self.camera_id = str(camera_id)
+        self.source = source
+        self.config = config
+        self.is_live = is_live_source(source)
+
+        # Live sources keep only the newest frames, files are read no faster than they are processed
+        self.frames = StageQueue(f"{self.camera_id}-capture", config.queue_size,
+                                 DropPolicy.LATEST if self.is_live else DropPolicy.NONE)
+        # The shared inference thread never blocks on a slow or absent viewer
+        self.outputs = StageQueue(f"{self.camera_id}-output", config.queue_size, DropPolicy.LATEST)
+
+        self.stop_event = threading.Event()
+        self.finished = False
+        self.detected_plates = []
+
+        # Each camera keeps its own background and region of interest
+        self.motion_gate = None
+        if config.motion_gate:
+            self.motion_gate = MotionGate(threshold=config.motion_threshold,
+                                          roi=config.motion_roi,
+                                          method=config.motion_method)
+
+        self.frame_count = 0
+        self.last_process_time = 0
+        self.captured = 0
+        self.processed = 0
+        self.skipped = 0
+
+        self._capture = None
+        self._picam2 = None
+        self._thread = None
+
+    def open(self):
+        """Open the underlying capture device, file or URL"""
+        if str(self.source) == PICAMERA_SOURCE:
+            from picamera2 import Picamera2
+            self._picam2 = Picamera2()
+            self._picam2.configure(self._picam2.create_preview_configuration(
+                main={"format": 'XRGB8888', "size": self.config.frame_size or (640, 480)}))
+            self._picam2.start()
+        else:
+            source = int(self.source) if str(self.source).isdigit() else self.source
+            self._capture = cv2.VideoCapture(source)
+            if not self._capture.isOpened():
+                raise ValueError(f"Could not open source for camera {self.camera_id}: {self.source}")
+        logger.info(f"Opened camera {self.camera_id} ({'live' if self.is_live else 'file'}): {self.source}")
+
+    def read(self):
+        """Read the next frame in BGR order, None once the source is exhausted"""
+        if self._picam2 is not None:
+            frame = self._picam2.capture_array()
+            frame = cv2.cvtColor(frame, cv2.COLOR_RGBA2RGB)
+        else:
+            ret, frame = self._capture.read()
+            if not ret or frame is None:
+                return None
+        if self.config.frame_size:
+            frame = cv2.resize(frame, self.config.frame_size)
+        return frame
+
+    def start(self):
+        self.open()
+        self._thread = threading.Thread(target=self._capture_loop,
+                                        name=f"stream-{self.camera_id}-capture",
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 2.0):
+        self.stop_event.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=timeout)
+        try:
+            if self._capture is not None:
+                self._capture.release()
+            if self._picam2 is not None:
+                self._picam2.stop()
+                self._picam2.close()
+        except Exception as e:
+            logger.error(f"Error closing camera {self.camera_id}: {str(e)}")
+        self._capture = None
+        self._picam2 = None
+        self.finished = True
+
+    def _capture_loop(self):
+        while not self.stop_event.is_set():
+            try:
+                frame = self.read()
+            except Exception as e:
+                logger.error(f"Error reading from camera {self.camera_id}: {str(e)}")
+                frame = None
+            if frame is None:
+                break
+            self.captured += 1
+            if not self.frames.put(frame, self.stop_event):
+                return
+        self.frames.put(END_OF_STREAM, self.stop_event)
+
+    def should_process(self, frame) -> bool:
+        """Apply the per-camera frame_skip, time and motion gating"""
+        self.frame_count += 1
+        current_time = time.time()
+        if (self.frame_count % max(1, self.config.frame_skip) == 0 and
+                current_time - self.last_process_time >= self.config.process_every_n_seconds and
+                (self.motion_gate is None or self.motion_gate.should_process(frame))):
+            self.last_process_time = current_time
+            return True
+        return False
+
+    def publish(self, frame, detections: Optional[List[Dict]] = None):
+        """Hand a (possibly annotated) frame to the viewers and remember new plates"""
+        for det in detections or []:
+            if not any(existing['text'] == det['text'] for existing in self.detected_plates):
+                self.detected_plates.append(det)
+        self.outputs.put(frame, self.stop_event)
+
+    def get_frame(self, timeout: float = 5.0) -> Optional[bytes]:
+        """Latest output frame as JPEG, None once the stream has ended or nothing arrived in time"""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            frame = self.outputs.get(self.stop_event, timeout=0.1)
+            if frame is not None:
+                return encode_jpeg(frame)
+            if self.finished or self.stop_event.is_set():
+                return None
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'camera_id': self.camera_id,
+            'source': str(self.source),
+            'live': self.is_live,
+            'finished': self.finished,
+            'captured': self.captured,
+            'processed': self.processed,
+            'skipped': self.skipped,
+            'detected_plates': len(self.detected_plates),
+            'motion_gate': self.motion_gate.get_stats() if self.motion_gate else None,
+            'queues': {
+                'capture': self.frames.get_stats(),
+                'output': self.outputs.get_stats()
+            }
+        }
+
+
+class StreamManager:
+    """
+    Serves several cameras from one LicensePlateDetector, so YOLO, CRAFT and the OCR models are
+    loaded once per node. Each camera has its own capture thread; a single inference thread takes
+    at most one pending frame per camera, round robin, and runs them through the models as one batch.
+    """
+
+    def __init__(self, detector, batch_size: int = 4, max_streams: int = 8):
+        self.detector = detector
+        self.batch_size = batch_size
+        self.max_streams = max_streams
+        self.streams: Dict[str, CameraStream] = {}
+
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._next_index = 0
+
+        self.batches = 0
+        self.batched_frames = 0
+        self.batch_time = 0.0
+
+    def add_stream(self, camera_id: str, source: Any, **config) -> CameraStream:
+        """Register and start a source under camera_id"""
+        camera_id = str(camera_id)
+        with self._lock:
+            if camera_id in self.streams:
+                raise ValueError(f"Camera {camera_id} is already registered")
+            if len(self.streams) >= self.max_streams:
+                raise ValueError(f"Maximum number of streams ({self.max_streams}) reached")
+            stream = CameraStream(camera_id, source, StreamConfig(**config))
+            stream.start()
+            self.streams[camera_id] = stream
+        self.start()
+        logger.info(f"Registered camera {camera_id}")
+        return stream
+
+    def remove_stream(self, camera_id: str):
+        with self._lock:
+            stream = self.streams.pop(str(camera_id), None)
+        if stream is None:
+            raise KeyError(f"Unknown camera {camera_id}")
+        stream.stop()
+        self.detector.flush_tracks(stream.camera_id)
+        logger.info(f"Removed camera {camera_id}")
+
+    def get_stream(self, camera_id: str) -> Optional[CameraStream]:
+        with self._lock:
+            return self.streams.get(str(camera_id))
+
+    def start(self):
+        """Start the shared inference thread"""
+        if self._thread and self._thread.is_alive():
+            return self
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._inference_loop, name="stream-inference", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop inference and all registered streams"""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=5.0)
+            self._thread = None
+        with self._lock:
+            streams = list(self.streams.values())
+            self.streams = {}
+        for stream in streams:
+            stream.stop()
+            self.detector.flush_tracks(stream.camera_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            streams = list(self.streams.values())
+        return {
+            'batch_size': self.batch_size,
+            'batches': self.batches,
+            'avg_batch_size': (self.batched_frames / self.batches) if self.batches else 0.0,
+            'avg_batch_ms': (self.batch_time / self.batches * 1000) if self.batches else 0.0,
+            'streams': {stream.camera_id: stream.get_stats() for stream in streams}
+        }
+
+    def _inference_loop(self):
+        while not self._stop_event.is_set():
+            try:
+                batch = self._collect_batch()
+                if not batch:
+                    self._stop_event.wait(0.01)
+                    continue
+                self._process_batch(batch)
+            except Exception as e:
+                logger.error(f"Error in stream inference loop: {str(e)}", exc_info=True)
+
+    def _collect_batch(self) -> List[Tuple[CameraStream, Any]]:
+        """Take at most one pending frame per camera, starting with a different camera each round"""
+        with self._lock:
+            streams = list(self.streams.values())
+        if not streams:
+            return []
+        self._next_index = (self._next_index + 1) % len(streams)
+        streams = streams[self._next_index:] + streams[:self._next_index]
+
+        batch = []
+        for stream in streams:
+            if len(batch) >= self.batch_size:
+                break
+            frame = stream.frames.get_nowait()
+            if frame is None:
+                continue
+            if frame is END_OF_STREAM:
+                stream.finished = True
+                continue
+            if not stream.should_process(frame):
+                stream.skipped += 1
+                stream.publish(frame)
+                continue
+            batch.append((stream, frame))
+        return batch
+
+    def _process_batch(self, batch: List[Tuple[CameraStream, Any]]):
+        frames = [frame for _, frame in batch]
+        camera_ids = [stream.camera_id for stream, _ in batch]
+
+        start = time.time()
+        try:
+            outputs = self.detector.process_frames(frames, camera_ids)
+        except Exception as e:
+            logger.error(f"Error processing batch from cameras {camera_ids}: {str(e)}")
+            outputs = [(frame, []) for frame in frames]
+        self.batch_time += time.time() - start
+        self.batches += 1
+        self.batched_frames += len(frames)
+
+        for (stream, _), (visualization, detections) in zip(batch, outputs):
+            stream.processed += 1
+            stream.publish(visualization, detections)
@@ -0,0 +1,186 @@
+# app/detection/tracker.py
+
+import logging
+import numpy as np
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def iou_matrix(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """Pairwise IoU between two sets of (x1, y1, x2, y2) boxes"""
+    boxes_a = np.asarray(boxes_a, dtype=np.float64).reshape(-1, 4)
+    boxes_b = np.asarray(boxes_b, dtype=np.float64).reshape(-1, 4)
+    if not len(boxes_a) or not len(boxes_b):
+        return np.zeros((len(boxes_a), len(boxes_b)))
+
+    x1 = np.maximum(boxes_a[:, None, 0], boxes_b[None, :, 0])
+    y1 = np.maximum(boxes_a[:, None, 1], boxes_b[None, :, 1])
+    x2 = np.minimum(boxes_a[:, None, 2], boxes_b[None, :, 2])
+    y2 = np.minimum(boxes_a[:, None, 3], boxes_b[None, :, 3])
+    intersection = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+
+    area_a = (boxes_a[:, 2] - boxes_a[:, 0]) * (boxes_a[:, 3] - boxes_a[:, 1])
+    area_b = (boxes_b[:, 2] - boxes_b[:, 0]) * (boxes_b[:, 3] - boxes_b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - intersection
+    return np.where(union > 0, intersection / np.maximum(union, 1e-9), 0.0)
+
+
+def greedy_match(iou: np.ndarray, iou_threshold: float) -> List[Tuple[int, int]]:
+    """Pairs (row, col) in decreasing IoU order, each row and column used at most once"""
+    if not iou.size:
+        return []
+    rows, cols = np.nonzero(iou >= iou_threshold)
+    order = np.argsort(-iou[rows, cols], kind='stable')
+    matches, used_rows, used_cols = [], set(), set()
+    for row, col in zip(rows[order], cols[order]):
+        if row in used_rows or col in used_cols:
+            continue
+        used_rows.add(row)
+        used_cols.add(col)
+        matches.append((int(row), int(col)))
+    return matches
+
+
+class KalmanBoxFilter:
+    """
+    Constant velocity Kalman filter on a bounding box, as in SORT.
+    State is (cx, cy, area, aspect ratio, vx, vy, v_area), the aspect ratio is assumed constant.
+    """
+
+    def __init__(self, bbox: np.ndarray):
+        self.F = np.eye(7)
+        self.F[0, 4] = self.F[1, 5] = self.F[2, 6] = 1.0
+        self.H = np.eye(4, 7)
+
+        self.R = np.diag([1.0, 1.0, 10.0, 10.0])
+        self.Q = np.eye(7)
+        self.Q[4:, 4:] *= 0.01
+        self.Q[-1, -1] *= 0.01
+        self.P = np.eye(7) * 10.0
+        self.P[4:, 4:] *= 1000.0  # unknown initial velocity
+
+        self.x = np.zeros(7)
+        self.x[:4] = self.to_measurement(bbox)
+
+    @staticmethod
+    def to_measurement(bbox: np.ndarray) -> np.ndarray:
+        x1, y1, x2, y2 = np.asarray(bbox[:4], dtype=np.float64)
+        width, height = max(x2 - x1, 1e-6), max(y2 - y1, 1e-6)
+        return np.array([x1 + width / 2.0, y1 + height / 2.0, width * height, width / height])
+
+    def to_bbox(self) -> np.ndarray:
+        cx, cy, area, ratio = self.x[:4]
+        width = np.sqrt(max(area * ratio, 0.0))
+        height = area / width if width > 0 else 0.0
+        return np.array([cx - width / 2.0, cy - height / 2.0, cx + width / 2.0, cy + height / 2.0])
+
+    def predict(self) -> np.ndarray:
+        if self.x[2] + self.x[6] <= 0:
+            self.x[6] = 0.0
+        self.x = self.F @ self.x
+        self.P = self.F @ self.P @ self.F.T + self.Q
+        return self.to_bbox()
+
+    def update(self, bbox: np.ndarray):
+        y = self.to_measurement(bbox) - self.H @ self.x
+        S = self.H @ self.P @ self.H.T + self.R
+        K = self.P @ self.H.T @ np.linalg.inv(S)
+        self.x = self.x + K @ y
+        self.P = (np.eye(7) - K @ self.H) @ self.P
+
+
+class Track:
+    """A tracked object; recognition results are kept in data between frames"""
+
+    def __init__(self, track_id: int, bbox: np.ndarray, score: float, frame_index: int):
+        self.track_id = track_id
+        self.filter = KalmanBoxFilter(bbox)
+        self.bbox = np.asarray(bbox[:4], dtype=np.float64)
+        self.score = score
+        self.hits = 1
+        self.age = 0
+        self.time_since_update = 0
+        self.first_frame = frame_index
+        self.last_frame = frame_index
+        self.last_recognized_frame = None
+        self.data: Dict[str, Any] = {}
+
+    def predict(self):
+        self.bbox = self.filter.predict()
+        self.age += 1
+        self.time_since_update += 1
+
+    def update(self, bbox: np.ndarray, score: float, frame_index: int):
+        self.filter.update(bbox)
+        self.bbox = np.asarray(bbox[:4], dtype=np.float64)
+        self.score = score
+        self.hits += 1
+        self.time_since_update = 0
+        self.last_frame = frame_index
+
+    def needs_recognition(self, frame_index: int, refresh_interval: int) -> bool:
+        """New tracks are recognized at once, existing ones every refresh_interval frames"""
+        if self.last_recognized_frame is None:
+            return True
+        return refresh_interval > 0 and frame_index - self.last_recognized_frame >= refresh_interval
+
+    def mark_recognized(self, frame_index: int):
+        self.last_recognized_frame = frame_index
+
+
+class SortTracker:
+    """
+    SORT-style multi-object tracker: Kalman prediction plus greedy IoU matching.
+    A track ends once it has not been matched for more than max_age frames; update() returns
+    the tracks ended in that call so their results can be finalized.
+    """
+
+    def __init__(self, iou_threshold: float = 0.3, max_age: int = 15, min_hits: int = 1):
+        self.iou_threshold = iou_threshold
+        self.max_age = max_age
+        self.min_hits = min_hits
+        self.tracks: List[Track] = []
+        self.frame_index = 0
+        self._next_id = 1
+
+    def update(self, detections: np.ndarray) -> Tuple[List[Track], List[Track]]:
+        """
+        detections: (N, 4+) array of x1, y1, x2, y2[, score].
+        Returns the track assigned to each detection (in detection order) and the finished tracks.
+        """
+        self.frame_index += 1
+        detections = np.asarray(detections, dtype=np.float64)
+        if not detections.size:
+            detections = detections.reshape(0, 5)
+
+        for track in self.tracks:
+            track.predict()
+
+        predicted = np.array([track.bbox for track in self.tracks]).reshape(-1, 4)
+        matches = greedy_match(iou_matrix(predicted, detections[:, :4]), self.iou_threshold)
+
+        assigned: List[Optional[Track]] = [None] * len(detections)
+        for track_index, detection_index in matches:
+            track = self.tracks[track_index]
+            score = float(detections[detection_index, 4]) if detections.shape[1] > 4 else 1.0
+            track.update(detections[detection_index], score, self.frame_index)
+            assigned[detection_index] = track
+
+        for detection_index, track in enumerate(assigned):
+            if track is None:
+                score = float(detections[detection_index, 4]) if detections.shape[1] > 4 else 1.0
+                track = Track(self._next_id, detections[detection_index], score, self.frame_index)
+                self._next_id += 1
+                self.tracks.append(track)
+                assigned[detection_index] = track
+
+        finished = [track for track in self.tracks if track.time_since_update > self.max_age]
+        self.tracks = [track for track in self.tracks if track.time_since_update <= self.max_age]
+        return assigned, [track for track in finished if track.hits >= self.min_hits]
+
+    def flush(self) -> List[Track]:
+        """End all tracks, e.g. when the stream stops"""
+        finished = [track for track in self.tracks if track.hits >= self.min_hits]
+        self.tracks = []
+        return finished
@@ -0,0 +1,112 @@
+# app/detection/unified_detector.py
+
+import numpy as np
+import logging
+from typing import Dict, List, Tuple, Sequence
+import torch
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_VEHICLE_CLASSES = ('car', 'motorcycle', 'bus', 'truck')
+DEFAULT_PLATE_CLASSES = ('numberplate', 'license_plate', 'license plate', 'plate')
+
+
+class UnifiedVehiclePlateDetector:
+    """
+    Vehicles and number plates from a single YOLOv8 forward pass.
+
+    The model is any ultralytics checkpoint whose class names include vehicle classes
+    (car, motorcycle, bus, truck) and a plate class, e.g. yolov8n fine-tuned on COCO vehicles
+    plus plates. "modelhub://<name>" loads a model listed in the nomeroff modelhub; the
+    yolov8_brand_np models there only know plates, so vehicles come back empty with them.
+    """
+
+    def __init__(self, model_path: str,
+                 confidence_threshold: float = 0.25,
+                 plate_confidence_threshold: float = 0.4,
+                 iou_threshold: float = 0.7,
+                 vehicle_classes: Sequence[str] = DEFAULT_VEHICLE_CLASSES,
+                 plate_classes: Sequence[str] = DEFAULT_PLATE_CLASSES):
+        self.model_path = model_path
+        self.confidence_threshold = confidence_threshold
+        self.plate_confidence_threshold = plate_confidence_threshold
+        self.iou_threshold = iou_threshold
+        self.model = None
+        self.device = 'cuda' if torch.cuda.is_available() else 'cpu'
+        self.initialized = False
+
+        # class id -> name, filled from the model's own class names
+        self.vehicle_classes = {}
+        self.plate_classes = {}
+
+        try:
+            from ultralytics import YOLO
+            self.model = YOLO(self._resolve_model_path(model_path))
+            names = self.model.names
+            self.vehicle_classes = {i: name for i, name in names.items() if name in vehicle_classes}
+            self.plate_classes = {i: name for i, name in names.items() if name in plate_classes}
+            if not self.plate_classes:
+                raise ValueError(f"no plate class among {list(names.values())}")
+            if not self.vehicle_classes:
+                logger.warning(f"Unified detector model {model_path} has no vehicle classes, "
+                               f"only plates will be detected")
+            self.initialized = True
+            logger.info(f"Unified detector initialized using {self.device}, vehicles: "
+                        f"{list(self.vehicle_classes.values())}, plates: {list(self.plate_classes.values())}")
+
+        except Exception as e:
+            logger.error(f"Error initializing unified detector: {str(e)}")
+            self.model = None
+
+    @staticmethod
+    def _resolve_model_path(model_path: str) -> str:
+        """Local checkpoint path, modelhub:// names are downloaded through the nomeroff modelhub"""
+        if model_path.startswith("modelhub://"):
+            from nomeroff_net.tools.mcm import modelhub
+            return modelhub.download_model_by_name(model_path.split("modelhub://")[1])["path"]
+        return model_path
+
+    def detect_batch(self, images: List[np.ndarray]) -> Tuple[List[List[Dict]], List[np.ndarray]]:
+        """
+        Vehicle detections (same dicts as VehicleObjectDetector) and plate boxes
+        ([x1, y1, x2, y2, confidence, class] rows, as NumberPlateLocalization returns them)
+        of BGR images, with one model call
+        """
+        if not self.initialized or self.model is None:
+            logger.warning("Unified detector not initialized, skipping detection")
+            return [[] for _ in images], [np.zeros((0, 6), dtype=np.float32) for _ in images]
+
+        try:
+            # the lowest threshold goes to the model, each kind is filtered afterwards
+            results = self.model(list(images), verbose=False,
+                                 conf=min(self.confidence_threshold, self.plate_confidence_threshold),
+                                 iou=self.iou_threshold)
+            parsed = [self._parse_result(result, image) for result, image in zip(results, images)]
+            vehicle_detections, plate_bboxs = zip(*parsed) if parsed else ((), ())
+            return list(vehicle_detections), list(plate_bboxs)
+
+        except Exception as e:
+            logger.error(f"Error in unified detection: {str(e)}")
+            return [[] for _ in images], [np.zeros((0, 6), dtype=np.float32) for _ in images]
+
+    def _parse_result(self, result, image: np.ndarray) -> Tuple[List[Dict], np.ndarray]:
+        """Split one YOLO result into vehicle detections and plate boxes"""
+        boxes = result.boxes.xyxy.cpu().numpy()
+        confidences = result.boxes.conf.cpu().numpy()
+        classes = result.boxes.cls.cpu().numpy().astype(int)
+
+        is_plate = np.isin(classes, list(self.plate_classes)) & (confidences >= self.plate_confidence_threshold)
+        plate_bboxs = np.column_stack([boxes[is_plate], confidences[is_plate],
+                                       classes[is_plate]]).astype(np.float32).reshape(-1, 6)
+
+        is_vehicle = np.isin(classes, list(self.vehicle_classes)) & (confidences >= self.confidence_threshold)
+        vehicle_detections = []
+        for box, conf, cls in zip(boxes[is_vehicle].astype(int), confidences[is_vehicle], classes[is_vehicle]):
+            x1, y1, x2, y2 = box.tolist()
+            vehicle_detections.append({
+                'bbox': (x1, y1, x2, y2),
+                'confidence': float(conf),
+                'class': self.vehicle_classes[cls],
+                'image': image[y1:y2, x1:x2].copy()
+            })
+        return vehicle_detections, plate_bboxs
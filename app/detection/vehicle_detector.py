@@ -39,41 +39,45 @@ class VehicleObjectDetector:
 
     def detect_vehicles(self, image: np.ndarray) -> List[Dict]:
         """Detect vehicles in an image"""
+        return self.detect_vehicles_batch([image])[0]
+
+    def detect_vehicles_batch(self, images: List[np.ndarray]) -> List[List[Dict]]:
+        """Detect vehicles in several images with a single model call"""
         if not self.initialized or self.model is None:
             logger.warning("Vehicle detector not initialized, skipping detection")
-            return []
+            return [[] for _ in images]
             
         try:
             # Make predictions
-            results = self.model(image, verbose=False)  # Disable progress bar
-            
-            # Process detections
-            detections = []
-            
-            # Get the first result (only processing single image)
-            result = results[0]
-            
-            for box in result.boxes:
-                cls = int(box.cls[0].item())
-                conf = box.conf[0].item()
-                
-                # Only process if it's a vehicle class and meets confidence threshold
-                if cls in self.vehicle_classes and conf >= self.confidence_threshold:
-                    x1, y1, x2, y2 = map(int, box.xyxy[0].tolist())
-                    
-                    detection = {
-                        'bbox': (x1, y1, x2, y2),
-                        'confidence': float(conf),
-                        'class': self.vehicle_classes[cls],
-                        'image': image[y1:y2, x1:x2].copy()  # Get vehicle crop
-                    }
-                    detections.append(detection)
+            results = self.model(list(images), verbose=False)  # Disable progress bar
             
-            return detections
+            return [self._parse_result(result, image) for result, image in zip(results, images)]
             
         except Exception as e:
             logger.error(f"Error detecting vehicles: {str(e)}")
-            return []
+            return [[] for _ in images]
+
+    def _parse_result(self, result, image: np.ndarray) -> List[Dict]:
+        """Convert one YOLO result into vehicle detections"""
+        detections = []
+        
+        for box in result.boxes:
+            cls = int(box.cls[0].item())
+            conf = box.conf[0].item()
+            
+            # Only process if it's a vehicle class and meets confidence threshold
+            if cls in self.vehicle_classes and conf >= self.confidence_threshold:
+                x1, y1, x2, y2 = map(int, box.xyxy[0].tolist())
+                
+                detection = {
+                    'bbox': (x1, y1, x2, y2),
+                    'confidence': float(conf),
+                    'class': self.vehicle_classes[cls],
+                    'image': image[y1:y2, x1:x2].copy()  # Get vehicle crop
+                }
+                detections.append(detection)
+        
+        return detections
 
     def draw_detections(self, image: np.ndarray, detections: List[Dict]) -> np.ndarray:
         """Draw bounding boxes and labels for detected vehicles"""
@@ -1,12 +1,27 @@
 # app/recognition/__init__.py
 
 from abc import ABC, abstractmethod
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 import numpy as np
 from dataclasses import dataclass
 from enum import Enum
 import cv2
 
+def convert_color_batch(images: List[np.ndarray], code: int) -> List[np.ndarray]:
+    """
+    cv2.cvtColor of several images in one call. The pixels of all images are packed into a
+    single column, converted once and split back into images of the original sizes, colour
+    conversions are per pixel so the result is the same as converting each image on its own
+    """
+    if not images:
+        return []
+    column = np.concatenate([image.reshape(-1, 1, image.shape[2]) for image in images])
+    converted = cv2.cvtColor(column, code)
+    sizes = [image.shape[0] * image.shape[1] for image in images]
+    parts = np.split(converted, np.cumsum(sizes)[:-1])
+    return [part.reshape(image.shape[:2] + converted.shape[2:]) for part, image in zip(parts, images)]
+
+
 @dataclass
 class VehicleAttributes:
     """Data class for vehicle attributes"""
@@ -36,6 +51,15 @@ class VehicleAttributeRecognizer(ABC):
         """Recognize vehicle attributes from image"""
         pass
     
+    def recognize_batch(self, images: List[np.ndarray],
+                        bboxes: List[Tuple[int, int, int, int]]) -> List[VehicleAttributes]:
+        """
+        Recognize the vehicles of one frame in a single call, one result per (image, bbox) pair.
+        The default runs recognize() on every pair, recognizers override it to share the model
+        forward pass or colour space conversions across the batch
+        """
+        return [self.recognize(image, bbox) for image, bbox in zip(images, bboxes)]
+
     @abstractmethod
     def get_confidence(self) -> float:
         """Get overall confidence score"""
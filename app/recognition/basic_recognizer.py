@@ -2,11 +2,11 @@
 
 import cv2
 import numpy as np
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 import logging
 from datetime import datetime
 from pathlib import Path
-from app.recognition import VehicleAttributeRecognizer, VehicleAttributes
+from app.recognition import VehicleAttributeRecognizer, VehicleAttributes, convert_color_batch
 
 logger = logging.getLogger(__name__)
 
@@ -23,26 +23,68 @@ class BasicVehicleRecognizer(VehicleAttributeRecognizer):
         try:
             # Extract vehicle region
             x1, y1, x2, y2 = bbox
-            vehicle_crop = image[y1:y2, x1:x2]
+            vehicle_crop = self._resize_crop(image[y1:y2, x1:x2])
             
-            # Basic preprocessing
-            # 1. Resize if too large
-            max_size = 800
-            height, width = vehicle_crop.shape[:2]
-            if max(height, width) > max_size:
-                scale = max_size / max(height, width)
-                new_width = int(width * scale)
-                new_height = int(height * scale)
-                vehicle_crop = cv2.resize(vehicle_crop, (new_width, new_height))
-            
-            # 2. Enhance contrast
-            lab = cv2.cvtColor(vehicle_crop, cv2.COLOR_BGR2LAB)
-            l, a, b = cv2.split(lab)
-            clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8,8))
-            l = clahe.apply(l)
-            lab = cv2.merge((l,a,b))
+            # Enhance contrast
+            lab = self._equalize_lightness(cv2.cvtColor(vehicle_crop, cv2.COLOR_BGR2LAB))
             enhanced = cv2.cvtColor(lab, cv2.COLOR_LAB2BGR)
             
+            return self._describe(vehicle_crop, enhanced)
+                
+        except Exception as e:
+            logger.error(f"Error in basic recognition: {str(e)}")
+            return self._get_fallback_result()
+
+    def recognize_batch(self, images: List[np.ndarray],
+                        bboxes: List[Tuple[int, int, int, int]]) -> List[VehicleAttributes]:
+        """Recognize several vehicles, every color space conversion is done once for all crops"""
+        results = [None] * len(images)
+        crops, indices = [], []
+        for i, (image, bbox) in enumerate(zip(images, bboxes)):
+            x1, y1, x2, y2 = bbox
+            vehicle_crop = image[y1:y2, x1:x2] if image is not None else None
+            if vehicle_crop is None or vehicle_crop.ndim != 3 or vehicle_crop.size == 0:
+                logger.error("Error in basic recognition: Invalid vehicle crop")
+                results[i] = self._get_fallback_result()
+                continue
+            crops.append(self._resize_crop(vehicle_crop))
+            indices.append(i)
+
+        try:
+            labs = convert_color_batch(crops, cv2.COLOR_BGR2LAB)
+            enhanced = convert_color_batch([self._equalize_lightness(lab) for lab in labs], cv2.COLOR_LAB2BGR)
+            hsvs = convert_color_batch(enhanced, cv2.COLOR_BGR2HSV)
+            enhanced_labs = convert_color_batch(enhanced, cv2.COLOR_BGR2LAB)
+        except Exception as e:
+            logger.error(f"Error in basic recognition: {str(e)}")
+            for i in indices:
+                results[i] = self._get_fallback_result()
+            return results
+
+        for i, vehicle_crop, image, hsv, lab in zip(indices, crops, enhanced, hsvs, enhanced_labs):
+            results[i] = self._describe(vehicle_crop, image, hsv, lab)
+        return results
+
+    @staticmethod
+    def _resize_crop(vehicle_crop: np.ndarray, max_size: int = 800) -> np.ndarray:
+        """Downscale crops larger than max_size"""
+        height, width = vehicle_crop.shape[:2]
+        if max(height, width) > max_size:
+            scale = max_size / max(height, width)
+            vehicle_crop = cv2.resize(vehicle_crop, (int(width * scale), int(height * scale)))
+        return vehicle_crop
+
+    @staticmethod
+    def _equalize_lightness(lab: np.ndarray) -> np.ndarray:
+        """CLAHE on the L channel of a LAB image"""
+        l, a, b = cv2.split(lab)
+        clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8,8))
+        return cv2.merge((clahe.apply(l), a, b))
+
+    def _describe(self, vehicle_crop: np.ndarray, enhanced: np.ndarray,
+                  hsv: Optional[np.ndarray] = None, lab: Optional[np.ndarray] = None) -> VehicleAttributes:
+        """Save the crops and detect the color, hsv and lab are conversions of enhanced when already computed"""
+        try:
             # Save original and enhanced images
             image_path = self._save_vehicle_image(vehicle_crop)
             enhanced_path = None
@@ -51,7 +93,7 @@ class BasicVehicleRecognizer(VehicleAttributeRecognizer):
                 cv2.imwrite(str(enhanced_path), enhanced)
             
             # Detect color from enhanced image
-            color, color_confidence = self._detect_color(enhanced)
+            color, color_confidence = self._detect_color(enhanced, hsv, lab)
             
             # Return attributes
             return VehicleAttributes(
@@ -83,15 +125,18 @@ class BasicVehicleRecognizer(VehicleAttributeRecognizer):
     
     
     
-    def _detect_color(self, image: np.ndarray) -> Tuple[str, float]:
+    def _detect_color(self, image: np.ndarray, hsv: Optional[np.ndarray] = None,
+                      lab: Optional[np.ndarray] = None) -> Tuple[str, float]:
         """Enhanced color detection with more debugging"""
         try:
             if image is None or image.size == 0:
                 return "unknown", 0.0
                 
             # Convert to multiple color spaces
-            hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
-            lab = cv2.cvtColor(image, cv2.COLOR_BGR2LAB)
+            if hsv is None:
+                hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
+            if lab is None:
+                lab = cv2.cvtColor(image, cv2.COLOR_BGR2LAB)
             
             # More specific yellow ranges
             color_ranges = {
@@ -127,8 +172,7 @@ class BasicVehicleRecognizer(VehicleAttributeRecognizer):
             min_area_ratio = 0.05  # Reduced minimum area threshold
             
             # Additional preprocessing
-            lab_enhanced = cv2.cvtColor(image, cv2.COLOR_BGR2LAB)
-            l, a, b = cv2.split(lab_enhanced)
+            l, a, b = cv2.split(lab)
             clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8))
             l = clahe.apply(l)
             lab_enhanced = cv2.merge((l,a,b))
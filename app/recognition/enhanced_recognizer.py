@@ -5,7 +5,7 @@ import torchvision
 import numpy as np
 from pathlib import Path
 import logging
-from typing import Dict, Any, Tuple, Optional
+from typing import Dict, Any, List, Tuple, Optional
 from dataclasses import dataclass
 from PIL import Image
 
@@ -168,65 +168,117 @@ class EnhancedVehicleRecognizer(VehicleAttributeRecognizer):
             logger.error(f"Error in vehicle recognition: {str(e)}")
             return self._get_fallback_result()
 
+    @torch.no_grad()
+    def recognize_batch(self, images: List[np.ndarray],
+                        bboxes: List[Tuple[int, int, int, int]]) -> List[VehicleAttributes]:
+        """Recognize several vehicles, each model runs once on the stacked crops"""
+        results = [None] * len(images)
+        rois, indices = [], []
+        for i, (image, bbox) in enumerate(zip(images, bboxes)):
+            try:
+                rois.append(apply_roi_crop(image, bbox))
+                indices.append(i)
+            except Exception as e:
+                logger.error(f"Error in vehicle recognition: {str(e)}")
+                results[i] = self._get_fallback_result()
+
+        pil_images = [Image.fromarray(roi) for roi in rois]
+        make_models = self._detect_make_model_batch(pil_images)
+        colors = self._detect_color_batch(pil_images)
+        types = self._detect_vehicle_type_batch(pil_images)
+        years = self._estimate_year_batch(pil_images)
+
+        for i, roi, (make, model_name, make_model_conf), (color, color_conf), (vehicle_type, type_conf), \
+                (year, year_conf) in zip(indices, rois, make_models, colors, types, years):
+            image_path = self._save_vehicle_image(roi)
+            results[i] = VehicleAttributes(
+                make=make,
+                model=model_name,
+                color=color,
+                year=year,
+                type=vehicle_type,
+                confidence_scores={
+                    'make': float(make_model_conf),
+                    'model': float(make_model_conf * 0.9),
+                    'color': float(color_conf),
+                    'type': float(type_conf),
+                    'year': float(year_conf)
+                },
+                image_path=str(image_path) if image_path else None
+            )
+        return results
+
+    def _forward(self, name: str, images: List[Image.Image]) -> torch.Tensor:
+        """Output of model name for all images, transformed and stacked into one batch"""
+        batch = torch.stack([self.transforms[name](image) for image in images]).to(self.device)
+        return self.models[name](batch)
+
+    def _classify_batch(self, name: str, images: List[Image.Image]) -> List[Tuple[int, float]]:
+        """Predicted class index and confidence of every image"""
+        if not images:
+            return []
+        confidences, predictions = torch.softmax(self._forward(name, images), dim=1).max(dim=1)
+        return [(int(pred), float(conf)) for pred, conf in zip(predictions.cpu(), confidences.cpu())]
+
     def _detect_make_model(self, image: Image) -> Tuple[str, str, float]:
         """Detect vehicle make and model"""
+        return self._detect_make_model_batch([image])[0]
+
+    def _detect_make_model_batch(self, images: List[Image.Image]) -> List[Tuple[str, str, float]]:
+        """Detect make and model of every image"""
         try:
-            input_tensor = self.transforms['make_model'](image).unsqueeze(0).to(self.device)
-            outputs = self.models['make_model'](input_tensor)
-            probs = torch.softmax(outputs, dim=1)
-            
-            conf, pred = torch.max(probs, 1)
-            make_model = self._get_make_model_mapping(pred.item())
-            
-            return make_model['make'], make_model['model'], conf.item()
+            results = []
+            for pred, conf in self._classify_batch('make_model', images):
+                make_model = self._get_make_model_mapping(pred)
+                results.append((make_model['make'], make_model['model'], conf))
+            return results
         except Exception as e:
             logger.error(f"Make/model detection failed: {str(e)}")
-            return "Unknown", "Unknown", 0.0
+            return [("Unknown", "Unknown", 0.0)] * len(images)
 
     def _detect_color(self, image: Image) -> Tuple[str, float]:
         """Detect vehicle color"""
+        return self._detect_color_batch([image])[0]
+
+    def _detect_color_batch(self, images: List[Image.Image]) -> List[Tuple[str, float]]:
+        """Detect color of every image"""
         try:
-            input_tensor = self.transforms['color'](image).unsqueeze(0).to(self.device)
-            outputs = self.models['color'](input_tensor)
-            probs = torch.softmax(outputs, dim=1)
-            
-            conf, pred = torch.max(probs, 1)
-            color = self._get_color_mapping(pred.item())
-            
-            return color, conf.item()
+            return [(self._get_color_mapping(pred), conf) for pred, conf in self._classify_batch('color', images)]
         except Exception as e:
             logger.error(f"Color detection failed: {str(e)}")
-            return "Unknown", 0.0
+            return [("Unknown", 0.0)] * len(images)
 
     def _detect_vehicle_type(self, image: Image) -> Tuple[str, float]:
         """Detect vehicle type"""
+        return self._detect_vehicle_type_batch([image])[0]
+
+    def _detect_vehicle_type_batch(self, images: List[Image.Image]) -> List[Tuple[str, float]]:
+        """Detect type of every image"""
         try:
-            input_tensor = self.transforms['type'](image).unsqueeze(0).to(self.device)
-            outputs = self.models['type'](input_tensor)
-            probs = torch.softmax(outputs, dim=1)
-            
-            conf, pred = torch.max(probs, 1)
-            vehicle_type = self._get_type_mapping(pred.item())
-            
-            return vehicle_type, conf.item()
+            return [(self._get_type_mapping(pred), conf) for pred, conf in self._classify_batch('type', images)]
         except Exception as e:
             logger.error(f"Vehicle type detection failed: {str(e)}")
-            return "Unknown", 0.0
+            return [("Unknown", 0.0)] * len(images)
 
     def _estimate_year(self, image: Image) -> Tuple[Optional[int], float]:
         """Estimate vehicle year"""
+        return self._estimate_year_batch([image])[0]
+
+    def _estimate_year_batch(self, images: List[Image.Image]) -> List[Tuple[Optional[int], float]]:
+        """Estimate year of every image"""
         try:
-            input_tensor = self.transforms['year'](image).unsqueeze(0).to(self.device)
-            output = self.models['year'](input_tensor)
-            
-            # Convert to year (e.g., 2000-2024 range)
-            year = int(2000 + (output.item() * 24))  # Scale output to year range
-            confidence = min(1.0, max(0.0, 1.0 - abs(output.item() - 0.5)))  # Higher confidence near middle of range
-            
-            return year, confidence
+            if not images:
+                return []
+            results = []
+            for output in self._forward('year', images).view(-1).cpu().tolist():
+                # Convert to year (e.g., 2000-2024 range)
+                year = int(2000 + (output * 24))  # Scale output to year range
+                confidence = min(1.0, max(0.0, 1.0 - abs(output - 0.5)))  # Higher confidence near middle of range
+                results.append((year, confidence))
+            return results
         except Exception as e:
             logger.error(f"Year estimation failed: {str(e)}")
-            return None, 0.0
+            return [(None, 0.0)] * len(images)
 
     @staticmethod
     def _get_make_model_mapping(index: int) -> Dict[str, str]:
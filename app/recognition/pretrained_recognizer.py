@@ -9,7 +9,7 @@ from typing import Dict, Any, Tuple, Optional, List
 import logging
 from pathlib import Path
 import json
-from . import VehicleAttributeRecognizer, VehicleAttributes
+from . import VehicleAttributeRecognizer, VehicleAttributes, convert_color_batch
 
 logger = logging.getLogger(__name__)
 
@@ -146,11 +146,51 @@ class PreTrainedVehicleRecognizer(VehicleAttributeRecognizer):
             x1, y1, x2, y2 = bbox
             vehicle_crop = image[y1:y2, x1:x2]
             
+            return self._recognize_crop(vehicle_crop)
+            
+        except Exception as e:
+            logger.error(f"Error in vehicle recognition: {str(e)}")
+            return self._get_fallback_result()
+
+    def recognize_batch(self, images: List[np.ndarray],
+                        bboxes: List[Tuple[int, int, int, int]]) -> List[VehicleAttributes]:
+        """Recognize several vehicles, the LAB and grayscale conversions of all crops are done in one call each"""
+        results = [None] * len(images)
+        crops, indices = [], []
+        for i, (image, bbox) in enumerate(zip(images, bboxes)):
+            if image is None or len(image.shape) != 3:
+                logger.error("Error in vehicle recognition: Invalid image input")
+                results[i] = self._get_fallback_result()
+                continue
+            x1, y1, x2, y2 = bbox
+            vehicle_crop = image[y1:y2, x1:x2]
+            if vehicle_crop.size == 0:
+                logger.error("Error in vehicle recognition: Empty vehicle crop")
+                results[i] = self._get_fallback_result()
+                continue
+            crops.append(vehicle_crop)
+            indices.append(i)
+
+        try:
+            labs = convert_color_batch(crops, cv2.COLOR_BGR2LAB)
+            grays = convert_color_batch(crops, cv2.COLOR_BGR2GRAY)
+        except Exception as e:
+            logger.error(f"Error converting vehicle crops: {str(e)}")
+            labs = grays = [None] * len(crops)
+
+        for i, vehicle_crop, lab, gray in zip(indices, crops, labs, grays):
+            results[i] = self._recognize_crop(vehicle_crop, lab, gray)
+        return results
+
+    def _recognize_crop(self, vehicle_crop: np.ndarray, lab: Optional[np.ndarray] = None,
+                        gray: Optional[np.ndarray] = None) -> VehicleAttributes:
+        """Attributes of one vehicle crop, lab and gray are its conversions when already computed"""
+        try:
             # Get color
-            color, color_conf = self._analyze_color(vehicle_crop)
+            color, color_conf = self._analyze_color(vehicle_crop, lab)
             
             # Analyze vehicle features
-            make, model, make_conf = self._analyze_vehicle_features(vehicle_crop)
+            make, model, make_conf = self._analyze_vehicle_features(vehicle_crop, gray)
             
             # Get vehicle type
             vehicle_type = self._detect_vehicle_type(vehicle_crop)
@@ -177,11 +217,13 @@ class PreTrainedVehicleRecognizer(VehicleAttributeRecognizer):
             logger.error(f"Error in vehicle recognition: {str(e)}")
             return self._get_fallback_result()
 
-    def _analyze_vehicle_features(self, image: np.ndarray) -> Tuple[str, str, float]:
+    def _analyze_vehicle_features(self, image: np.ndarray,
+                                  gray: Optional[np.ndarray] = None) -> Tuple[str, str, float]:
         """Analyze vehicle features to determine make and model"""
         try:
             # Convert to grayscale for feature detection
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            if gray is None:
+                gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
             
             # Edge detection
             edges = cv2.Canny(gray, 50, 150)
@@ -212,16 +254,15 @@ class PreTrainedVehicleRecognizer(VehicleAttributeRecognizer):
             return "Unknown", "Unknown", 0.0
         
         
-    def _analyze_color(self, image: np.ndarray) -> Tuple[str, float]:
-        """Analyze vehicle color using multiple color spaces"""
+    def _analyze_color(self, image: np.ndarray, lab: Optional[np.ndarray] = None) -> Tuple[str, float]:
+        """Analyze vehicle color using the BGR and LAB color spaces"""
         try:
-            # Convert to different color spaces
-            hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
-            lab = cv2.cvtColor(image, cv2.COLOR_BGR2LAB)
+            # Convert to LAB for brightness
+            if lab is None:
+                lab = cv2.cvtColor(image, cv2.COLOR_BGR2LAB)
             
-            # Get average colors in different spaces
+            # Get average color
             mean_bgr = np.mean(image, axis=(0, 1))
-            mean_hsv = np.mean(hsv, axis=(0, 1))
             
             # Calculate brightness from LAB space
             brightness = np.mean(lab[:,:,0])
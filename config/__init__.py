@@ -49,6 +49,12 @@ class Config:
     INFLUXDB_TOKEN = require_env('INFLUXDB_TOKEN')
     INFLUXDB_ORG = os.getenv('INFLUXDB_ORG', 'ketu-ai')
     INFLUXDB_BUCKET = os.getenv('INFLUXDB_BUCKET', 'license_plate_detections')
+    INFLUXDB_BATCHING = os.getenv('INFLUXDB_BATCHING', 'True').lower() == 'true'
+    INFLUXDB_BATCH_SIZE = int(os.getenv('INFLUXDB_BATCH_SIZE', 500))
+    INFLUXDB_FLUSH_INTERVAL_MS = int(os.getenv('INFLUXDB_FLUSH_INTERVAL_MS', 1000))
+    INFLUXDB_JITTER_INTERVAL_MS = int(os.getenv('INFLUXDB_JITTER_INTERVAL_MS', 0))
+    INFLUXDB_RETRY_INTERVAL_MS = int(os.getenv('INFLUXDB_RETRY_INTERVAL_MS', 5000))
+    INFLUXDB_MAX_RETRIES = int(os.getenv('INFLUXDB_MAX_RETRIES', 5))
     
     # Detection Configuration
     FRAME_SKIP = int(os.getenv('FRAME_SKIP', 2))
@@ -56,4 +62,58 @@ class Config:
     RESIZE_HEIGHT = int(os.getenv('RESIZE_HEIGHT', 480))
     CONFIDENCE_THRESHOLD = float(os.getenv('CONFIDENCE_THRESHOLD', 0.5))
     MAX_DETECTIONS_PER_FRAME = int(os.getenv('MAX_DETECTIONS_PER_FRAME', 5))
-    PROCESS_EVERY_N_SECONDS = float(os.getenv('PROCESS_EVERY_N_SECONDS', 1))
\ No newline at end of file
+    PROCESS_EVERY_N_SECONDS = float(os.getenv('PROCESS_EVERY_N_SECONDS', 1))
+    
+    # Frame Pipeline Configuration
+    FRAME_PIPELINE_ENABLED = os.getenv('FRAME_PIPELINE_ENABLED', 'True').lower() == 'true'
+    FRAME_QUEUE_SIZE = int(os.getenv('FRAME_QUEUE_SIZE', 2))
+    
+    # Multi-camera Configuration
+    STREAM_BATCH_SIZE = int(os.getenv('STREAM_BATCH_SIZE', 4))
+    MAX_STREAMS = int(os.getenv('MAX_STREAMS', 8))
+    
+    # Motion Gate Configuration
+    MOTION_GATE_ENABLED = os.getenv('MOTION_GATE_ENABLED', 'False').lower() == 'true'
+    MOTION_THRESHOLD = float(os.getenv('MOTION_THRESHOLD', 0.01))
+    # (x1, y1, x2, y2) as fractions of the frame, e.g. "0,0.4,1,1" for the lower 60%, whole frame when unset
+    MOTION_ROI = tuple(float(v) for v in os.getenv('MOTION_ROI').split(',')) if os.getenv('MOTION_ROI') else None
+    MOTION_METHOD = os.getenv('MOTION_METHOD', 'diff')
+    
+    # Detection Mode: separate (COCO vehicle model + plate localizer), unified (one model for
+    # vehicles and plates, an ultralytics checkpoint path or modelhub://<name>) or cascade (plates
+    # localized in full resolution vehicle crops, vehicles found on a frame CASCADE_VEHICLE_WIDTH wide)
+    DETECTION_MODE = os.getenv('DETECTION_MODE', 'separate')
+    UNIFIED_DETECTOR_MODEL = os.getenv('UNIFIED_DETECTOR_MODEL')
+    CASCADE_VEHICLE_WIDTH = int(os.getenv('CASCADE_VEHICLE_WIDTH', 640))
+    CASCADE_ROI_MARGIN = float(os.getenv('CASCADE_ROI_MARGIN', 0.1))
+    
+    # Plate to Vehicle Association: vehicle boxes grown by margin pixels, greedy or hungarian assignment
+    ASSOCIATION_MARGIN = int(os.getenv('ASSOCIATION_MARGIN', 20))
+    ASSOCIATION_METHOD = os.getenv('ASSOCIATION_METHOD', 'greedy')
+    
+    # Concurrent Frame Stages: threads running vehicle detection, plate reading and vehicle
+    # attribute recognition side by side, 1 runs them one after another
+    STAGE_WORKERS = int(os.getenv('STAGE_WORKERS', 4))
+    
+    # Tracking Configuration
+    TRACKING_ENABLED = os.getenv('TRACKING_ENABLED', 'False').lower() == 'true'
+    TRACK_REFRESH_INTERVAL = int(os.getenv('TRACK_REFRESH_INTERVAL', 10))
+    TRACK_MAX_AGE = int(os.getenv('TRACK_MAX_AGE', 15))
+    TRACK_IOU_THRESHOLD = float(os.getenv('TRACK_IOU_THRESHOLD', 0.3))
+    
+    # Database Writer Configuration, overflow policy is drop_oldest, drop_newest or block
+    DB_WRITE_BATCH_SIZE = int(os.getenv('DB_WRITE_BATCH_SIZE', 100))
+    DB_FLUSH_INTERVAL = float(os.getenv('DB_FLUSH_INTERVAL', 1.0))
+    DB_WRITE_QUEUE_SIZE = int(os.getenv('DB_WRITE_QUEUE_SIZE', 10000))
+    DB_OVERFLOW_POLICY = os.getenv('DB_OVERFLOW_POLICY', 'drop_oldest')
+    
+    # OCR Consensus Configuration (tracking mode), an empty method keeps per-frame readings
+    OCR_CONSENSUS_METHOD = os.getenv('OCR_CONSENSUS_METHOD', 'logits')
+    OCR_CONSENSUS_STABLE_FRAMES = int(os.getenv('OCR_CONSENSUS_STABLE_FRAMES', 3))
+    OCR_CONSENSUS_MIN_CONFIDENCE = float(os.getenv('OCR_CONSENSUS_MIN_CONFIDENCE', 0.8))
+    
+    # OCR Model Loading, region models load on first use; preload is a comma separated list of
+    # presets or regions kept loaded, an empty budget never unloads
+    OCR_LAZY_LOAD = os.getenv('OCR_LAZY_LOAD', 'True').lower() == 'true'
+    OCR_PRELOAD = [name.strip() for name in os.getenv('OCR_PRELOAD', 'eu_ua_2015').split(',') if name.strip()]
+    OCR_MEMORY_BUDGET_MB = float(os.getenv('OCR_MEMORY_BUDGET_MB')) if os.getenv('OCR_MEMORY_BUDGET_MB') else None
@@ -0,0 +1,95 @@
+"""
+Compares the NumPy fallbacks of get_det_boxes, used when cpp_bindings/build/libfast_boxes.so is not built:
+  * full_image - the original loop, full-image masks and np.where for every component
+  * windowed   - per-label maxima in one pass and each component handled in its dilation window
+and the C++ bindings when they are available. Synthetic CRAFT score maps are used, no models are loaded.
+
+python3 examples/py/benchmark/det-boxes-test.py -n 200
+python3 examples/py/benchmark/det-boxes-test.py -n 20 --height 640 --width 640 --blobs 200
+"""
+import time
+import argparse
+
+import cv2
+import numpy as np
+from _paths import nomeroff_net_dir
+from nomeroff_net.pipes.number_plate_keypoints_detectors.bbox_np_points_tools import (
+    CPP_BIND_AVAILABLE,
+    get_det_boxes,
+    _det_boxes_full_image,
+    _det_boxes_windowed,
+)
+
+
+def parse_args():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-n", "--num_run", default=200,
+                    required=False, type=int, help="Number loops")
+    ap.add_argument("--height", default=150,
+                    required=False, type=int, help="Score map height, 300px CRAFT canvas gives 150")
+    ap.add_argument("--width", default=160,
+                    required=False, type=int, help="Score map width")
+    ap.add_argument("--blobs", default=12,
+                    required=False, type=int, help="Text blobs per score map")
+    kwargs = vars(ap.parse_args())
+    return kwargs
+
+
+def make_score_maps(rng, height, width, blobs):
+    textmap = np.zeros((height, width), dtype=np.float32)
+    linkmap = np.zeros((height, width), dtype=np.float32)
+    centers = []
+    for _ in range(blobs):
+        cx, cy = int(rng.integers(0, width)), int(rng.integers(0, height))
+        axes = (int(rng.integers(2, 12)), int(rng.integers(2, 8)))
+        cv2.ellipse(textmap, (cx, cy), axes, float(rng.uniform(0, 180)), 0, 360,
+                    float(rng.uniform(0.45, 1.0)), -1)
+        centers.append((cx, cy))
+    for (x0, y0), (x1, y1) in zip(centers[::2], centers[1::2]):
+        if rng.random() < 0.5:
+            cv2.line(linkmap, (x0, y0), (x1, y1), 0.9, 2)
+    return cv2.GaussianBlur(textmap, (5, 5), 0), linkmap
+
+
+def label_maps(textmap, linkmap, link_threshold=0.7, low_text=0.4):
+    _, text_score = cv2.threshold(textmap, low_text, 1, 0)
+    _, link_score = cv2.threshold(linkmap, link_threshold, 1, 0)
+    n_labels, labels, stats, _ = cv2.connectedComponentsWithStats(
+        np.clip(text_score + link_score, 0, 1).astype(np.uint8), connectivity=4)
+    return textmap, labels, n_labels, stats, text_score, link_score
+
+
+def main(num_run, height, width, blobs):
+    rng = np.random.default_rng(0)
+    maps = [make_score_maps(rng, height, width, blobs) for _ in range(num_run)]
+    labelled = [label_maps(textmap, linkmap) for textmap, linkmap in maps]
+
+    for args in labelled:
+        expected, _ = _det_boxes_full_image(*args, 0.6)
+        det, _ = _det_boxes_windowed(*args, 0.6)
+        assert len(det) == len(expected) and all(np.array_equal(a, b) for a, b in zip(det, expected)), \
+            "windowed fallback differs from the full image loop"
+
+    implementations = [("full_image", _det_boxes_full_image), ("windowed", _det_boxes_windowed)]
+    print(f"{num_run} score maps {height}x{width}, "
+          f"{np.mean([args[2] - 1 for args in labelled]):.1f} components on average")
+    print(f"{'implementation':<16}{'ms per map':>12}{'speedup':>10}")
+    base = None
+    for name, func in implementations:
+        start = time.perf_counter()
+        for args in labelled:
+            func(*args, 0.6)
+        ms = (time.perf_counter() - start) / num_run * 1000
+        base = base or ms
+        print(f"{name:<16}{ms:>12.3f}{base / ms:>10.2f}")
+
+    if CPP_BIND_AVAILABLE:
+        start = time.perf_counter()
+        for textmap, linkmap in maps:
+            get_det_boxes(textmap, linkmap, 0.6, 0.7, 0.4, use_cpp_bindings=True)
+        ms = (time.perf_counter() - start) / num_run * 1000
+        print(f"{'cpp (+labeling)':<16}{ms:>12.3f}{base / ms:>10.2f}")
+
+
+if __name__ == '__main__':
+    main(**parse_args())
@@ -0,0 +1,84 @@
+"""
+Compares the two ways of handing a decoded frame to the number plate pipeline:
+  * jpeg  - cv2.imwrite to a temp file, then the "opencv" loader reads and decodes it again
+  * numpy - the BGR array is passed directly and the "numpy" loader converts it to RGB in memory
+
+python3 examples/py/benchmark/frame-handoff-test.py -n 50
+python3 examples/py/benchmark/frame-handoff-test.py -n 50 --skip_inference
+"""
+import os
+import time
+import tempfile
+import warnings
+import argparse
+from glob import glob
+
+import cv2
+from _paths import nomeroff_net_dir
+from nomeroff_net.image_loaders import OpencvImageLoader, NumpyImageLoader
+
+
+warnings.filterwarnings("ignore")
+
+
+def parse_args():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-p", "--pipeline_name", default="number_plate_detection_and_reading",
+                    required=False, type=str, help="Pipeline name")
+    ap.add_argument("-g", "--images_glob", default="./data/examples/benchmark_oneline_np_images/*.jpeg",
+                    required=False, type=str, help="Images glob path, used as decoded frames")
+    ap.add_argument("-n", "--num_run", default=20,
+                    required=False, type=int, help="Number loops")
+    ap.add_argument("--skip_inference", action="store_true",
+                    help="Only measure the frame handoff, without running the models")
+    kwargs = vars(ap.parse_args())
+    return kwargs
+
+
+def jpeg_handoff(frame, temp_path, image_loader):
+    cv2.imwrite(temp_path, frame)
+    return image_loader.load(temp_path)
+
+
+def numpy_handoff(frame, _, image_loader):
+    return image_loader.load(frame)
+
+
+def run(frames, handoff, image_loader, temp_path, num_run, detector=None):
+    start_time = time.perf_counter()
+    for _ in range(num_run):
+        for frame in frames:
+            img = handoff(frame, temp_path, image_loader)
+            if detector is not None:
+                detector([img])
+    return (time.perf_counter() - start_time) / (num_run * len(frames))
+
+
+def main(pipeline_name, images_glob, num_run, skip_inference, **_):
+    if not os.path.isabs(images_glob):
+        images_glob = os.path.join(nomeroff_net_dir, images_glob)
+    frames = [cv2.imread(path) for path in sorted(glob(images_glob))]
+    if not frames:
+        raise ValueError(f"No images found for {images_glob}")
+
+    detector = None
+    if not skip_inference:
+        from nomeroff_net import pipeline
+        # loaders are applied above, the pipeline receives ready RGB arrays in both modes
+        detector = pipeline(pipeline_name)
+        detector([cv2.cvtColor(frames[0], cv2.COLOR_BGR2RGB)])  # warm up
+
+    temp_path = os.path.join(tempfile.mkdtemp(), "temp_frame.jpg")
+    jpeg_time = run(frames, jpeg_handoff, OpencvImageLoader(), temp_path, num_run, detector)
+    numpy_time = run(frames, numpy_handoff, NumpyImageLoader(), temp_path, num_run, detector)
+    os.remove(temp_path)
+
+    print(f"Processed {len(frames)} frames x {num_run} runs "
+          f"({'handoff only' if skip_inference else pipeline_name})")
+    print(f"jpeg round-trip  {jpeg_time * 1000:.2f} ms per frame")
+    print(f"numpy in-memory  {numpy_time * 1000:.2f} ms per frame")
+    print(f"saving           {(jpeg_time - numpy_time) * 1000:.2f} ms per frame")
+
+
+if __name__ == '__main__':
+    main(**parse_args())
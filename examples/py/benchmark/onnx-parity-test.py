@@ -0,0 +1,156 @@
+"""
+Accuracy parity and latency of the ONNX Runtime models against eager PyTorch, model by model.
+Export the models first with examples/py/model_convertors/convert_*_to_onnx.py
+
+    python3 ./onnx-parity-test.py -g "./data/examples/oneline_images/*" -n 10 --intra_op_num_threads 4
+
+Per-stage latency of the whole pipeline: runtime-test.py --backend onnx
+"""
+import os
+import time
+import warnings
+import argparse
+from glob import glob
+
+import cv2
+import numpy as np
+
+from _paths import nomeroff_net_dir
+from nomeroff_net.tools import unzip
+from nomeroff_net.tools.image_processing import crop_number_plate_zones_from_images
+from nomeroff_net.pipelines.number_plate_text_reading import DEFAULT_PRESETS
+from nomeroff_net.pipes.number_plate_localizators.yolo_v8_detector import Detector
+from nomeroff_net.pipes.number_plate_localizators.yolov8_onnx_detector import DetectorOnnx
+from nomeroff_net.pipes.number_plate_keypoints_detectors.bbox_np_points import NpPointsCraft
+from nomeroff_net.pipes.number_plate_keypoints_detectors.bbox_np_points_onnx import NpPointsCraftOnnx
+from nomeroff_net.pipes.number_plate_classificators.options_detector import OptionsDetector
+from nomeroff_net.pipes.number_plate_classificators.options_detector_onnx import OptionsDetectorOnnx
+from nomeroff_net.pipes.number_plate_text_readers.text_detector import TextDetector
+from nomeroff_net.pipes.number_plate_text_readers.text_detector_onnx import TextDetectorOnnx
+
+warnings.filterwarnings("ignore")
+
+
+def parse_args():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-g", "--images_glob", default="./data/examples/oneline_images/*",
+                    required=False, type=str, help="Images glob path")
+    ap.add_argument("-n", "--num_run", default=10,
+                    required=False, type=int, help="Timed runs per model and backend")
+    ap.add_argument("--intra_op_num_threads", default=None,
+                    required=False, type=int, help="ONNX Runtime threads inside one operator")
+    ap.add_argument("--inter_op_num_threads", default=None,
+                    required=False, type=int, help="ONNX Runtime threads across independent operators")
+    return vars(ap.parse_args())
+
+
+def timeit(func, num_run):
+    func()  # warm up
+    start = time.perf_counter()
+    for _ in range(num_run):
+        func()
+    return (time.perf_counter() - start) / num_run * 1000
+
+
+def box_iou(box1, box2):
+    x1, y1 = max(box1[0], box2[0]), max(box1[1], box2[1])
+    x2, y2 = min(box1[2], box2[2]), min(box1[3], box2[3])
+    intersection = max(0., x2 - x1) * max(0., y2 - y1)
+    area1 = (box1[2] - box1[0]) * (box1[3] - box1[1])
+    area2 = (box2[2] - box2[0]) * (box2[3] - box2[1])
+    return intersection / (area1 + area2 - intersection + 1e-9)
+
+
+def compare_boxes(torch_boxes, onnx_boxes):
+    """
+    Mean IoU of every torch box with its best onnx match and the count of boxes found by one backend only
+    """
+    ious, unmatched = [], 0
+    for image_torch_boxes, image_onnx_boxes in zip(torch_boxes, onnx_boxes):
+        unmatched += abs(len(image_torch_boxes) - len(image_onnx_boxes))
+        for box in image_torch_boxes:
+            ious.append(max([box_iou(box, onnx_box) for onnx_box in image_onnx_boxes], default=0.))
+    return float(np.mean(ious)) if ious else 1., unmatched
+
+
+def report(name, torch_ms, onnx_ms, parity):
+    print(f"{name:<16}{torch_ms:>12.2f}{onnx_ms:>12.2f}{torch_ms / onnx_ms:>10.2f}  {parity}")
+
+
+def main(images_glob, num_run, intra_op_num_threads=None, inter_op_num_threads=None):
+    if not os.path.isabs(images_glob):
+        images_glob = os.path.join(nomeroff_net_dir, images_glob)
+    images = [cv2.imread(path)[:, :, ::-1] for path in sorted(glob(images_glob))]
+    threads = dict(intra_op_num_threads=intra_op_num_threads, inter_op_num_threads=inter_op_num_threads)
+    print(f"{len(images)} images, {num_run} runs, onnx threads {threads}\n")
+    print(f"{'model':<16}{'torch ms':>12}{'onnx ms':>12}{'speedup':>10}  parity")
+
+    # localization
+    torch_detector, onnx_detector = Detector(), DetectorOnnx(**threads)
+    torch_detector.load("latest")
+    onnx_detector.load("latest")
+    torch_boxes = [torch_detector.predict([image])[0] for image in images]
+    onnx_boxes = [onnx_detector.predict([image])[0] for image in images]
+    mean_iou, unmatched = compare_boxes(torch_boxes, onnx_boxes)
+    report("localization",
+           timeit(lambda: torch_detector.predict(images), num_run),
+           timeit(lambda: onnx_detector.predict(images), num_run),
+           f"mean IoU {mean_iou:.4f}, unmatched boxes {unmatched}")
+
+    # key points, on the torch boxes so both backends see the same crops
+    torch_craft, onnx_craft = NpPointsCraft(), NpPointsCraftOnnx(**threads)
+    torch_craft.load("latest", "latest")
+    onnx_craft.load("latest")
+    inputs = unzip([images, torch_boxes])
+    preprocessed = torch_craft.preprocess(inputs)
+    torch_maps = torch_craft.forward_batch(preprocessed)
+    onnx_maps = onnx_craft.forward_batch(preprocessed)
+    # forward_batch items start with the score and link maps of a crop
+    max_diff = max([float(np.abs(torch_item[i] - onnx_item[i]).max())
+                    for torch_item, onnx_item in zip(torch_maps, onnx_maps) for i in (0, 1)], default=0.)
+    torch_points, _ = torch_craft.detect(inputs)
+    onnx_points, _ = onnx_craft.detect(inputs)
+    points_diff = max([float(np.abs(np.array(p1) - np.array(p2)).max())
+                       for image_p1, image_p2 in zip(torch_points, onnx_points)
+                       for p1, p2 in zip(image_p1, image_p2)], default=0.)
+    report("key points",
+           timeit(lambda: torch_craft.forward_batch(preprocessed), num_run),
+           timeit(lambda: onnx_craft.forward_batch(preprocessed), num_run),
+           f"max score map diff {max_diff:.2e}, max point diff {points_diff:.2f}px")
+
+    zones, _ = crop_number_plate_zones_from_images(images, torch_points)
+    if not len(zones):
+        print("No number plates found, skipping classification and OCR")
+        return
+
+    # options classification
+    torch_options, onnx_options = OptionsDetector(), OptionsDetectorOnnx(**threads)
+    torch_options.load("latest")
+    onnx_options.load("latest")
+    torch_regions, torch_lines, _, torch_predicted = torch_options.predict_with_confidence(zones)
+    onnx_regions, onnx_lines, _, onnx_predicted = onnx_options.predict_with_confidence(zones)
+    agreement = np.mean([r1 == r2 and l1 == l2 for r1, l1, r2, l2
+                         in zip(torch_regions, torch_lines, onnx_regions, onnx_lines)])
+    max_diff = max(float(np.abs(np.asarray(p1) - np.asarray(p2)).max())
+                   for p1, p2 in zip(torch_predicted, onnx_predicted))
+    report("classification",
+           timeit(lambda: torch_options.predict_with_confidence(zones), num_run),
+           timeit(lambda: onnx_options.predict_with_confidence(zones), num_run),
+           f"label agreement {agreement:.2%}, max probability diff {max_diff:.2e}")
+
+    # OCR, zones routed to the presets of the torch region labels
+    labels = torch_options.get_region_labels(torch_regions)
+    torch_ocr, onnx_ocr = TextDetector(DEFAULT_PRESETS), TextDetectorOnnx(DEFAULT_PRESETS, **threads)
+
+    def read(text_detector):
+        return text_detector.postprocess(text_detector.forward(text_detector.preprocess(zones, labels, torch_lines)))
+    torch_texts, onnx_texts = read(torch_ocr), read(onnx_ocr)
+    agreement = np.mean([t1 == t2 for t1, t2 in zip(torch_texts, onnx_texts)])
+    report("ocr",
+           timeit(lambda: read(torch_ocr), num_run),
+           timeit(lambda: read(onnx_ocr), num_run),
+           f"text agreement {agreement:.2%} on {len(zones)} zones")
+
+
+if __name__ == '__main__':
+    main(**parse_args())
@@ -1,4 +1,5 @@
 import os
+import time
 import warnings
 import argparse
 from glob import glob
@@ -28,15 +29,73 @@ def parse_args():
     ap.add_argument("-w", "--num_workers", default=1,
                     required=False, type=int, help="Number worker for parallel processing "
                                                    "preprocess and postprocess functions")
+    ap.add_argument("-e", "--executor", default="gevent", choices=["gevent", "thread", "process"],
+                    required=False, type=str, help="Executor for the preprocess and postprocess workers")
+    ap.add_argument("-s", "--scaling", action="store_true",
+                    help="Repeat the run for 1, 2, 4, ... workers up to the number of cores "
+                         "and print the speedup over one worker")
+    ap.add_argument("--stream", action="store_true",
+                    help="Run through pipeline.stream, overlapping loading, forward and postprocess of batches")
+    ap.add_argument("--prefetch", default=2,
+                    required=False, type=int, help="Batches buffered between stages with --stream")
+    ap.add_argument("--backend", default="torch", choices=["torch", "onnx"],
+                    required=False, type=str, help="Run the models on eager PyTorch or ONNX Runtime, "
+                                                   "export them first with model_convertors/convert_*_to_onnx.py")
     kwargs = vars(ap.parse_args())
     return kwargs
 
 
+def backend_kwargs(backend):
+    if backend != "onnx":
+        return {}
+    from nomeroff_net.pipes.number_plate_localizators.yolov8_onnx_detector import DetectorOnnx
+    from nomeroff_net.pipes.number_plate_keypoints_detectors.bbox_np_points_onnx import NpPointsCraftOnnx
+    from nomeroff_net.pipes.number_plate_classificators.options_detector_onnx import OptionsDetectorOnnx
+    from nomeroff_net.pipes.number_plate_text_readers.text_detector_onnx import TextDetectorOnnx
+    return {
+        "number_plate_localization_detector": DetectorOnnx,
+        "key_points_class_detector": NpPointsCraftOnnx,
+        "class_detector": OptionsDetectorOnnx,
+        "ocr_class_detector": TextDetectorOnnx,
+    }
+
+
+def worker_counts(max_workers):
+    counts = [1]
+    while counts[-1] * 2 <= max_workers:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != max_workers:
+        counts.append(max_workers)
+    return counts
+
+
+def run_scaling(number_plate_detection_and_reading, images, num_run, batch_size, executor):
+    # Batches must hold at least as many images as workers to split them
+    batch_size = max(batch_size, os.cpu_count() or 1)
+    number_plate_detection_and_reading(images[:batch_size], batch_size=batch_size)  # warm up
+
+    print(f"executor={executor} batch_size={batch_size} images={len(images)}")
+    print(f"{'workers':>8}{'photos/s':>12}{'speedup':>10}")
+    base = None
+    for num_workers in worker_counts(os.cpu_count() or 1):
+        start = time.perf_counter()
+        for i in range(num_run):
+            number_plate_detection_and_reading(images,
+                                               batch_size=batch_size,
+                                               num_workers=num_workers,
+                                               executor=executor)
+        photos_per_second = len(images) * num_run / (time.perf_counter() - start)
+        base = base or photos_per_second
+        print(f"{num_workers:>8}{photos_per_second:>12.2f}{photos_per_second / base:>10.2f}")
+
+
 def main(pipeline_name, image_loader_name, images_glob,
-         num_run, batch_size, num_workers,  **_):
+         num_run, batch_size, num_workers, executor="gevent", scaling=False,
+         stream=False, prefetch=2, backend="torch", **_):
     number_plate_detection_and_reading = pipeline(
         pipeline_name,
-        image_loader=image_loader_name
+        image_loader=image_loader_name,
+        **backend_kwargs(backend)
     )
 
     if os.path.isabs(images_glob):
@@ -44,11 +103,29 @@ def main(pipeline_name, image_loader_name, images_glob,
     else:
         images = glob(os.path.join(nomeroff_net_dir, images_glob))
 
+    if scaling:
+        run_scaling(number_plate_detection_and_reading, images, num_run, batch_size, executor)
+        return
+
+    if stream:
+        start = time.perf_counter()
+        for i in range(num_run):
+            for _ in number_plate_detection_and_reading.stream(images,
+                                                               batch_size=batch_size,
+                                                               prefetch=prefetch,
+                                                               num_workers=num_workers,
+                                                               executor=executor):
+                pass
+        print(f"Streamed {len(images) * num_run} photos at "
+              f"{len(images) * num_run / (time.perf_counter() - start):.2f} photos/s")
+        return
+
     number_plate_detection_and_reading.clear_stat()
     for i in range(num_run):
         number_plate_detection_and_reading(images,
                                            batch_size=batch_size,
-                                           num_workers=num_workers)
+                                           num_workers=num_workers,
+                                           executor=executor)
     timer_stat = number_plate_detection_and_reading.get_timer_stat(len(images) * num_run)
     timer_stat["count_photos"] = len(images)
 
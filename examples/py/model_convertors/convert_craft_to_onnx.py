@@ -0,0 +1,80 @@
+"""
+Convert CRAFT text detection and refiner models to one onnx model for the ONNX Runtime CPU backend
+
+python3 ./convert_craft_to_onnx.py
+"""
+import sys
+import os
+import pathlib
+import torch
+import argparse
+
+sys.path.append(os.path.join(os.path.abspath(os.getcwd()), "../../../"))
+
+from nomeroff_net.pipes.number_plate_keypoints_detectors.bbox_np_points import NpPointsCraft
+
+
+class CraftWithRefiner(torch.nn.Module):
+    """
+    CraftNet followed by RefineNet, returns the score and link maps like NpPointsCraft.run_net
+    """
+    def __init__(self, net, refine_net):
+        super().__init__()
+        self.net = net
+        self.refine_net = refine_net
+
+    def forward(self, x):
+        y, feature = self.net(x)
+        y_refiner = self.refine_net(y, feature)
+        return y[:, :, :, 0], y_refiner[:, :, :, 0]
+
+
+def parse_args():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-f", "--filepath",
+                    default=os.path.join(os.path.abspath(os.getcwd()),
+                                         "../../../data/model_repository/craft/1/model.onnx"),
+                    required=False,
+                    type=str,
+                    help="Result onnx model filepath")
+    ap.add_argument("-o", "--opset",
+                    default=13,
+                    required=False,
+                    type=int,
+                    help="ONNX opset version")
+    args = vars(ap.parse_args())
+    return args
+
+
+@torch.no_grad()
+def main():
+    args = parse_args()
+    model_filepath = args["filepath"]
+
+    detector = NpPointsCraft()
+    detector.load("latest", "latest")
+    model = CraftWithRefiner(detector.net.cpu(), detector.refine_net.cpu()).eval()
+
+    # crops are resized to a 300px canvas and padded to multiples of 32
+    x = torch.randn(2, 3, 96, 320)
+
+    # make dirs
+    p = pathlib.Path(os.path.dirname(model_filepath))
+    p.mkdir(parents=True, exist_ok=True)
+
+    torch.onnx.export(model, x, model_filepath,
+                      export_params=True,
+                      opset_version=args["opset"],
+                      do_constant_folding=True,
+                      input_names=['image'],
+                      output_names=['score_text', 'score_link'],
+                      dynamic_axes={
+                          'image': {0: 'batch_size', 2: 'height', 3: 'width'},
+                          'score_text': {0: 'batch_size', 1: 'map_height', 2: 'map_width'},
+                          'score_link': {0: 'batch_size', 1: 'map_height', 2: 'map_width'},
+                      })
+    print(f"[INFO] saved", model_filepath)
+
+
+if __name__ == "__main__":
+    main()
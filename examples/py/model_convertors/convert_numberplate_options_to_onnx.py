@@ -0,0 +1,74 @@
+"""
+Convert numberplate classification model to onnx for the ONNX Runtime CPU backend
+
+python3 ./convert_numberplate_options_to_onnx.py
+"""
+import sys
+import os
+import pathlib
+import torch
+import argparse
+
+sys.path.append(os.path.join(os.path.abspath(os.getcwd()), "../../../"))
+
+from nomeroff_net.pipes.number_plate_classificators.options_detector import OptionsDetector
+from nomeroff_net.tools.ort_tools import save_onnx_metadata
+
+
+def parse_args():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-f", "--filepath",
+                    default=os.path.join(os.path.abspath(os.getcwd()),
+                                         "../../../data/model_repository/numberplate_options/1/model.onnx"),
+                    required=False,
+                    type=str,
+                    help="Result onnx model filepath")
+    ap.add_argument("-o", "--opset",
+                    default=13,
+                    required=False,
+                    type=int,
+                    help="ONNX opset version")
+    args = vars(ap.parse_args())
+    return args
+
+
+@torch.no_grad()
+def main():
+    args = parse_args()
+    model_filepath = args["filepath"]
+
+    detector = OptionsDetector()
+    detector.load("latest")
+    print(f"[INFO] torch model", detector.model)
+
+    model = detector.model.to("cpu")
+    x = torch.randn(1, detector.color_channels, detector.height, detector.width)
+
+    # make dirs
+    p = pathlib.Path(os.path.dirname(model_filepath))
+    p.mkdir(parents=True, exist_ok=True)
+
+    # Export the model
+    model.to_onnx(model_filepath, x,
+                  export_params=True,
+                  opset_version=args["opset"],
+                  do_constant_folding=True,
+                  input_names=['inp_conv'],
+                  output_names=['fc3_reg', 'fc3_line'],
+                  dynamic_axes={
+                      'inp_conv': {0: 'batch_size'},
+                      'fc3_reg': {0: 'batch_size'},
+                      'fc3_line': {0: 'batch_size'}
+                  })
+    save_onnx_metadata(model_filepath, {
+        "class_region": detector.class_region,
+        "count_lines": detector.count_lines,
+        "height": detector.height,
+        "width": detector.width,
+        "color_channels": detector.color_channels,
+    })
+    print(f"[INFO] saved", model_filepath)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Convert ocr models to onnx for the ONNX Runtime CPU backend
+
+EXAMPLE:
+    python3 ./convert_ocr_to_onnx.py -d eu
+"""
+import sys
+import os
+import pathlib
+import torch
+import argparse
+
+sys.path.append(os.path.join(os.path.abspath(os.getcwd()), "../../../"))
+
+from nomeroff_net.pipes.number_plate_text_readers.text_detector import TextDetector
+from nomeroff_net.pipelines.number_plate_text_reading import DEFAULT_PRESETS
+from nomeroff_net.tools.ort_tools import save_onnx_metadata
+
+
+def parse_args():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-f", "--filepath",
+                    default=os.path.join(os.path.abspath(os.getcwd()),
+                                         "../../../data/model_repository/ocr-{ocr_name}/1/model.onnx"),
+                    required=False,
+                    type=str,
+                    help="Result onnx model filepath")
+    ap.add_argument("-d", "--detector_name",
+                    default="all",
+                    required=False,
+                    choices=["all", *DEFAULT_PRESETS.keys()],
+                    help="Detector name")
+    ap.add_argument("-o", "--opset",
+                    default=13,
+                    required=False,
+                    type=int,
+                    help="ONNX opset version")
+    args = vars(ap.parse_args())
+    return args
+
+
+@torch.no_grad()
+def main():
+    args = parse_args()
+    filepath = args["filepath"]
+    detector_names = list(DEFAULT_PRESETS.keys()) if args["detector_name"] == "all" else [args["detector_name"]]
+
+    text_detector = TextDetector({
+        name: {
+            "for_regions": DEFAULT_PRESETS[name]["for_regions"],
+            "model_path": "latest"
+        } for name in detector_names
+    })
+
+    for index, name in enumerate(text_detector.detectors_names):
+        print(f"\n\n[INFO] detector name", name)
+        detector = text_detector.get_detector(index)
+        model_filepath = filepath.replace("{ocr_name}", name)
+
+        model = detector.model.to("cpu")
+        x = torch.randn(1, detector.color_channels, detector.height, detector.width)
+
+        # make dirs
+        p = pathlib.Path(os.path.dirname(model_filepath))
+        p.mkdir(parents=True, exist_ok=True)
+
+        # Export the model, the output is [seq_len, batch_size, letters_max]
+        model.to_onnx(model_filepath, x,
+                      export_params=True,
+                      opset_version=args["opset"],
+                      do_constant_folding=True,
+                      input_names=[f'inp_{name}'],
+                      output_names=[f'out_{name}'],
+                      dynamic_axes={
+                          f'inp_{name}': {0: 'batch_size'},
+                          f'out_{name}': {1: 'batch_size'},
+                      })
+        save_onnx_metadata(model_filepath, {
+            "letters": detector.letters,
+            "max_text_len": detector.max_text_len,
+            "height": detector.height,
+            "width": detector.width,
+            "color_channels": detector.color_channels,
+        })
+        print(f"[INFO] saved", model_filepath)
+
+
+if __name__ == "__main__":
+    main()
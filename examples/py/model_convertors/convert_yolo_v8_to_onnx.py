@@ -0,0 +1,62 @@
+"""
+Convert numberplate localization model to onnx for the ONNX Runtime CPU backend
+
+python3 ./convert_yolo_v8_to_onnx.py
+"""
+import sys
+import os
+import shutil
+import pathlib
+import argparse
+
+sys.path.append(os.path.join(os.path.abspath(os.getcwd()), "../../../"))
+from nomeroff_net.tools.mcm import modelhub
+
+
+def parse_args():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-f", "--filepath",
+                    default=os.path.join(os.path.abspath(os.getcwd()),
+                                         "../../../data/model_repository/yolov8/1/model.onnx"),
+                    required=False,
+                    type=str,
+                    help="Result onnx model filepath")
+    ap.add_argument("-m", "--model_name",
+                    default="yolov8",
+                    required=False,
+                    type=str,
+                    help="Modelhub model name")
+    ap.add_argument("-s", "--img_size",
+                    default=640,
+                    required=False,
+                    type=int,
+                    help="Input image size")
+    ap.add_argument("-o", "--opset",
+                    default=13,
+                    required=False,
+                    type=int,
+                    help="ONNX opset version")
+    args = vars(ap.parse_args())
+    return args
+
+
+def main():
+    from ultralytics import YOLO
+
+    args = parse_args()
+    model_filepath = args["filepath"]
+
+    model_info = modelhub.download_model_by_name(args["model_name"])
+    model = YOLO(model_info["path"])
+    # dynamic batch, imgsz and stride are written in the model metadata
+    res = model.export(format="onnx", imgsz=args["img_size"], opset=args["opset"], dynamic=True, device="cpu")
+
+    # make dirs
+    p = pathlib.Path(os.path.dirname(model_filepath))
+    p.mkdir(parents=True, exist_ok=True)
+    shutil.copy(res, model_filepath)
+    print(f"[INFO] saved", model_filepath)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+INT8 post-training quantisation of the ocr and numberplate options models for CPU inference.
+LSTM and Linear layers are quantised dynamically, the convolutional backbones statically with
+activation ranges calibrated on numberplate zone images. Reports the accuracy delta (texts are
+checked against the image file names) and the speedup over the fp32 models.
+
+EXAMPLE:
+    python3 ./quantize_ocr_and_options_models.py -d eu -g "../../../data/examples/numberplate_zone_images/*"
+    python3 ./quantize_ocr_and_options_models.py -m options --mode dynamic -n 50
+
+The result files load with the usual paths:
+    TextDetector({"eu": {"for_regions": [...], "model_path": ".../ocr-eu/1/model-int8.pt"}})
+    OptionsDetector().load(".../numberplate_options/1/model-int8.pt")
+"""
+import sys
+import os
+import time
+import pathlib
+import argparse
+from glob import glob
+
+import cv2
+import numpy as np
+import torch
+
+sys.path.append(os.path.join(os.path.abspath(os.getcwd()), "../../../"))
+
+from nomeroff_net.pipes.number_plate_text_readers.text_detector import TextDetector
+from nomeroff_net.pipes.number_plate_classificators.options_detector import OptionsDetector
+from nomeroff_net.pipelines.number_plate_text_reading import DEFAULT_PRESETS
+from nomeroff_net.tools.quantization import (quantize_ocr_model,
+                                             quantize_options_model,
+                                             save_quantized_model,
+                                             default_quantized_engine)
+
+
+def parse_args():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-m", "--models",
+                    default="all",
+                    required=False,
+                    choices=["all", "ocr", "options"],
+                    help="Models to quantise")
+    ap.add_argument("-d", "--detector_name",
+                    default="all",
+                    required=False,
+                    choices=["all", *DEFAULT_PRESETS.keys()],
+                    help="OCR detector name")
+    ap.add_argument("--mode",
+                    default="static",
+                    required=False,
+                    choices=["static", "dynamic"],
+                    help="static also quantises the convolutional backbone, dynamic only LSTM and Linear layers")
+    ap.add_argument("-g", "--calibration_glob",
+                    default=os.path.join(os.path.abspath(os.getcwd()),
+                                         "../../../data/examples/numberplate_zone_images/*"),
+                    required=False,
+                    type=str,
+                    help="Numberplate zone images named by their text")
+    ap.add_argument("--ocr_filepath",
+                    default=os.path.join(os.path.abspath(os.getcwd()),
+                                         "../../../data/model_repository/ocr-{ocr_name}/1/model-int8.pt"),
+                    required=False,
+                    type=str,
+                    help="Result quantised ocr model filepath")
+    ap.add_argument("--options_filepath",
+                    default=os.path.join(os.path.abspath(os.getcwd()),
+                                         "../../../data/model_repository/numberplate_options/1/model-int8.pt"),
+                    required=False,
+                    type=str,
+                    help="Result quantised options model filepath")
+    ap.add_argument("-e", "--engine",
+                    default=default_quantized_engine(),
+                    required=False,
+                    choices=["fbgemm", "x86", "qnnpack"],
+                    help="Quantised kernels, qnnpack for ARM, fbgemm or x86 for x86 CPUs")
+    ap.add_argument("-b", "--batch_size",
+                    default=8,
+                    required=False,
+                    type=int,
+                    help="Calibration and benchmark batch size")
+    ap.add_argument("-n", "--num_run",
+                    default=20,
+                    required=False,
+                    type=int,
+                    help="Timed runs per model")
+    args = vars(ap.parse_args())
+    return args
+
+
+def load_zones(calibration_glob):
+    paths = sorted(glob(calibration_glob))
+    if not paths:
+        raise FileNotFoundError(f"No calibration images in {calibration_glob}")
+    zones = [cv2.imread(path)[..., ::-1] for path in paths]
+    texts = [os.path.splitext(os.path.basename(path))[0].upper() for path in paths]
+    return zones, texts
+
+
+def batches(x, batch_size):
+    return [x[i:i + batch_size] for i in range(0, len(x), batch_size)]
+
+
+def timeit(func, num_run):
+    func()  # warm up
+    start = time.perf_counter()
+    for _ in range(num_run):
+        func()
+    return (time.perf_counter() - start) / num_run * 1000
+
+
+def report_speed(name, fp32_model, int8_model, x, num_run):
+    for batch in (x[:1], x):
+        fp32_ms = timeit(lambda: fp32_model(batch), num_run)
+        int8_ms = timeit(lambda: int8_model(batch), num_run)
+        print(f"[INFO] {name} batch {len(batch)}: fp32 {fp32_ms:.2f}ms, int8 {int8_ms:.2f}ms, "
+              f"speedup {fp32_ms / int8_ms:.2f}x")
+
+
+def tile(x, batch_size):
+    """
+    Repeat the zones up to batch_size so that latency is measured on a full batch
+    """
+    return x.repeat((batch_size + len(x) - 1) // len(x), 1, 1, 1)[:batch_size]
+
+
+@torch.no_grad()
+def quantize_ocr(args, zones, texts):
+    detector_names = list(DEFAULT_PRESETS.keys()) if args["detector_name"] == "all" else [args["detector_name"]]
+    text_detector = TextDetector({
+        name: {
+            "for_regions": DEFAULT_PRESETS[name]["for_regions"],
+            "model_path": "latest"
+        } for name in detector_names
+    })
+
+    for index, name in enumerate(text_detector.detectors_names):
+        print(f"\n\n[INFO] detector name", name)
+        detector = text_detector.get_detector(index)
+        fp32_model = detector.model.to("cpu").eval()
+        xs = detector.preprocess(zones).cpu()
+        int8_model = quantize_ocr_model(fp32_model, batches(xs, args["batch_size"]),
+                                        static=args["mode"] == "static", engine=args["engine"])
+
+        fp32_out, int8_out = fp32_model(xs), int8_model(xs)
+        fp32_texts, int8_texts = detector.postprocess(fp32_out), detector.postprocess(int8_out)
+        fp32_acc = np.mean([t1 == t2 for t1, t2 in zip(fp32_texts, texts)])
+        int8_acc = np.mean([t1 == t2 for t1, t2 in zip(int8_texts, texts)])
+        agreement = np.mean([t1 == t2 for t1, t2 in zip(fp32_texts, int8_texts)])
+        print(f"[INFO] {name} accuracy on {len(texts)} zones: fp32 {fp32_acc:.2%}, int8 {int8_acc:.2%}, "
+              f"delta {int8_acc - fp32_acc:+.2%}, texts agreement {agreement:.2%}, "
+              f"max logit diff {(fp32_out - int8_out).abs().max():.4f}")
+        report_speed(name, fp32_model, int8_model, tile(xs, args["batch_size"]), args["num_run"])
+
+        model_filepath = args["ocr_filepath"].replace("{ocr_name}", name)
+        pathlib.Path(os.path.dirname(model_filepath)).mkdir(parents=True, exist_ok=True)
+        save_quantized_model(int8_model, xs[:1], model_filepath, {
+            "letters": detector.letters,
+            "max_text_len": detector.max_text_len,
+            "height": detector.height,
+            "width": detector.width,
+            "color_channels": detector.color_channels,
+        }, engine=args["engine"])
+        print(f"[INFO] saved", model_filepath)
+
+
+@torch.no_grad()
+def quantize_options(args, zones):
+    print(f"\n\n[INFO] numberplate options")
+    detector = OptionsDetector()
+    detector.load("latest")
+    fp32_model = detector.model.to("cpu").eval()
+    xs = torch.tensor(detector.preprocess(zones))
+    int8_model = quantize_options_model(fp32_model, batches(xs, args["batch_size"]),
+                                        static=args["mode"] == "static", engine=args["engine"])
+
+    (fp32_regions, fp32_lines), (int8_regions, int8_lines) = fp32_model(xs), int8_model(xs)
+    agreement = np.mean(((fp32_regions.argmax(1) == int8_regions.argmax(1)) &
+                         (fp32_lines.argmax(1) == int8_lines.argmax(1))).numpy())
+    max_diff = max((fp32_regions - int8_regions).abs().max(), (fp32_lines - int8_lines).abs().max())
+    print(f"[INFO] options on {len(xs)} zones: label agreement {agreement:.2%}, max probability diff {max_diff:.4f}")
+    report_speed("options", fp32_model, int8_model, tile(xs, args["batch_size"]), args["num_run"])
+
+    model_filepath = args["options_filepath"]
+    pathlib.Path(os.path.dirname(model_filepath)).mkdir(parents=True, exist_ok=True)
+    save_quantized_model(int8_model, xs[:1], model_filepath, {
+        "class_region": detector.class_region,
+        "count_lines": detector.count_lines,
+        "height": detector.height,
+        "width": detector.width,
+    }, engine=args["engine"])
+    print(f"[INFO] saved", model_filepath)
+
+
+def main():
+    args = parse_args()
+    zones, texts = load_zones(args["calibration_glob"])
+    print(f"[INFO] {len(zones)} calibration zones, {args['mode']} quantisation, {args['engine']} engine")
+    if args["models"] in ("all", "ocr"):
+        quantize_ocr(args, zones, texts)
+    if args["models"] in ("all", "options"):
+        quantize_options(args, zones)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,10 +3,13 @@ from .opencv_loader import OpencvImageLoader
 from .pillow_loader import PillowImageLoader
 from .turbo_loader import TurboImageLoader
 from .dumpy_loader import DumpyImageLoader
+from .numpy_loader import NumpyImageLoader, RgbNumpyImageLoader
 
 image_loaders_map = {
     "opencv": OpencvImageLoader,
     "cv2": OpencvImageLoader,
     "pillow": PillowImageLoader,
     "turbo": TurboImageLoader,
+    "numpy": NumpyImageLoader,
+    "numpy_rgb": RgbNumpyImageLoader,
 }
@@ -0,0 +1,54 @@
+"""
+python3 -m nomeroff_net.image_loaders.numpy_loader
+"""
+import os
+import cv2
+import numpy as np
+from .base import BaseImageLoader
+
+
+class NumpyImageLoader(BaseImageLoader):
+    """
+    Loader for frames that are already decoded in memory.
+
+    Arrays are expected in OpenCV channel order (BGR, BGRA or grayscale), as returned by
+    cv2.VideoCapture.read() or cv2.imdecode(), and are converted to the RGB order the pipelines
+    work in, exactly like OpencvImageLoader does after cv2.imread. File paths are still accepted,
+    so the same pipeline instance can serve both in-memory frames and images on disk.
+    """
+    def __init__(self, color_order: str = "bgr"):
+        if color_order not in ("bgr", "rgb"):
+            raise ValueError(f"color_order must be 'bgr' or 'rgb', got '{color_order}'")
+        self.color_order = color_order
+
+    def load(self, img):
+        if isinstance(img, (str, os.PathLike)):
+            img_path = str(img)
+            img = cv2.imread(img_path)
+            if img is None:
+                raise ValueError(f"Could not read image {img_path}")
+            return cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+        if not isinstance(img, np.ndarray):
+            raise TypeError(f"Expected numpy.ndarray or path, got {type(img)}")
+        if img.ndim == 2:
+            return cv2.cvtColor(img, cv2.COLOR_GRAY2RGB)
+        if img.shape[2] == 4:
+            code = cv2.COLOR_BGRA2RGB if self.color_order == "bgr" else cv2.COLOR_RGBA2RGB
+            return cv2.cvtColor(img, code)
+        if self.color_order == "bgr":
+            return cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+        return img
+
+
+class RgbNumpyImageLoader(NumpyImageLoader):
+    """Loader for in-memory frames that are already in RGB order (e.g. PIL or picamera2 RGB888)"""
+    def __init__(self):
+        NumpyImageLoader.__init__(self, color_order="rgb")
+
+
+if __name__ == "__main__":
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    img_file = os.path.join(current_dir, "../../data/examples/oneline_images/example1.jpeg")
+
+    image_loader = NumpyImageLoader()
+    loaded_img = image_loader.load(cv2.imread(img_file))
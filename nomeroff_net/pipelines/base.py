@@ -10,6 +10,9 @@ The module contains the following classes:
 """
 import os
 import time
+import queue
+import pickle
+import threading
 import ujson
 import cv2
 import numpy as np
@@ -20,8 +23,29 @@ from typing import Any, Dict, Optional, Union
 from collections import Counter
 from nomeroff_net.tools import promise_all
 from nomeroff_net.tools import chunked_iterable
+from nomeroff_net.tools.pipeline_tools import EXECUTORS
+from nomeroff_net.tools.model_registry import model_registry
 from nomeroff_net.image_loaders import BaseImageLoader, DumpyImageLoader, image_loaders_map
 
+# Marks the end of a stage's output in Pipeline.stream
+_END_OF_STREAM = object()
+
+# Copy of the pipeline in a worker of the "process" executor
+_worker_pipeline = None
+
+
+def _init_process_worker(spec):
+    """
+    Build the pipeline of a process pool worker once, from its pickled class and constructor arguments
+    """
+    global _worker_pipeline
+    pipeline_class, args, kwargs = pickle.loads(spec)
+    _worker_pipeline = pipeline_class(*args, **kwargs)
+
+
+def _run_in_worker_pipeline(method_name, inputs, params):
+    return getattr(_worker_pipeline, method_name)(inputs, **params)
+
 
 def may_by_empty_method(func):
     """
@@ -157,16 +181,32 @@ class Pipeline(AccuracyTestPipeline):
 
     default_input_names = None
 
+    def __new__(cls, *args, **kwargs):
+        pipeline = super().__new__(cls)
+        # the workers of the "process" executor build their own copy of the pipeline from these
+        pipeline._init_args = (args, kwargs)
+        return pipeline
+
     def __init__(
         self,
         task: str = "",
         image_loader: Optional[Union[str, BaseImageLoader]] = None,
+        executor: str = "gevent",
         **kwargs,
     ):
         """
-        TODO: write description
+        executor runs preprocess and postprocess when num_workers > 1:
+        "thread" for GIL-releasing OpenCV work, "gevent" greenlets as before (no CPU parallelism),
+        "process" for pure-Python work: every worker process builds its own copy of the pipeline,
+        models included, once from the constructor arguments, which must be picklable
         """
+        if executor not in EXECUTORS:
+            raise ValueError(f"executor must be one of {EXECUTORS}, got {executor}")
         self.task = task
+        self.executor = executor
+        self._process_spec = None
+        if executor == "process":
+            self._get_process_spec()
         self.image_loader = self._init_image_loader(image_loader)
 
         self._preprocess_params, self._forward_params, self._postprocess_params = self.sanitize_parameters(**kwargs)
@@ -237,77 +277,228 @@ class Pipeline(AccuracyTestPipeline):
         """
         return self.call(inputs, **kwargs)
 
-    def call(self, inputs, batch_size=1, num_workers=1, **kwargs):
-        """
-        TODO: write description
-        """
+    def close(self) -> None:
+        """
+        Release the shared models of this pipeline and its sub-pipelines back to the model registry.
+        The pipeline can not be called afterwards.
+        """
+        if getattr(self, "_closed", False):
+            return
+        self._closed = True
+        values = []
+        for value in vars(self).values():
+            values.extend(value if isinstance(value, (list, tuple)) else [value])
+        released = set()
+        for value in values:
+            if id(value) in released or value is self:
+                continue
+            released.add(id(value))
+            if isinstance(value, Pipeline):
+                value.close()
+            elif not model_registry.release(value) and hasattr(value, "release_models"):
+                value.release_models()
+
+    def _resolve_parameters(self, batch_size, num_workers, executor, **kwargs):
+        """
+        Fuse __init__ params and call params without modifying the __init__ ones.
+        """
+        executor = executor or self.executor
+        if executor not in EXECUTORS:
+            raise ValueError(f"executor must be one of {EXECUTORS}, got {executor}")
+        if executor == "process" and num_workers > 1:
+            self._get_process_spec()
+        if num_workers < 0 or num_workers > batch_size:
+            raise ValueError("num_workers must by grater 0 and less or equal batch_size")
         kwargs["batch_size"] = batch_size
         kwargs["num_workers"] = num_workers
+        kwargs["executor"] = executor
         preprocess_params, forward_params, postprocess_params = self.sanitize_parameters(**kwargs)
 
-        # Fuse __init__ params and __call__ params without modifying the __init__ ones.
         preprocess_params = {**self._preprocess_params, **preprocess_params}
         forward_params = {**self._forward_params, **forward_params}
         postprocess_params = {**self._postprocess_params, **postprocess_params}
+        return executor, preprocess_params, forward_params, postprocess_params
 
-        if num_workers < 0 or num_workers > batch_size:
-            raise ValueError("num_workers must by grater 0 and less or equal batch_size")
+    def _get_process_spec(self) -> bytes:
+        """
+        Pickled class and constructor arguments the "process" executor workers build the pipeline from,
+        ValueError when the pipeline can not be rebuilt that way
+        """
+        if getattr(self, "_process_spec", None) is None:
+            args, kwargs = getattr(self, "_init_args", ((), {}))
+            try:
+                self._process_spec = pickle.dumps((self.__class__, args, kwargs))
+            except Exception as e:
+                raise ValueError(f"executor \"process\" is not supported by {self.__class__.__name__}, "
+                                 f"its constructor arguments can not be pickled: {e}") from e
+        return self._process_spec
+
+    def call(self, inputs, batch_size=1, num_workers=1, executor=None, **kwargs):
+        """
+        TODO: write description
+        """
+        executor, preprocess_params, forward_params, postprocess_params = self._resolve_parameters(
+            batch_size, num_workers, executor, **kwargs)
         outputs = self.run_multi(inputs, batch_size, num_workers,
-                                 preprocess_params, forward_params, postprocess_params)
+                                 preprocess_params, forward_params, postprocess_params,
+                                 executor=executor)
         return outputs
 
+    def stream(self, inputs, batch_size=1, prefetch=2, num_workers=1, executor=None, **kwargs):
+        """
+        Generator version of call for long or unbounded inputs, yields one output per input in input order.
+        Stages run on their own threads: while batch N is postprocessed here, batch N+1 is in forward
+        and batch N+2 is being loaded and preprocessed. At most prefetch batches wait between two stages,
+        so memory stays bounded however many inputs there are. An exception in any stage is re-raised here.
+        """
+        if prefetch < 1:
+            raise ValueError("prefetch must by grater 0")
+        executor, preprocess_params, forward_params, postprocess_params = self._resolve_parameters(
+            batch_size, num_workers, executor, **kwargs)
+
+        def preprocess(chunk):
+            if not hasattr(self.preprocess, "is_empty") or not self.preprocess.is_empty:
+                return self.process_worker(self.preprocess, chunk, preprocess_params, num_workers, executor)
+            return chunk
+
+        def forward(chunk):
+            if not hasattr(self.forward, "is_empty") or not self.forward.is_empty:
+                return self.forward(chunk, **forward_params)
+            return chunk
+
+        stop_event = threading.Event()
+        preprocessed = queue.Queue(maxsize=prefetch)
+        forwarded = queue.Queue(maxsize=prefetch)
+        threads = [
+            threading.Thread(target=self._stream_stage,
+                             args=(chunked_iterable(inputs, batch_size), preprocess, preprocessed, stop_event),
+                             name=f"{self.__class__.__name__}-preprocess", daemon=True),
+            threading.Thread(target=self._stream_stage,
+                             args=(self._stream_source(preprocessed, stop_event), forward, forwarded, stop_event),
+                             name=f"{self.__class__.__name__}-forward", daemon=True),
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            for chunk in self._stream_source(forwarded, stop_event):
+                if not hasattr(self.postprocess, "is_empty") or not self.postprocess.is_empty:
+                    chunk = self.process_worker(self.postprocess, chunk, postprocess_params, num_workers, executor)
+                for output in chunk:
+                    yield output
+        finally:
+            # Also reached when the consumer stops iterating early
+            stop_event.set()
+            for thread in threads:
+                thread.join()
+
     @staticmethod
-    def process_worker(func, inputs, params, num_workers=1):
+    def _stream_put(stage_queue, item, stop_event):
+        while not stop_event.is_set():
+            try:
+                stage_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    @staticmethod
+    def _stream_source(stage_queue, stop_event):
+        """
+        Items of an upstream stage until its end marker, exceptions raised upstream are re-raised
+        """
+        while not stop_event.is_set():
+            try:
+                item = stage_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if item is _END_OF_STREAM:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+
+    def _stream_stage(self, source, func, stage_queue, stop_event):
+        try:
+            for chunk in source:
+                if not self._stream_put(stage_queue, func(chunk), stop_event):
+                    return
+        except BaseException as e:
+            self._stream_put(stage_queue, e, stop_event)
+            return
+        self._stream_put(stage_queue, _END_OF_STREAM, stop_event)
+
+    @staticmethod
+    def process_worker(func, inputs, params, num_workers=1, executor="gevent"):
         """
-        TODO: write description
+        Run func over inputs split between num_workers, outputs keep the input order.
+        gevent spawns a greenlet per item, thread and process pools get one contiguous
+        chunk per worker from a long-lived pool. Process workers only receive the chunk and
+        params and run the method of the same name on their own copy of the pipeline.
         """
         if num_workers == 1:
             return func(inputs, **params)
-        promises_outputs = []
-        promise_all_args = []
-        for chunk_inputs in chunked_iterable(inputs, num_workers):
-            for inp in chunked_iterable(chunk_inputs, 1):
-                promise_all_args.append(
-                    {
-                        "function": func,
-                        "args": [inp],
-                        "kwargs": params
-                    }
-                )
-            # print(f"RUN promise_all {func} functions {len(promise_all_args)}")
-            promise_outputs = promise_all(promise_all_args)
-            promises_outputs.append(promise_outputs)
+        inputs = list(inputs)
+        if executor == "gevent":
+            chunks = list(chunked_iterable(inputs, 1))
+        else:
+            chunks = list(chunked_iterable(inputs, -(-len(inputs) // num_workers)))
+        initializer, initargs = None, ()
+        if executor == "process":
+            pipeline = getattr(func, "__self__", None)
+            if not isinstance(pipeline, Pipeline):
+                raise ValueError(f"executor \"process\" runs pipeline methods only, got {func}")
+            initializer, initargs = _init_process_worker, (pipeline._get_process_spec(),)
+            promise_all_args = [
+                {
+                    "function": _run_in_worker_pipeline,
+                    "args": [func.__name__, chunk, params]
+                }
+                for chunk in chunks
+            ]
+        else:
+            promise_all_args = [
+                {
+                    "function": func,
+                    "args": [chunk],
+                    "kwargs": params
+                }
+                for chunk in chunks
+            ]
+        promise_outputs = promise_all(promise_all_args, executor=executor, max_workers=num_workers,
+                                      initializer=initializer, initargs=initargs)
 
         outputs = []
-        for promise_output in promises_outputs:
-            for chunk in promise_output:
-                for item in chunk:
-                    outputs.append(item)
+        for chunk in promise_outputs:
+            for item in chunk:
+                outputs.append(item)
         return outputs
 
-    def run_multi(self, inputs, batch_size, num_workers, preprocess_params, forward_params, postprocess_params):
+    def run_multi(self, inputs, batch_size, num_workers, preprocess_params, forward_params, postprocess_params,
+                  executor="gevent"):
         """
         TODO: write description
         """
         outputs = []
         for chunk_inputs in chunked_iterable(inputs, batch_size):
             chunk_outputs = self.run_single(chunk_inputs, num_workers,
-                                            preprocess_params, forward_params, postprocess_params)
+                                            preprocess_params, forward_params, postprocess_params,
+                                            executor=executor)
             for output in chunk_outputs:
                 outputs.append(output)
         return outputs
 
-    def run_single(self, inputs, num_workers, preprocess_params, forward_params, postprocess_params):
+    def run_single(self, inputs, num_workers, preprocess_params, forward_params, postprocess_params,
+                   executor="gevent"):
         """
         TODO: write description
         """
         _inputs = inputs
         if not hasattr(self.preprocess, "is_empty") or not self.preprocess.is_empty:
-            _inputs = self.process_worker(self.preprocess, _inputs, preprocess_params, num_workers)
+            _inputs = self.process_worker(self.preprocess, _inputs, preprocess_params, num_workers, executor)
         if not hasattr(self.forward, "is_empty") or not self.forward.is_empty:
             _inputs = self.forward(_inputs, **forward_params)
         if not hasattr(self.postprocess, "is_empty") or not self.postprocess.is_empty:
-            _inputs = self.process_worker(self.postprocess, _inputs, postprocess_params, num_workers)
+            _inputs = self.process_worker(self.postprocess, _inputs, postprocess_params, num_workers, executor)
         return _inputs
 
 
@@ -331,6 +522,8 @@ class CompositePipeline(object):
                 forward_parameters["batch_size"] = kwargs["batch_size"]
             if key == "num_workers":
                 forward_parameters["num_workers"] = kwargs["num_workers"]
+            if key == "executor":
+                forward_parameters["executor"] = kwargs["executor"]
         for pipeline in self.pipelines:
             for dict_params in pipeline.sanitize_parameters(**kwargs):
                 forward_parameters.update(dict_params)
@@ -1,9 +1,11 @@
+import numpy as np
 from torch import no_grad
 from typing import Any, Dict, Optional, Union
 from nomeroff_net.image_loaders import BaseImageLoader
 from nomeroff_net.pipelines.base import Pipeline
 from nomeroff_net.pipes.number_plate_classificators.options_detector import OptionsDetector
 from nomeroff_net.tools import unzip
+from nomeroff_net.tools.model_registry import model_registry
 
 
 class NumberPlateClassification(Pipeline):
@@ -19,8 +21,8 @@ class NumberPlateClassification(Pipeline):
                  class_detector=OptionsDetector,
                  **kwargs):
         super().__init__(task, image_loader, **kwargs)
-        self.detector = class_detector(options=options)
-        self.detector.load(path_to_model, options=options)
+        self.detector = model_registry.load(class_detector, path_to_model,
+                                            init_kwargs={"options": options}, options=options)
 
     def sanitize_parameters(self, **kwargs):
         return {}, {}, {}
@@ -35,7 +37,7 @@ class NumberPlateClassification(Pipeline):
     @no_grad()
     def forward(self, inputs: Any, **forward_parameters: Dict) -> Any:
         model_output = self.detector.forward(inputs)
-        model_output = [p.cpu().numpy() for p in model_output]
+        model_output = [p if isinstance(p, np.ndarray) else p.cpu().numpy() for p in model_output]
         model_output = [*model_output, inputs]
         return unzip(model_output)
 
@@ -18,6 +18,9 @@ from .number_plate_text_reading import NumberPlateTextReading
 from.number_plate_classification import NumberPlateClassification
 from nomeroff_net.tools.image_processing import crop_number_plate_zones_from_images, group_by_image_ids
 from nomeroff_net.tools import unzip
+from nomeroff_net.pipes.number_plate_keypoints_detectors.bbox_np_points import NpPointsCraft
+from nomeroff_net.pipes.number_plate_classificators.options_detector import OptionsDetector
+from nomeroff_net.pipes.number_plate_text_readers.text_detector import TextDetector
 
 
 class NumberPlateDetectionAndReading(Pipeline, CompositePipeline):
@@ -39,6 +42,12 @@ class NumberPlateDetectionAndReading(Pipeline, CompositePipeline):
                  default_lines_count: int = 1,
                  number_plate_localization_class: Pipeline = DefaultNumberPlateLocalization,
                  number_plate_localization_detector=None,
+                 key_points_class_detector=NpPointsCraft,
+                 class_detector=OptionsDetector,
+                 ocr_class_detector=TextDetector,
+                 ocr_lazy_load: bool = False,
+                 ocr_preload: List = None,
+                 ocr_memory_budget_mb: float = None,
                  **kwargs):
         """
         init NumberPlateDetectionAndReading Class
@@ -55,6 +64,12 @@ class NumberPlateDetectionAndReading(Pipeline, CompositePipeline):
             default_lines_count (): default_lines_count
             number_plate_localization_class (): number_plate_localization_class
             number_plate_localization_detector (): number_plate_localization_detector
+            key_points_class_detector (): key points detector class, e.g. NpPointsCraftOnnx
+            class_detector (): number plate options detector class, e.g. OptionsDetectorOnnx
+            ocr_class_detector (): text detector class, e.g. TextDetectorOnnx
+            ocr_lazy_load (): load OCR models on first use instead of all presets
+            ocr_preload (): OCR presets or regions loaded at once and never unloaded
+            ocr_memory_budget_mb (): unload least recently used OCR models above this size
 
         """
         self.default_label = default_label
@@ -69,7 +84,8 @@ class NumberPlateDetectionAndReading(Pipeline, CompositePipeline):
             "number_plate_key_points_detection",
             image_loader=None,
             mtl_model_path=mtl_model_path,
-            refiner_model_path=refiner_model_path)
+            refiner_model_path=refiner_model_path,
+            detector=key_points_class_detector)
         self.number_plate_classification = None
         option_detector_width = 0
         option_detector_height = 0
@@ -78,18 +94,23 @@ class NumberPlateDetectionAndReading(Pipeline, CompositePipeline):
                 "number_plate_classification",
                 image_loader=None,
                 path_to_model=path_to_classification_model,
-                options=classification_options)
+                options=classification_options,
+                class_detector=class_detector)
             option_detector_width = self.number_plate_classification.detector.width
             option_detector_height = self.number_plate_classification.detector.height
         self.number_plate_text_reading = NumberPlateTextReading(
             "number_plate_text_reading",
             image_loader=None,
             presets=presets,
+            class_detector=ocr_class_detector,
             option_detector_width=option_detector_width,
             option_detector_height=option_detector_height,
             default_label=default_label,
             default_lines_count=default_lines_count,
             off_number_plate_classification=off_number_plate_classification,
+            ocr_lazy_load=ocr_lazy_load,
+            ocr_preload=ocr_preload,
+            ocr_memory_budget_mb=ocr_memory_budget_mb,
         )
         self.pipelines = [
             self.number_plate_localization,
@@ -108,8 +129,36 @@ class NumberPlateDetectionAndReading(Pipeline, CompositePipeline):
         images = [self.image_loader.load(item) for item in inputs]
         return images
 
+    def localize(self, images: Any, **forward_parameters: Dict):
+        """
+        Run only the number plate localization on already loaded images
+        """
+        images_bboxs, images = unzip(self.number_plate_localization(images, **forward_parameters))
+        return images_bboxs, images
+
+    def read_number_plates(self, images: Any, images_bboxs: Any, **forward_parameters: Dict):
+        """
+        Run key points detection, classification and text reading for given bboxs,
+        e.g. a subset of the localize() output selected by a tracker.
+        With return_acc=True the raw OCR logits of every zone are appended to each result
+        """
+        (region_ids, region_names,
+         count_lines, confidences, predicted,
+         zones, image_ids,
+         images_bboxs, images,
+         images_points, images_mline_boxes, preprocessed_np) = self.forward_key_points_np(images, images_bboxs,
+                                                                                        **forward_parameters)
+        return self.forward_recognition_np(region_ids, region_names,
+                                           count_lines, confidences,
+                                           zones, image_ids,
+                                           images_bboxs, images,
+                                           images_points, preprocessed_np, **forward_parameters)
+
     def forward_detection_np(self, inputs: Any, **forward_parameters: Dict):
-        images_bboxs, images = unzip(self.number_plate_localization(inputs, **forward_parameters))
+        images_bboxs, images = self.localize(inputs, **forward_parameters)
+        return self.forward_key_points_np(images, images_bboxs, **forward_parameters)
+
+    def forward_key_points_np(self, images: Any, images_bboxs: Any, **forward_parameters: Dict):
         images_points, images_mline_boxes = unzip(self.number_plate_key_points_detection(unzip([images, images_bboxs]),
                                                                                          **forward_parameters))
         zones, image_ids = crop_number_plate_zones_from_images(images, images_points)
@@ -137,12 +186,19 @@ class NumberPlateDetectionAndReading(Pipeline, CompositePipeline):
             self.number_plate_text_reading(unzip([zones,
                                                   region_names,
                                                   count_lines, preprocessed_np]), **forward_parameters))
+        texts, logits = [], []
         if len(number_plate_text_reading_res):
-            texts, _ = number_plate_text_reading_res
-        else:
-            texts = []
-        (region_ids, region_names, count_lines, confidences, texts, zones) = \
-            group_by_image_ids(image_ids, (region_ids, region_names, count_lines, confidences, texts, zones))
+            texts, _, *logits = number_plate_text_reading_res
+            logits = logits[0] if len(logits) else []
+        (region_ids, region_names, count_lines, confidences, texts, zones, logits) = \
+            group_by_image_ids(image_ids, (region_ids, region_names, count_lines, confidences, texts, zones, logits),
+                               count_images=len(images))
+        if forward_parameters.get("return_acc", False):
+            # raw [seq_len, letters_max] OCR logits of every zone as the last item
+            return unzip([images, images_bboxs,
+                          images_points, zones,
+                          region_ids, region_names,
+                          count_lines, confidences, texts, logits])
         return unzip([images, images_bboxs,
                       images_points, zones,
                       region_ids, region_names,
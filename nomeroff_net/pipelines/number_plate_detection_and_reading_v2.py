@@ -1,6 +1,7 @@
 from torch import no_grad
 from typing import Any, Dict, Optional, List, Union
 from nomeroff_net.tools import unzip
+from nomeroff_net.tools.model_registry import model_registry
 from nomeroff_net.image_loaders import BaseImageLoader
 from nomeroff_net.pipelines.base import Pipeline, empty_method
 from nomeroff_net.tools.image_processing import crop_number_plate_zones_from_images, group_by_image_ids
@@ -31,14 +32,11 @@ class NumberPlateDetectionAndReadingV2(Pipeline):
                  ocr_class_detector=TextDetector,
                  **kwargs):
         super().__init__(task, image_loader, **kwargs)
-        self.localization_detector = Detector()
-        self.localization_detector.load(path_to_model)
-
-        self.key_points_detector = NpPointsCraft()
-        self.key_points_detector.load(mtl_model_path, refiner_model_path)
-
-        self.option_detector = class_detector(options=classification_options)
-        self.option_detector.load(path_to_classification_model, options=classification_options)
+        self.localization_detector = model_registry.load(Detector, path_to_model)
+        self.key_points_detector = model_registry.load(NpPointsCraft, mtl_model_path, refiner_model_path)
+        self.option_detector = model_registry.load(class_detector, path_to_classification_model,
+                                                   init_kwargs={"options": classification_options},
+                                                   options=classification_options)
 
         if presets is None:
             presets = DEFAULT_PRESETS
@@ -52,7 +50,8 @@ class NumberPlateDetectionAndReadingV2(Pipeline):
         images = [self.image_loader.load(item) for item in inputs]
         return images
 
-    def sanitize_parameters(self, img_size=None, stride=None, min_accuracy=None, quality_profile=None, **kwargs):
+    def sanitize_parameters(self, img_size=None, stride=None, min_accuracy=None, quality_profile=None,
+                            craft_batch_mode=None, craft_batch_size=None, **kwargs):
         params = {}
         if img_size is not None:
             params["img_size"] = img_size
@@ -62,6 +61,10 @@ class NumberPlateDetectionAndReadingV2(Pipeline):
             params["min_accuracy"] = min_accuracy
         if quality_profile is not None:
             params["quality_profile"] = quality_profile
+        if craft_batch_mode is not None:
+            params["craft_batch_mode"] = craft_batch_mode
+        if craft_batch_size is not None:
+            params["craft_batch_size"] = craft_batch_size
         return {}, params, {}
 
     def forward_detection_np(self, images: Any, **forward_parameters: Dict):
@@ -4,6 +4,7 @@ from nomeroff_net.image_loaders import BaseImageLoader
 from nomeroff_net.pipelines.base import Pipeline
 from nomeroff_net.pipes.number_plate_keypoints_detectors.bbox_np_points import NpPointsCraft
 from nomeroff_net.tools import unzip
+from nomeroff_net.tools.model_registry import model_registry
 
 
 class NumberPlateKeyPointsDetection(Pipeline):
@@ -16,15 +17,21 @@ class NumberPlateKeyPointsDetection(Pipeline):
                  image_loader: Optional[Union[str, BaseImageLoader]],
                  mtl_model_path: str = "latest",
                  refiner_model_path: str = "latest",
+                 detector=None,
                  **kwargs):
         super().__init__(task, image_loader, **kwargs)
-        self.detector = NpPointsCraft()
-        self.detector.load(mtl_model_path, refiner_model_path)
+        if detector is None:
+            detector = NpPointsCraft
+        self.detector = model_registry.load(detector, mtl_model_path, refiner_model_path)
 
-    def sanitize_parameters(self, quality_profile=None, **kwargs):
+    def sanitize_parameters(self, quality_profile=None, craft_batch_mode=None, craft_batch_size=None, **kwargs):
         forward_parameters = {}
         if quality_profile is not None:
             forward_parameters["quality_profile"] = quality_profile
+        if craft_batch_mode is not None:
+            forward_parameters["craft_batch_mode"] = craft_batch_mode
+        if craft_batch_size is not None:
+            forward_parameters["craft_batch_size"] = craft_batch_size
         return {}, forward_parameters, {}
 
     def __call__(self, images: Any, **kwargs):
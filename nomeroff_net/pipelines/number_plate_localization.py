@@ -3,6 +3,7 @@ from typing import Any, Dict, Optional, Union
 from nomeroff_net.image_loaders import BaseImageLoader
 from nomeroff_net.pipelines.base import Pipeline
 from nomeroff_net.tools import unzip
+from nomeroff_net.tools.model_registry import model_registry
 #from nomeroff_net.pipes.number_plate_localizators.yolo_v5_detector import Detector
 from nomeroff_net.pipes.number_plate_localizators.yolo_v8_detector import Detector
 
@@ -21,8 +22,7 @@ class NumberPlateLocalization(Pipeline):
         super().__init__(task, image_loader, **kwargs)
         if detector is None:
             detector = Detector
-        self.detector = detector()
-        self.detector.load(path_to_model)
+        self.detector = model_registry.load(detector, path_to_model)
 
     def sanitize_parameters(self, img_size=None, stride=None, min_accuracy=None, **kwargs):
         parameters = {}
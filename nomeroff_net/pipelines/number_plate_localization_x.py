@@ -3,6 +3,7 @@ from typing import Any, Dict, Optional, Union
 from nomeroff_net.image_loaders import BaseImageLoader
 from nomeroff_net.pipelines.base import Pipeline
 from nomeroff_net.tools import unzip
+from nomeroff_net.tools.model_registry import model_registry
 from nomeroff_net.pipes.number_plate_localizators.yolox_detector import Detector
 
 
@@ -17,8 +18,7 @@ class NumberPlateLocalizationX(Pipeline):
                  path_to_model="latest",
                  **kwargs):
         super().__init__(task, image_loader, **kwargs)
-        self.detector = Detector()
-        self.detector.load(path_to_model)
+        self.detector = model_registry.load(Detector, path_to_model)
 
     def sanitize_parameters(self, img_size=None, stride=None, min_accuracy=None, **kwargs):
         parameters = {}
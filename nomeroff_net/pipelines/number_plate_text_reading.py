@@ -1,5 +1,5 @@
 from torch import no_grad
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, List, Optional, Union
 from nomeroff_net.image_loaders import BaseImageLoader
 from nomeroff_net.pipelines.base import Pipeline
 from nomeroff_net.tools import unzip
@@ -72,17 +72,31 @@ class NumberPlateTextReading(Pipeline):
                  option_detector_width=0,
                  option_detector_height=0,
                  off_number_plate_classification=True,
+                 ocr_lazy_load: bool = False,
+                 ocr_preload: List[str] = None,
+                 ocr_memory_budget_mb: float = None,
                  **kwargs):
+        """
+        ocr_lazy_load loads the OCR model of a preset when the first zone of its regions arrives,
+        ocr_preload presets or regions are loaded at once and kept, the least recently used of the others
+        are unloaded when the loaded models exceed ocr_memory_budget_mb
+        """
         if presets is None:
             presets = DEFAULT_PRESETS
         super().__init__(task, image_loader, **kwargs)
         self.detector = class_detector(presets, default_label, default_lines_count,
                                        option_detector_width=option_detector_width,
                                        option_detector_height=option_detector_height,
-                                       off_number_plate_classification=off_number_plate_classification)
+                                       off_number_plate_classification=off_number_plate_classification,
+                                       lazy_load=ocr_lazy_load,
+                                       preload=ocr_preload,
+                                       memory_budget_mb=ocr_memory_budget_mb)
 
-    def sanitize_parameters(self, **kwargs):
-        return {}, {}, {}
+    def sanitize_parameters(self, return_acc=None, **kwargs):
+        forward_parameters = {}
+        if return_acc is not None:
+            forward_parameters["return_acc"] = return_acc
+        return {}, forward_parameters, {}
 
     def __call__(self, images: Any, **kwargs):
         return super().__call__(images, **kwargs)
@@ -93,14 +107,17 @@ class NumberPlateTextReading(Pipeline):
         return unzip([images, labels, lines, preprocessed_np])
 
     @no_grad()
-    def forward(self, inputs: Any, **forward_parameters: Dict) -> Any:
+    def forward(self, inputs: Any, return_acc: bool = False, **forward_parameters: Dict) -> Any:
         images, labels, lines, preprocessed_np = unzip(inputs)
         preprocessed_np = [zone if pnp is None else pnp for pnp, zone in zip(preprocessed_np, images)]
         model_inputs = self.detector.preprocess(preprocessed_np, labels, lines)
         model_outputs = self.detector.forward(model_inputs)
+        if return_acc:
+            model_outputs, logits = self.detector.postprocess(model_outputs, return_acc=return_acc)
+            return unzip([images, model_outputs, labels, logits])
         model_outputs = self.detector.postprocess(model_outputs)
         return unzip([images, model_outputs, labels])
 
     def postprocess(self, inputs: Any, **postprocess_parameters: Dict) -> Any:
-        images, model_outputs, labels = unzip(inputs)
-        return unzip([model_outputs, images])
+        images, model_outputs, labels, *logits = unzip(inputs)
+        return unzip([model_outputs, images, *logits])
@@ -14,6 +14,7 @@ from nomeroff_net.tools.mcm import (modelhub, get_device_torch)
 from nomeroff_net.data_modules.numberplate_options_data_module import OptionsNetDataModule
 from nomeroff_net.nnmodels.numberplate_options_model import NPOptionsNet
 from nomeroff_net.tools.image_processing import normalize_img, convert_cv_zones_rgb_to_bgr
+from nomeroff_net.tools.quantization import is_quantized_checkpoint, load_quantized_model
 
 device_torch = get_device_torch()
 
@@ -91,6 +92,7 @@ class OptionsDetector(object):
         # model
         self.model = None
         self.trainer = None
+        self.device = device_torch
 
         # data module
         self.dm = None
@@ -257,6 +259,9 @@ class OptionsDetector(object):
         return True
 
     def load_model(self, path_to_model):
+        if is_quantized_checkpoint(path_to_model):
+            return self.load_quantized(path_to_model)
+
         # Load the checkpoint
         checkpoint = torch.load(path_to_model, map_location=torch.device('cpu'))
 
@@ -282,6 +287,18 @@ class OptionsDetector(object):
         self.model.eval()
         return self.model
 
+    def load_quantized(self, path_to_model: str):
+        """
+        int8 model made by examples/py/model_convertors/quantize_ocr_and_options_models.py, runs on CPU only
+        """
+        self.model, meta = load_quantized_model(path_to_model)
+        self.class_region = meta.get("class_region", self.class_region)
+        self.count_lines = meta.get("count_lines", self.count_lines)
+        self.height = meta.get("height", self.height)
+        self.width = meta.get("width", self.width)
+        self.device = torch.device("cpu")
+        return self.model
+
     def get_region_label(self, index: int) -> str:
         """
         TODO: describe method
@@ -399,6 +416,8 @@ class OptionsDetector(object):
         TODO: describe method
         """
         path_to_model = self.load_meta(path_to_model, options)
+        if is_quantized_checkpoint(path_to_model):
+            return self.load_quantized(path_to_model)
         self.create_model()
         return self.load_model(path_to_model)
 
@@ -413,7 +432,7 @@ class OptionsDetector(object):
 
     def _predict(self, xs):
         x = torch.tensor(np.moveaxis(np.array(xs), 3, 1))
-        x = x.to(device_torch)
+        x = x.to(self.device)
         predicted = [p.cpu().numpy() for p in self.model(x)]
         return predicted
 
@@ -437,7 +456,7 @@ class OptionsDetector(object):
 
     def forward(self, inputs):
         x = torch.tensor(inputs)
-        x = x.to(device_torch)
+        x = x.to(self.device)
         model_output = self.model(x)
         return model_output
 
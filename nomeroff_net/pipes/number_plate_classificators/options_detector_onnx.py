@@ -0,0 +1,60 @@
+"""
+Numberplate options (region, count lines) classification on ONNX Runtime, for CPU-only hosts.
+Export the model with examples/py/model_convertors/convert_numberplate_options_to_onnx.py
+
+Examples:
+    >>> from nomeroff_net import pipeline
+    >>> from nomeroff_net.pipes.number_plate_classificators.options_detector_onnx import OptionsDetectorOnnx
+    >>> number_plate_detection_and_reading = pipeline("number_plate_detection_and_reading",
+    ...                                               image_loader="opencv",
+    ...                                               class_detector=OptionsDetectorOnnx)
+"""
+import numpy as np
+from typing import List, Dict
+
+from nomeroff_net.pipes.number_plate_classificators.options_detector import OptionsDetector
+from nomeroff_net.tools.ort_tools import make_ort_session, resolve_onnx_path, get_ort_metadata
+
+
+class OptionsDetectorOnnx(OptionsDetector):
+    """
+    Drop-in replacement of OptionsDetector running an exported ONNX model
+    """
+    def __init__(self, options: Dict = None,
+                 intra_op_num_threads: int = None, inter_op_num_threads: int = None) -> None:
+        OptionsDetector.__init__(self, options)
+        self.intra_op_num_threads = intra_op_num_threads
+        self.inter_op_num_threads = inter_op_num_threads
+        self.session = None
+        self.input_name = None
+
+    def is_loaded(self) -> bool:
+        return self.session is not None
+
+    def load_model(self, path_to_model):
+        self.session = make_ort_session(path_to_model,
+                                        intra_op_num_threads=self.intra_op_num_threads,
+                                        inter_op_num_threads=self.inter_op_num_threads)
+        self.input_name = self.session.get_inputs()[0].name
+        # class_region, count_lines, height and width saved by the converter
+        self.__dict__.update(get_ort_metadata(self.session))
+        return self.session
+
+    def load(self, path_to_model: str = "latest", options: Dict = None):
+        """
+        path_to_model is an exported .onnx file, "latest" the converter's default location.
+        options override the class_region and count_lines saved with the model
+        """
+        session = self.load_model(resolve_onnx_path(path_to_model, "numberplate_options"))
+        if options is not None:
+            self.__dict__.update(options)
+        return session
+
+    def run_session(self, x: np.ndarray) -> List[np.ndarray]:
+        return self.session.run(None, {self.input_name: np.ascontiguousarray(x, dtype=np.float32)})
+
+    def _predict(self, xs):
+        return self.run_session(np.moveaxis(np.array(xs), 3, 1))
+
+    def forward(self, inputs):
+        return self.run_session(inputs)
@@ -3,22 +3,19 @@ import cv2
 import torch
 import numpy as np
 import torch.backends.cudnn as cudnn
-from torch.autograd import Variable
 from typing import List, Dict, Tuple, Any
 
 from nomeroff_net.tools.mcm import (modelhub, get_mode_torch)
 from nomeroff_net.tools.image_processing import (distance,
-                                                 get_cv_zone_rgb,
                                                  crop_image,
-                                                 minimum_bounding_rectangle,
-                                                 reshape_points)
+                                                 minimum_bounding_rectangle)
 
 from .bbox_np_points_tools import (
     copy_state_dict,
     add_coordinates_offset,
-    make_rect_variants,
+    make_rect_variants_array,
+    make_perspective_images,
     detect_best_perspective,
-    normalize_perspective_images,
     get_det_boxes,
     addopt_rect_to_bbox,
     split_boxes,
@@ -32,6 +29,8 @@ from craft_text_detector import craft_utils
 from craft_text_detector.models.craftnet import CraftNet
 from craft_text_detector.models.refinenet import RefineNet
 
+CRAFT_BATCH_MODES = ("pad", "bucket", "single")
+
 
 class NpPointsCraft(object):
     """
@@ -127,12 +126,11 @@ class NpPointsCraft(object):
         return boxes, ret_score_text
 
     @torch.no_grad()
-    def forward(self, x: np.ndarray) -> Tuple[Any, Any]:
+    def run_net(self, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         """
-        TODO: describe function
+        CraftNet + RefineNet on a [b, c, h, w] batch, returns the [b, h/2, w/2] score and link maps
         """
-        x = torch.from_numpy(x).permute(2, 0, 1)  # [h, w, c] to [c, h, w]
-        x = Variable(x.unsqueeze(0))  # [c, h, w] to [b, c, h, w]
+        x = torch.from_numpy(x)
         if self.is_cuda:
             x = x.cuda()
 
@@ -140,11 +138,45 @@ class NpPointsCraft(object):
         y_refiner = self.refine_net(y, feature)
 
         # make score and link map
-        score_text = y[0, :, :, 0].cpu().data.numpy()
-        score_link = y_refiner[0, :, :, 0].cpu().data.numpy()
-
+        score_text = y[:, :, :, 0].cpu().data.numpy()
+        score_link = y_refiner[:, :, :, 0].cpu().data.numpy()
         return score_text, score_link
 
+    def forward(self, x: np.ndarray) -> Tuple[Any, Any]:
+        """
+        TODO: describe function
+        """
+        score_text, score_link = self.run_net(x.transpose(2, 0, 1)[np.newaxis])  # [h, w, c] to [b, c, h, w]
+        return score_text[0], score_link[0]
+
+    @staticmethod
+    def pad_batch(images: List[np.ndarray]) -> Tuple[np.ndarray, List[Tuple[int, int]]]:
+        """
+        Stack crops from preprocessing_craft into one [b, h, w, c] array padded at the bottom and right
+        to the largest height and width. The fill is a black pixel after normalizeMeanVariance, the same
+        value resize_aspect_ratio pads every crop with up to a multiple of 32.
+        """
+        shapes = [image.shape[:2] for image in images]
+        height = max(h for h, _ in shapes)
+        width = max(w for _, w in shapes)
+        fill = image_utils.normalizeMeanVariance(np.zeros((1, 1, 3), dtype=np.float32))[0, 0]
+        batch = np.empty((len(images), height, width, images[0].shape[2]), dtype=np.float32)
+        batch[:] = fill
+        for i, (image, (h, w)) in enumerate(zip(images, shapes)):
+            batch[i, :h, :w] = image
+        return batch, shapes
+
+    def forward_padded(self, images: List[np.ndarray]) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        One CraftNet + RefineNet forward for several crops, score and link maps are cut back to each crop
+        """
+        batch, shapes = self.pad_batch(images)
+        score_text, score_link = self.run_net(batch.transpose(0, 3, 1, 2))  # [b, h, w, c] to [b, c, h, w]
+
+        # CRAFT maps are half the input resolution, input sides are multiples of 32
+        return [(score_text[i, :h // 2, :w // 2], score_link[i, :h // 2, :w // 2])
+                for i, (h, w) in enumerate(shapes)]
+
     def detect(self,
                inputs,
                canvas_size: int = 300,
@@ -152,15 +184,45 @@ class NpPointsCraft(object):
                quality_profile: List = None,
                text_threshold: float = 0.6,
                link_threshold: float = 0.7,
-               low_text: float = 0.4
+               low_text: float = 0.4,
+               craft_batch_mode: str = "pad",
+               craft_batch_size: int = 32,
                ):
         preprocessed_data = self.preprocess(inputs, canvas_size, mag_ratio)
-        model_outputs = self.forward_batch(preprocessed_data)
+        model_outputs = self.forward_batch(preprocessed_data,
+                                           craft_batch_mode=craft_batch_mode,
+                                           craft_batch_size=craft_batch_size)
         return self.postprocess(model_outputs, quality_profile, text_threshold, link_threshold, low_text)
 
     @torch.no_grad()
-    def forward_batch(self, inputs: Any, **_) -> Any:
-        return [[*self.forward(x[0]), *x[1:]] for x in inputs]
+    def forward_batch(self, inputs: Any,
+                      craft_batch_mode: str = "pad",
+                      craft_batch_size: int = 32,
+                      **_) -> Any:
+        """
+        craft_batch_mode:
+            "pad" - up to craft_batch_size crops per forward, padded to the largest crop of the batch
+            "bucket" - only crops of the same padded size share a forward, maps match "single" exactly
+            "single" - one forward per crop
+        """
+        if craft_batch_mode not in CRAFT_BATCH_MODES:
+            raise ValueError(f"craft_batch_mode must be one of {CRAFT_BATCH_MODES}, got {craft_batch_mode}")
+        if craft_batch_mode == "single":
+            return [[*self.forward(x[0]), *x[1:]] for x in inputs]
+
+        groups = {}
+        for i, x in enumerate(inputs):
+            key = x[0].shape[:2] if craft_batch_mode == "bucket" else None
+            groups.setdefault(key, []).append(i)
+
+        outputs = [None] * len(inputs)
+        for indexes in groups.values():
+            for start in range(0, len(indexes), craft_batch_size):
+                chunk = indexes[start:start + craft_batch_size]
+                maps = self.forward_padded([inputs[i][0] for i in chunk])
+                for i, (score_text, score_link) in zip(chunk, maps):
+                    outputs[i] = [score_text, score_link, *inputs[i][1:]]
+        return outputs
 
     def preprocess(self, inputs: Any, canvas_size: int = 300, mag_ratio: float = 1.0, **_) -> Any:
         res = []
@@ -222,15 +284,13 @@ class NpPointsCraft(object):
             all_mline_boxes.append(mline_boxes)
             propably_points = add_coordinates_offset(local_propably_points, x0, y0)
             if len(propably_points):
-                target_points_variants = make_rect_variants(propably_points, quality_profile)
+                target_points_variants = make_rect_variants_array(propably_points, quality_profile)
                 if len(target_points_variants):
-                    target_points_variants = make_rect_variants(propably_points, quality_profile)
                     if len(target_points_variants) > 1:
-                        img_parts = [get_cv_zone_rgb(image, reshape_points(rect, 1)) for rect in target_points_variants]
-                        idx = detect_best_perspective(normalize_perspective_images(img_parts))
-                        points = target_points_variants[idx]
+                        idx = detect_best_perspective(make_perspective_images(image, target_points_variants))
+                        points = target_points_variants[idx].tolist()
                     else:
-                        points = target_points_variants[0]
+                        points = target_points_variants[0].tolist()
                     if in_zone_only:
                         for i in range(len(points)):
                             points[i][0] = x0 if points[i][0] < x0 else points[i][0]
@@ -0,0 +1,52 @@
+"""
+CRAFT key points detection on ONNX Runtime, for CPU-only hosts.
+Export CraftNet and RefineNet as one model with examples/py/model_convertors/convert_craft_to_onnx.py
+
+Examples:
+    >>> from nomeroff_net import pipeline
+    >>> from nomeroff_net.pipes.number_plate_keypoints_detectors.bbox_np_points_onnx import NpPointsCraftOnnx
+    >>> number_plate_detection_and_reading = pipeline("number_plate_detection_and_reading",
+    ...                                               image_loader="opencv",
+    ...                                               key_points_class_detector=NpPointsCraftOnnx)
+"""
+import numpy as np
+from typing import Tuple
+from nomeroff_net.tools.ort_tools import make_ort_session, resolve_onnx_path
+from .bbox_np_points import NpPointsCraft
+
+
+class NpPointsCraftOnnx(NpPointsCraft):
+    """
+    Drop-in replacement of NpPointsCraft running the exported CraftNet + RefineNet model
+    """
+
+    def __init__(self, intra_op_num_threads: int = None, inter_op_num_threads: int = None):
+        NpPointsCraft.__init__(self)
+        self.intra_op_num_threads = intra_op_num_threads
+        self.inter_op_num_threads = inter_op_num_threads
+        self.session = None
+        self.input_name = None
+
+    def load(self,
+             mtl_model_path: str = "latest",
+             refiner_model_path: str = "latest") -> None:
+        """
+        mtl_model_path is the exported model holding both networks, refiner_model_path is unused
+        """
+        self.load_model(trained_model=resolve_onnx_path(mtl_model_path, "craft"))
+
+    def load_model(self,
+                   device: str = "cpu",
+                   is_refine: bool = True,
+                   trained_model: str = None,
+                   refiner_model: str = None) -> None:
+        self.session = make_ort_session(trained_model,
+                                        intra_op_num_threads=self.intra_op_num_threads,
+                                        inter_op_num_threads=self.inter_op_num_threads)
+        self.input_name = self.session.get_inputs()[0].name
+        self.is_poly = True
+
+    def run_net(self, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        score_text, score_link = self.session.run(None, {self.input_name: np.ascontiguousarray(x,
+                                                                                             dtype=np.float32)})
+        return score_text, score_link
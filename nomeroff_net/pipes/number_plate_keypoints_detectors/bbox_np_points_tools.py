@@ -1,7 +1,6 @@
 import cv2
 import math
 import numpy as np
-import collections
 from typing import List, Dict, Tuple, Union, Any
 from collections import OrderedDict
 
@@ -13,7 +12,8 @@ from nomeroff_net.tools.image_processing import (fline,
                                                  fix_clockwise2,
                                                  find_min_x_idx,
                                                  detect_intersection,
-                                                 reshape_points)
+                                                 reshape_points,
+                                                 build_perspective)
 
 try:
     from .cpp_bindings.cpp_bindings import find_char_boxes, find_word_boxes
@@ -37,6 +37,123 @@ def copy_state_dict(state_dict: Dict) -> OrderedDict:
     return new_state_dict
 
 
+def _make_det_box(np_contours: np.ndarray) -> np.ndarray:
+    """
+    Rotated box around the (x, y) points of one component, clock-wise from the top-left corner
+    """
+    rectangle = cv2.minAreaRect(np_contours)
+    box = cv2.boxPoints(rectangle)
+
+    # align diamond-shape
+    w, h = np.linalg.norm(box[0] - box[1]), np.linalg.norm(box[1] - box[2])
+    box_ratio = max(w, h) / (min(w, h) + 1e-5)
+    if abs(1 - box_ratio) <= 0.1:
+        l, r = np_contours[:, 0].min(), np_contours[:, 0].max()
+        t, b = np_contours[:, 1].min(), np_contours[:, 1].max()
+        box = np.array([[l, t], [r, t], [r, b], [l, b]], dtype=np.float32)
+
+    # make clock-wise order
+    startidx = box.sum(axis=1).argmin()
+    box = np.roll(box, 4 - startidx, 0)
+    return np.array(box)
+
+
+def _dilation_window(stats: np.ndarray, k: int, img_w: int, img_h: int) -> Tuple[int, int, int, int, int]:
+    size = stats[k, cv2.CC_STAT_AREA]
+    x, y = stats[k, cv2.CC_STAT_LEFT], stats[k, cv2.CC_STAT_TOP]
+    w, h = stats[k, cv2.CC_STAT_WIDTH], stats[k, cv2.CC_STAT_HEIGHT]
+    niter = int(math.sqrt(size * min(w, h) / (w * h)) * 2)
+    sx, ex, sy, ey = x - niter, x + w + niter + 1, y - niter, y + h + niter + 1
+    # boundary check
+    if sx < 0:
+        sx = 0
+    if sy < 0:
+        sy = 0
+    if ex >= img_w:
+        ex = img_w
+    if ey >= img_h:
+        ey = img_h
+    return niter, sx, ex, sy, ey
+
+
+def label_maxima(values: np.ndarray, labels: np.ndarray, n_labels: int) -> np.ndarray:
+    """
+    Maximum of values per connected component label in one pass over the labelled pixels
+    """
+    maxima = np.full(n_labels, -np.inf, dtype=np.float64)
+    foreground = labels != 0
+    np.maximum.at(maxima, labels[foreground], values[foreground])
+    return maxima
+
+
+def _det_boxes_windowed(textmap, labels, n_labels, stats, text_score, link_score, text_threshold):
+    """
+    Every component is handled inside its dilation window, so the work is proportional to the
+    bounding box areas instead of components x image size.
+    """
+    img_h, img_w = textmap.shape
+    maxima = label_maxima(textmap, labels, n_labels)
+    link_area = np.logical_and(link_score == 1, text_score == 0)
+
+    det = []
+    mapper = []
+    for k in range(1, n_labels):
+        # size filtering
+        if stats[k, cv2.CC_STAT_AREA] < 10:
+            continue
+
+        # thresholding
+        if maxima[k] < text_threshold:
+            continue
+
+        # make segmentation map, the component lies inside the window
+        niter, sx, ex, sy, ey = _dilation_window(stats, k, img_w, img_h)
+        segmap = np.zeros((ey - sy, ex - sx), dtype=np.uint8)
+        segmap[labels[sy:ey, sx:ex] == k] = 255
+        segmap[link_area[sy:ey, sx:ex]] = 0  # remove link area
+        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (1 + niter, 1 + niter))
+        segmap = cv2.dilate(segmap, kernel)
+
+        # make box
+        ys, xs = np.where(segmap != 0)
+        np_contours = np.stack([xs + sx, ys + sy], axis=1)
+        det.append(_make_det_box(np_contours))
+        mapper.append(k)
+    return det, mapper
+
+
+def _det_boxes_full_image(textmap, labels, n_labels, stats, text_score, link_score, text_threshold):
+    """
+    The original loop over full-image maps, kept as the reference for tests and benchmarks
+    """
+    img_h, img_w = textmap.shape
+    det = []
+    mapper = []
+    for k in range(1, n_labels):
+        # size filtering
+        size = stats[k, cv2.CC_STAT_AREA]
+        if size < 10:
+            continue
+
+        # thresholding
+        if np.max(textmap[labels == k]) < text_threshold:
+            continue
+
+        # make segmentation map
+        segmap = np.zeros(textmap.shape, dtype=np.uint8)
+        segmap[labels == k] = 255
+        segmap[np.logical_and(link_score == 1, text_score == 0)] = 0  # remove link area
+        niter, sx, ex, sy, ey = _dilation_window(stats, k, img_w, img_h)
+        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (1 + niter, 1 + niter))
+        segmap[sy:ey, sx:ex] = cv2.dilate(segmap[sy:ey, sx:ex], kernel)
+
+        # make box
+        np_contours = np.roll(np.array(np.where(segmap != 0)), 1, axis=0).transpose().reshape(-1, 2)
+        det.append(_make_det_box(np_contours))
+        mapper.append(k)
+    return det, mapper
+
+
 def get_det_boxes(textmap, linkmap, text_threshold, link_threshold, low_text, use_cpp_bindings=True):
     """
     get det boxes
@@ -44,7 +161,6 @@ def get_det_boxes(textmap, linkmap, text_threshold, link_threshold, low_text, us
     # prepare data
     linkmap = linkmap.copy()
     textmap = textmap.copy()
-    img_h, img_w = textmap.shape
 
     """ labeling method """
     ret, text_score = cv2.threshold(textmap, low_text, 1, 0)
@@ -58,58 +174,8 @@ def get_det_boxes(textmap, linkmap, text_threshold, link_threshold, low_text, us
         det, mapper = find_word_boxes(textmap, labels, n_labels, stats,
                                       text_threshold, fast_mode=True, rotated_box=True)
     else:
-        det = []
-        mapper = []
-        for k in range(1, n_labels):
-            # size filtering
-            size = stats[k, cv2.CC_STAT_AREA]
-            if size < 10:
-                continue
-
-            # thresholding
-            if np.max(textmap[labels == k]) < text_threshold:
-                continue
-
-            # make segmentation map
-            segmap = np.zeros(textmap.shape, dtype=np.uint8)
-            segmap[labels == k] = 255
-            segmap[np.logical_and(link_score == 1, text_score == 0)] = 0  # remove link area
-            x, y = stats[k, cv2.CC_STAT_LEFT], stats[k, cv2.CC_STAT_TOP]
-            w, h = stats[k, cv2.CC_STAT_WIDTH], stats[k, cv2.CC_STAT_HEIGHT]
-            niter = int(math.sqrt(size * min(w, h) / (w * h)) * 2)
-            sx, ex, sy, ey = x - niter, x + w + niter + 1, y - niter, y + h + niter + 1
-            # boundary check
-            if sx < 0:
-                sx = 0
-            if sy < 0:
-                sy = 0
-            if ex >= img_w:
-                ex = img_w
-            if ey >= img_h:
-                ey = img_h
-            kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (1 + niter, 1 + niter))
-            segmap[sy:ey, sx:ex] = cv2.dilate(segmap[sy:ey, sx:ex], kernel)
-
-            # make box
-            np_contours = np.roll(np.array(np.where(segmap != 0)), 1, axis=0).transpose().reshape(-1, 2)
-            rectangle = cv2.minAreaRect(np_contours)
-            box = cv2.boxPoints(rectangle)
-
-            # align diamond-shape
-            w, h = np.linalg.norm(box[0] - box[1]), np.linalg.norm(box[1] - box[2])
-            box_ratio = max(w, h) / (min(w, h) + 1e-5)
-            if abs(1 - box_ratio) <= 0.1:
-                l, r = min(np_contours[:, 0]), max(np_contours[:, 0])
-                t, b = min(np_contours[:, 1]), max(np_contours[:, 1])
-                box = np.array([[l, t], [r, t], [r, b], [l, b]], dtype=np.float32)
-
-            # make clock-wise order
-            startidx = box.sum(axis=1).argmin()
-            box = np.roll(box, 4 - startidx, 0)
-            box = np.array(box)
-
-            det.append(box)
-            mapper.append(k)
+        det, mapper = _det_boxes_windowed(textmap, labels, n_labels, stats,
+                                          text_score, link_score, text_threshold)
 
     return det
 
@@ -346,23 +412,24 @@ def prepare_image_text(img: np.ndarray) -> np.ndarray:
     return black_and_white_image
 
 
+def perspective_stats(bw_image: np.ndarray) -> Tuple[int, int, int, int]:
+    """
+    Smallest and largest column sum of a binarised zone and how many columns have each
+    """
+    s = np.sum(bw_image, axis=0)
+    min_stat, max_stat = s.min(), s.max()
+    return min_stat, int(np.count_nonzero(s == min_stat)), max_stat, int(np.count_nonzero(s == max_stat))
+
+
 def detect_best_perspective(bw_images: List[np.ndarray]) -> int:
     """
-    TODO: describe function
+    Index of the zone with the lowest minimum column sum, ties go to the most columns at the extremes
     """
-    res = []
     idx = 0
     diff = 1000000
     diff_cnt = 0
     for i, img in enumerate(bw_images):
-        s = np.sum(img, axis=0)
-        img_stat = collections.Counter(s)
-        img_stat_dict = OrderedDict(img_stat.most_common())
-        max_stat = max(img_stat_dict, key=int)
-        max_stat_count = img_stat_dict[max_stat]
-        min_stat = min(img_stat_dict, key=int)
-        min_stat_count = img_stat_dict[min_stat]
-        res.append({'max': max_stat, 'min': min_stat, 'maxCnt': max_stat_count, 'minCnt': min_stat_count})
+        min_stat, min_stat_count, max_stat, max_stat_count = perspective_stats(img)
 
         if min_stat < diff:
             idx = i
@@ -373,6 +440,18 @@ def detect_best_perspective(bw_images: List[np.ndarray]) -> int:
     return idx
 
 
+def make_perspective_images(image: np.ndarray, rects: np.ndarray, coef: float = 4.6) -> List[np.ndarray]:
+    """
+    Binarised zones of all (V, 4, 2) rect variants, as normalize_perspective_images over
+    get_cv_zone_rgb(image, reshape_points(rect, 1)) with the zone sizes computed for all variants at once
+    """
+    rects = np.roll(np.asarray(rects, dtype=np.float64), -1, axis=1)
+    sides = np.sqrt(((rects - np.roll(rects, -1, axis=1)) ** 2).sum(axis=2))
+    heights = (sides[:, 0] + sides[:, 2]) / 2
+    return [prepare_image_text(build_perspective(image, rect, int(h * coef), int(h)))
+            for rect, h in zip(rects, heights)]
+
+
 def add_point_offset(point: List, x: float, y: float) -> List:
     """
     TODO: describe function
@@ -392,9 +471,9 @@ def add_point_offsets(points: List, dx: float, dy: float) -> List:
     ]
 
 
-def make_rect_variants(propably_points: List, quality_profile: List = None) -> List:
+def _rect_variant_shifts(propably_points: List, quality_profile: List = None) -> Union[np.ndarray, None]:
     """
-    TODO: describe function
+    (V, 2) shifts of the left and right edges along the left side, None when the bottom side is vertical
     """
     if quality_profile is None:
         quality_profile = [3, 1, 0, 0]
@@ -408,14 +487,14 @@ def make_rect_variants(propably_points: List, quality_profile: List = None) -> L
     else:
         step_adaptive = False
 
-    distanses = find_distances(propably_points)
+    matrix_bottom = linear_line_matrix(propably_points[3], propably_points[0])
 
     point_centre_left = [propably_points[0][0] + (propably_points[1][0] - propably_points[0][0]) / 2,
                          propably_points[0][1] + (propably_points[1][1] - propably_points[0][1]) / 2]
 
-    if distanses[3]["matrix"][1] == 0:
-        return [propably_points]
-    point_bottom_left = [point_centre_left[0], get_y_by_matrix(distanses[3]["matrix"], point_centre_left[0])]
+    if matrix_bottom[1] == 0:
+        return None
+    point_bottom_left = [point_centre_left[0], get_y_by_matrix(matrix_bottom, point_centre_left[0])]
     dx = propably_points[0][0] - point_bottom_left[0]
     dy = propably_points[0][1] - point_bottom_left[1]
 
@@ -433,10 +512,37 @@ def make_rect_variants(propably_points: List, quality_profile: List = None) -> L
         steps_minus = steps_all + steps_minus * step
         steps_plus = steps_all + steps_plus * step
 
-    points_arr = []
-    for i in range(-steps_minus, steps + steps_plus + 1, step):
-        points_arr.append(add_point_offsets(propably_points, i * dx_step, i * dy_step))
-    return points_arr
+    i = np.arange(-steps_minus, steps + steps_plus + 1, step)[:, np.newaxis]
+    return i * np.array([dx_step, dy_step], dtype=np.float64)
+
+
+# Directions in which the corners of a rect variant move, see add_point_offsets
+RECT_VARIANT_SIGNS = np.array([-1, 1, 1, -1], dtype=np.float64)[np.newaxis, :, np.newaxis]
+
+
+def _shift_rect(propably_points: List, shifts: np.ndarray) -> np.ndarray:
+    points = np.asarray(propably_points, dtype=np.float64)
+    return points[np.newaxis] + RECT_VARIANT_SIGNS * shifts[:, np.newaxis, :]
+
+
+def make_rect_variants_array(propably_points: List, quality_profile: List = None) -> np.ndarray:
+    """
+    All rect variants of make_rect_variants as one (V, 4, 2) array
+    """
+    shifts = _rect_variant_shifts(propably_points, quality_profile)
+    if shifts is None:
+        return np.asarray(propably_points, dtype=np.float64)[np.newaxis]
+    return _shift_rect(propably_points, shifts)
+
+
+def make_rect_variants(propably_points: List, quality_profile: List = None) -> List:
+    """
+    TODO: describe function
+    """
+    shifts = _rect_variant_shifts(propably_points, quality_profile)
+    if shifts is None:
+        return [propably_points]
+    return _shift_rect(propably_points, shifts).tolist()
 
 
 def normalize_perspective_images(images: List or np.ndarray) -> List[np.ndarray]:
@@ -61,8 +61,10 @@ class Detector(YoloDetector):
         return model_output
 
     @torch.no_grad()
-    def predict(self, imgs: List[np.ndarray], min_accuracy: float = 0.4) -> np.ndarray:
+    def predict(self, imgs: List[np.ndarray], min_accuracy: float = 0.4) -> List:
+        """
+        [x1, y1, x2, y2, confidence, class] boxes of every image, a list since images hold different numbers of boxes
+        """
         model_outputs = self.model(imgs, conf=min_accuracy, verbose=False, save=False, save_txt=False, show=False,
                                    iou=0.7, agnostic_nms=True)
-        result = self.convert_model_outputs_to_array(model_outputs)
-        return np.array(result)
+        return self.convert_model_outputs_to_array(model_outputs)
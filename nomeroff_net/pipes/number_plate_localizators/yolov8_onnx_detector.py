@@ -0,0 +1,71 @@
+"""
+YOLOv8 numberplate localization on ONNX Runtime, for CPU-only hosts.
+Export the model with examples/py/model_convertors/convert_yolo_v8_to_onnx.py
+
+Examples:
+    >>> from nomeroff_net import pipeline
+    >>> from nomeroff_net.pipes.number_plate_localizators.yolov8_onnx_detector import DetectorOnnx
+    >>> number_plate_detection_and_reading = pipeline("number_plate_detection_and_reading",
+    ...                                               image_loader="opencv",
+    ...                                               number_plate_localization_detector=DetectorOnnx)
+"""
+import numpy as np
+from typing import List
+from nomeroff_net.pipes.number_plate_localizators.yolo_v8_detector import Detector as YoloDetector
+from nomeroff_net.tools.ort_tools import (make_ort_session,
+                                          resolve_onnx_path,
+                                          get_ort_metadata,
+                                          letterbox,
+                                          yolov8_postprocess)
+
+
+class DetectorOnnx(YoloDetector):
+    """
+    Drop-in replacement of the yolo_v8 Detector running an exported ONNX model
+    """
+
+    def __init__(self, numberplate_classes=None, yolo_model_type='yolov8',
+                 intra_op_num_threads: int = None, inter_op_num_threads: int = None) -> None:
+        super().__init__(numberplate_classes, yolo_model_type)
+        self.device = "cpu"
+        self.intra_op_num_threads = intra_op_num_threads
+        self.inter_op_num_threads = inter_op_num_threads
+        self.session = None
+        self.input_name = None
+        self.img_size = (640, 640)
+
+    def load_model(self, weights: str, device: str = '') -> None:
+        self.session = make_ort_session(weights,
+                                        intra_op_num_threads=self.intra_op_num_threads,
+                                        inter_op_num_threads=self.inter_op_num_threads)
+        self.input_name = self.session.get_inputs()[0].name
+        metadata = get_ort_metadata(self.session)
+        # ultralytics writes imgsz as "[640, 640]"
+        if isinstance(metadata.get("imgsz"), list):
+            self.img_size = tuple(metadata["imgsz"])
+        self.model = self.session
+
+    def load(self, path_to_model: str = "latest") -> None:
+        self.load_model(resolve_onnx_path(path_to_model, self.yolo_model_type))
+
+    def preprocess(self, imgs: List[np.ndarray]):
+        batch = np.empty((len(imgs), 3, *self.img_size), dtype=np.float32)
+        transforms = []
+        for i, img in enumerate(imgs):
+            img, gain, pad = letterbox(img, self.img_size)
+            # BGR HWC uint8 -> RGB CHW float, as ultralytics does for numpy inputs
+            batch[i] = img[:, :, ::-1].transpose(2, 0, 1) / 255.
+            transforms.append((gain, pad))
+        return batch, transforms
+
+    def predict(self, imgs: List[np.ndarray], min_accuracy: float = 0.4) -> List:
+        """
+        [x1, y1, x2, y2, confidence, class] boxes of every image, a list since images hold different numbers of boxes
+        """
+        if not len(imgs):
+            return []
+        batch, transforms = self.preprocess(imgs)
+        outputs = self.session.run(None, {self.input_name: batch})[0]
+        result = [yolov8_postprocess(output, gain, pad, img.shape[:2], min_accuracy=min_accuracy, iou=0.7)
+                  for output, (gain, pad), img in zip(outputs, transforms, imgs)]
+        return result
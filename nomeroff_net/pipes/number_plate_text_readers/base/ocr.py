@@ -22,6 +22,7 @@ from nomeroff_net.tools.image_processing import normalize_img
 from nomeroff_net.tools.errors import OCRError
 from nomeroff_net.tools.mcm import modelhub, get_device_torch
 from nomeroff_net.tools.augmentations import aug_seed
+from nomeroff_net.tools.quantization import is_quantized_checkpoint, load_quantized_model
 from nomeroff_net.tools.ocr_tools import (StrLabelConverter,
                                           decode_prediction,
                                           decode_batch)
@@ -61,6 +62,9 @@ class OCR(object):
 
         self.label_converter = None
         self.path_to_model = None
+        self.device = device_torch
+        # size in MB of models whose weights are not all torch parameters (quantised TorchScript)
+        self.size_mb = None
 
     def init_label_converter(self):
         self.label_converter = StrLabelConverter("".join(self.letters), self.max_text_len)
@@ -153,6 +157,7 @@ class OCR(object):
         """
         TODO: describe method
         """
+        self.size_mb = None
         self.model = NPOcrNet(self.letters,
                               linear_size=self.linear_size,
                               hidden_size=self.hidden_size,
@@ -245,31 +250,47 @@ class OCR(object):
         else:
             xs = np.array(imgs)
         xs = torch.tensor(xs)
-        xs = xs.to(device_torch)
+        xs = xs.to(self.device)
         return xs
 
     def forward(self, xs):
         return self.model(xs)
 
-    def postprocess(self, net_out_value):
-        net_out_value = [p.cpu().numpy() for p in net_out_value]
-        pred_texts = decode_batch(torch.Tensor(net_out_value), self.label_converter)
-        pred_texts = [pred_text.upper() for pred_text in pred_texts]
+    def decode(self, net_out_value, return_confidences: bool = False):
+        """
+        Upper-cased texts of a [seq_len, batch_size, letters_max] model output, with
+        return_confidences also the per-character and per-plate confidences
+        """
+        if return_confidences:
+            pred_texts, char_confidences, plate_confidences = decode_batch(net_out_value, self.label_converter,
+                                                                           return_confidences=True)
+            return [pred_text.upper() for pred_text in pred_texts], char_confidences, plate_confidences
+        pred_texts = decode_batch(net_out_value, self.label_converter)
+        return [pred_text.upper() for pred_text in pred_texts]
+
+    def postprocess(self, net_out_value, return_acc: bool = False):
+        pred_texts = self.decode(net_out_value)
+        if return_acc:
+            return pred_texts, self.batch_first(net_out_value)
         return pred_texts
 
+    @staticmethod
+    def batch_first(net_out_value: List or torch.Tensor) -> np.ndarray:
+        """
+        [seq_len, batch_size, letters_max] model output -> [batch_size, seq_len, letters_max] raw logits
+        """
+        if isinstance(net_out_value, torch.Tensor):
+            return net_out_value.detach().permute(1, 0, 2).cpu().numpy()
+        if not len(net_out_value):
+            return net_out_value
+        return np.transpose(np.array(net_out_value), (1, 0, 2))
+
     @torch.no_grad()
     def predict(self, xs: List or torch.Tensor, return_acc: bool = False) -> Any:
         net_out_value = self.model(xs)
-        net_out_value = [p.cpu().numpy() for p in net_out_value]
-        pred_texts = decode_batch(torch.Tensor(net_out_value), self.label_converter)
-        pred_texts = [pred_text.upper() for pred_text in pred_texts]
+        pred_texts = self.decode(net_out_value)
         if return_acc:
-            if len(net_out_value):
-                net_out_value = np.array(net_out_value)
-                net_out_value = net_out_value.reshape((net_out_value.shape[1],
-                                                       net_out_value.shape[0],
-                                                       net_out_value.shape[2]))
-            return pred_texts, net_out_value
+            return pred_texts, self.batch_first(net_out_value)
         return pred_texts
 
     def save(self, path: str, verbose: bool = True, weights_only=True) -> None:
@@ -295,6 +316,9 @@ class OCR(object):
 
     def load_model(self, path_to_model, nn_class=NPOcrNet):
         self.path_to_model = path_to_model
+        if is_quantized_checkpoint(path_to_model):
+            return self.load_quantized(path_to_model)
+        self.size_mb = None
         self.model = nn_class.load_from_checkpoint(path_to_model,
                                                    map_location=torch.device('cpu'),
                                                    letters=self.letters,
@@ -312,6 +336,22 @@ class OCR(object):
         self.model.eval()
         return self.model
 
+    def load_quantized(self, path_to_model: str):
+        """
+        int8 model made by examples/py/model_convertors/quantize_ocr_and_options_models.py, runs on CPU only
+        """
+        self.path_to_model = path_to_model
+        self.model, meta = load_quantized_model(path_to_model)
+        self.size_mb = meta["file_size_mb"]
+        self.letters = meta.get("letters", self.letters)
+        self.max_text_len = meta.get("max_text_len", self.max_text_len)
+        self.height = meta.get("height", self.height)
+        self.width = meta.get("width", self.width)
+        self.color_channels = meta.get("color_channels", self.color_channels)
+        self.init_label_converter()
+        self.device = torch.device("cpu")
+        return self.model
+
     def load_meta(self, path_to_model: str = "latest") -> str:
         model_info = {}
         if path_to_model == "latest":
@@ -343,6 +383,8 @@ class OCR(object):
         TODO: describe method
         """
         path_to_model = self.load_meta(path_to_model)
+        if is_quantized_checkpoint(path_to_model):
+            return self.load_quantized(path_to_model)
         self.create_model()
         return self.load_model(path_to_model, nn_class=nn_class)
 
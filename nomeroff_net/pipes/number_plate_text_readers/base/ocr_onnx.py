@@ -0,0 +1,63 @@
+"""
+OCR on ONNX Runtime, for CPU-only hosts.
+Export the models with examples/py/model_convertors/convert_ocr_to_onnx.py
+"""
+import numpy as np
+from typing import List, Any
+
+from nomeroff_net.tools.image_processing import normalize_img
+from nomeroff_net.tools.ort_tools import make_ort_session, resolve_onnx_path, get_ort_metadata
+from .ocr import OCR
+
+
+class OcrOnnx(OCR):
+    def __init__(self, intra_op_num_threads: int = None, inter_op_num_threads: int = None, **kwargs) -> None:
+        OCR.__init__(self, **kwargs)
+        self.intra_op_num_threads = intra_op_num_threads
+        self.inter_op_num_threads = inter_op_num_threads
+        self.session = None
+        self.input_name = None
+
+    def is_loaded(self) -> bool:
+        return self.session is not None
+
+    def load_model(self, path_to_model, **_):
+        self.path_to_model = path_to_model
+        self.session = make_ort_session(path_to_model,
+                                        intra_op_num_threads=self.intra_op_num_threads,
+                                        inter_op_num_threads=self.inter_op_num_threads)
+        self.input_name = self.session.get_inputs()[0].name
+        # letters, max_text_len, height, width and color_channels saved by the converter
+        self.__dict__.update(get_ort_metadata(self.session))
+        return self.session
+
+    def load(self, path_to_model: str = "latest", **_):
+        """
+        path_to_model is an exported .onnx file, "latest" the converter's default location for model_name
+        """
+        return self.load_model(resolve_onnx_path(path_to_model, f"ocr-{self.model_name}"))
+
+    def preprocess(self, imgs, need_preprocess=True):
+        if not need_preprocess:
+            return np.array(imgs, dtype=np.float32)
+        xs = np.zeros((len(imgs), self.color_channels, self.height, self.width), dtype=np.float32)
+        for i, img in enumerate(imgs):
+            x = normalize_img(img,
+                              width=self.width,
+                              height=self.height)
+            xs[i] = np.moveaxis(x, 2, 0)
+        return xs
+
+    def forward(self, xs):
+        if not len(xs):
+            return []
+        return self.session.run(None, {self.input_name: np.ascontiguousarray(xs, dtype=np.float32)})[0]
+
+    def predict(self, xs: List, return_acc: bool = False) -> Any:
+        net_out_value = self.forward(xs)
+        if not len(net_out_value):
+            return ([], []) if return_acc else []
+        pred_texts = self.decode(net_out_value)
+        if return_acc:
+            return pred_texts, self.batch_first(net_out_value)
+        return pred_texts
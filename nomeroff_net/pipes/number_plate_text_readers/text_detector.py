@@ -1,16 +1,27 @@
 import cv2
-import numpy as np
-import warnings
+import time
 import copy
+import logging
+import warnings
+import threading
+import numpy as np
+from collections import OrderedDict
 from typing import List, Dict, Tuple
 from torch import no_grad
 from .base.ocr import OCR
 from nomeroff_net.tools.mcm import modelhub
+from nomeroff_net.tools.model_registry import model_registry
 from nomeroff_net.tools.errors import TextDetectorError
 from nomeroff_net.tools.image_processing import convert_cv_zones_rgb_to_bgr
 
+logger = logging.getLogger(__name__)
+
 
 class TextDetector(object):
+    # OCR model class of every preset and extra keyword arguments it is created with
+    ocr_class = OCR
+    ocr_options = {}
+
     @classmethod
     def get_classname(cls: object) -> str:
         return cls.__name__
@@ -22,7 +33,15 @@ class TextDetector(object):
                  load_models=True,
                  option_detector_width=0,
                  option_detector_height=0,
-                 off_number_plate_classification=True) -> None:
+                 off_number_plate_classification=True,
+                 lazy_load: bool = False,
+                 preload: List[str] = None,
+                 memory_budget_mb: float = None) -> None:
+        """
+        lazy_load: create an OCR model the first time a zone is routed to it instead of loading every preset
+        preload: preset names or region labels loaded up front and never evicted
+        memory_budget_mb: when the loaded models' weights exceed it, the least recently used are unloaded
+        """
         if presets is None:
             presets = {}
         self.presets = presets
@@ -49,25 +68,143 @@ class TextDetector(object):
             self.detectors_names.append(_label)
             i += 1
 
+        self.lazy_load = lazy_load
+        self.memory_budget_mb = memory_budget_mb
+        self.pinned = {self._detector_index(name) for name in preload or []}
+        self.detectors = [None] * len(self.detectors_names)
+        self._models_mb = {}
+        self._last_used = OrderedDict()
+        self._load_lock = threading.RLock()
+
         if load_models:
             self.load()
 
+    def _detector_index(self, name: str) -> int:
+        if name in self.detectors_names:
+            return self.detectors_names.index(name)
+        if name.replace("-", '_') in self.detectors_map:
+            return self.detectors_map[name.replace("-", '_')]
+        raise TextDetectorError(f"Unknown text detector or region {name}, "
+                                f"expected one of {self.detectors_names} or {list(self.detectors_map.keys())}")
+
+    def create_detector(self, detector_name: str) -> OCR:
+        """
+        The OCR model of a preset, shared through the model registry with other text detectors
+        """
+        key = model_registry.make_key(self.__class__, detector_name, self.presets[detector_name],
+                                      **self.ocr_options)
+        return model_registry.acquire(key, lambda: self.build_detector(detector_name))
+
+    def build_detector(self, detector_name: str) -> OCR:
+        """
+        Build and load the OCR model of a preset
+        """
+        model_conf = copy.deepcopy(modelhub.models[detector_name])
+        model_conf.update(self.presets[detector_name])
+        detector = self.ocr_class(model_name=detector_name, letters=model_conf["letters"],
+                                  linear_size=model_conf["linear_size"], max_text_len=model_conf["max_text_len"],
+                                  height=model_conf["height"], width=model_conf["width"],
+                                  color_channels=model_conf["color_channels"],
+                                  hidden_size=model_conf["hidden_size"], backbone=model_conf["backbone"],
+                                  **self.ocr_options)
+        detector.load(self.presets[detector_name]['model_path'])
+        detector.init_label_converter()
+        return detector
+
+    @staticmethod
+    def model_size_mb(detector) -> float:
+        """
+        Size of the weights and buffers of a loaded torch model, 0 for models without them.
+        Quantised models report the size of their archive, their packed weights are not parameters
+        """
+        if getattr(detector, "size_mb", None) is not None:
+            return detector.size_mb
+        model = getattr(detector, "model", None)
+        if model is None or not hasattr(model, "parameters"):
+            return 0.
+        tensors = list(model.parameters()) + list(model.buffers())
+        return sum(t.numel() * t.element_size() for t in tensors) / 2 ** 20
+
     def load(self):
         """
-        TODO: support reloading
+        Load the pinned models when loading lazily, all of them otherwise
         """
-        self.detectors = []
-        for i, detector_name in enumerate(self.detectors_names):
-            model_conf = copy.deepcopy(modelhub.models[detector_name])
-            model_conf.update(self.presets[detector_name])
-            detector = OCR(model_name=detector_name, letters=model_conf["letters"],
-                           linear_size=model_conf["linear_size"], max_text_len=model_conf["max_text_len"],
-                           height=model_conf["height"], width=model_conf["width"],
-                           color_channels=model_conf["color_channels"],
-                           hidden_size=model_conf["hidden_size"], backbone=model_conf["backbone"])
-            detector.load(self.presets[detector_name]['model_path'])
-            detector.init_label_converter()
-            self.detectors.append(detector)
+        indexes = self.pinned if self.lazy_load else range(len(self.detectors_names))
+        self.ensure_loaded(indexes)
+
+    def ensure_loaded(self, indexes) -> None:
+        """
+        Load the models of indexes, models outside indexes may be evicted to stay within the memory budget
+        """
+        indexes = [int(index) for index in indexes]
+        with self._load_lock:
+            for index in indexes:
+                self.get_detector(index, evict=False)
+            self._evict(keep=set(indexes))
+
+    def get_detector(self, index: int, evict: bool = False) -> OCR:
+        """
+        The OCR model of a preset index, loaded on first use.
+        The stages of a batch fetch their models without evicting, the models of a batch are made room for
+        once in define_order_detector, evict=True unloads every other model over the budget
+        """
+        index = int(index)
+        with self._load_lock:
+            detector = self.detectors[index]
+            if detector is None:
+                name = self.detectors_names[index]
+                start = time.time()
+                detector = self.create_detector(name)
+                self.detectors[index] = detector
+                self._models_mb[index] = self.model_size_mb(detector)
+                logger.info(f"Loaded OCR model {name} for regions {self.presets[name]['for_regions']} "
+                            f"in {time.time() - start:.2f}s ({self._models_mb[index]:.1f} MB), "
+                            f"{self.loaded_mb():.1f} MB loaded")
+            self._last_used[index] = None
+            self._last_used.move_to_end(index)
+            if evict:
+                self._evict(keep={index})
+            return detector
+
+    def unload(self, index: int) -> None:
+        with self._load_lock:
+            if self.detectors[index] is None:
+                return
+            model_registry.release(self.detectors[index])
+            self.detectors[index] = None
+            self._last_used.pop(index, None)
+            size = self._models_mb.pop(index, 0.)
+            logger.info(f"Unloaded OCR model {self.detectors_names[index]} ({size:.1f} MB)")
+
+    def release_models(self) -> None:
+        """
+        Unload every model, pinned ones included
+        """
+        with self._load_lock:
+            for index in range(len(self.detectors)):
+                self.unload(index)
+
+    def loaded_mb(self) -> float:
+        return sum(self._models_mb.values())
+
+    def _evict(self, keep=()) -> None:
+        if self.memory_budget_mb is None:
+            return
+        for index in list(self._last_used.keys()):
+            if self.loaded_mb() <= self.memory_budget_mb:
+                break
+            if index not in keep and index not in self.pinned:
+                self.unload(index)
+        if self.loaded_mb() > self.memory_budget_mb:
+            logger.warning(f"OCR models in use take {self.loaded_mb():.1f} MB, "
+                           f"over the {self.memory_budget_mb} MB budget")
+
+    def get_loaded_models(self) -> Dict[str, float]:
+        """
+        Loaded preset names and their sizes in MB, least recently used first
+        """
+        with self._load_lock:
+            return {self.detectors_names[index]: self._models_mb.get(index, 0.) for index in self._last_used}
 
     def define_predict_classes(self,
                                zones: List[np.ndarray],
@@ -101,6 +238,7 @@ class TextDetector(object):
             predicted[detector]["zones"].append(zone)
             predicted[detector]["order"].append(i)
             i += 1
+        self.ensure_loaded(predicted.keys())
         return predicted
 
     def get_avalible_module(self) -> List[str]:
@@ -115,15 +253,15 @@ class TextDetector(object):
         for key in predicted.keys():
             if self.off_number_plate_classification:
                 zones = convert_cv_zones_rgb_to_bgr(predicted[key]["zones"])
-                predicted[key]["xs"] = self.detectors[int(key)].preprocess(zones)
-            elif (self.option_detector_width != self.detectors[key].width or
-                    self.option_detector_height != self.detectors[key].height):
+                predicted[key]["xs"] = self.get_detector(key).preprocess(zones)
+            elif (self.option_detector_width != self.get_detector(key).width or
+                    self.option_detector_height != self.get_detector(key).height):
                 zones = [np.moveaxis(cv2.resize(np.moveaxis(zone, 0, 2),
-                                    (self.detectors[int(key)].width, self.detectors[int(key)].height)), 2, 0)
+                                    (self.get_detector(key).width, self.get_detector(key).height)), 2, 0)
                          for zone in zones]
-                predicted[key]["xs"] = self.detectors[int(key)].preprocess(zones, need_preprocess=False)
+                predicted[key]["xs"] = self.get_detector(key).preprocess(zones, need_preprocess=False)
             else:
-                predicted[key]["xs"] = self.detectors[int(key)].preprocess(predicted[key]["zones"],
+                predicted[key]["xs"] = self.get_detector(key).preprocess(predicted[key]["zones"],
                                                                            need_preprocess=False)
         return predicted
 
@@ -131,17 +269,36 @@ class TextDetector(object):
     def forward(self, predicted):
         for key in predicted.keys():
             xs = predicted[key]["xs"]
-            predicted[key]["ys"] = self.detectors[int(key)].forward(xs)
+            predicted[key]["ys"] = self.get_detector(key).forward(xs)
         return predicted
 
-    def postprocess(self, predicted):
-        res_all, order_all = [], []
+    def postprocess(self, predicted, return_acc: bool = False):
+        res_all, scores, order_all = [], [], []
         for key in predicted.keys():
-            predicted[key]["ys"] = self.detectors[int(key)].postprocess(predicted[key]["ys"])
+            if return_acc:
+                predicted[key]["ys"], acc = self.get_detector(key).postprocess(predicted[key]["ys"],
+                                                                                 return_acc=return_acc)
+                scores = scores + list(acc)
+            else:
+                predicted[key]["ys"] = self.get_detector(key).postprocess(predicted[key]["ys"])
             res_all = res_all + predicted[key]["ys"]
             order_all = order_all + predicted[key]["order"]
+
+        if return_acc:
+            return [
+                [x for _, x in sorted(zip(order_all, res_all), key=lambda pair: pair[0])],
+                [x for _, x in sorted(zip(order_all, scores), key=lambda pair: pair[0])]
+            ]
         return [x for _, x in sorted(zip(order_all, res_all), key=lambda pair: pair[0])]
 
+    def get_letters(self, label: str) -> str:
+        """
+        Alphabet of the OCR model used for the region label, index i of a logits row is letters[i - 1]
+        """
+        if label not in self.detectors_map.keys():
+            label = self.default_label
+        return self.get_detector(self.detectors_map[label]).label_converter.letters
+
     def predict(self,
                 zones: List[np.ndarray],
                 labels: List[str] = None,
@@ -154,11 +311,11 @@ class TextDetector(object):
         res_all, scores, order_all = [], [], []
         for key in predicted.keys():
             if return_acc:
-                buff_res, acc = self.detectors[int(key)].predict(predicted[key]["zones"], return_acc=return_acc)
+                buff_res, acc = self.get_detector(key).predict(predicted[key]["zones"], return_acc=return_acc)
                 res_all = res_all + buff_res
                 scores = scores + list(acc)
             else:
-                res_all = res_all + self.detectors[int(key)].predict(predicted[key]["zones"], return_acc=return_acc)
+                res_all = res_all + self.get_detector(key).predict(predicted[key]["zones"], return_acc=return_acc)
             order_all = order_all + predicted[key]["order"]
 
         if return_acc:
@@ -186,11 +343,11 @@ class TextDetector(object):
             if self.detectors_map.get(region, None) is None or len(decode[i]) == 0:
                 acc.append([0.])
             else:
-                detector = self.detectors[int(self.detectors_map[region])]
+                detector = self.get_detector(self.detectors_map[region])
                 _acc = detector.get_acc([predicted[i]], [decode[i]])
                 acc.append([float(_acc)])
         return acc
 
     def get_module(self, name: str) -> object:
         ind = self.detectors_names.index(name)
-        return self.detectors[ind]
+        return self.get_detector(ind, evict=True)
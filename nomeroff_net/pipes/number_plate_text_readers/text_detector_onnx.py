@@ -0,0 +1,41 @@
+"""
+Text detector running every OCR preset on ONNX Runtime, for CPU-only hosts
+
+Examples:
+    >>> from nomeroff_net import pipeline
+    >>> from nomeroff_net.pipes.number_plate_text_readers.text_detector_onnx import TextDetectorOnnx
+    >>> number_plate_detection_and_reading = pipeline("number_plate_detection_and_reading",
+    ...                                               image_loader="opencv",
+    ...                                               ocr_class_detector=TextDetectorOnnx)
+"""
+import os
+from typing import Dict
+
+from nomeroff_net.pipes.number_plate_text_readers.text_detector import TextDetector
+from .base.ocr_onnx import OcrOnnx
+
+
+class TextDetectorOnnx(TextDetector):
+    ocr_class = OcrOnnx
+
+    def __init__(self,
+                 presets: Dict = None,
+                 default_label: str = "eu_ua_2015",
+                 default_lines_count: int = 1,
+                 intra_op_num_threads: int = None,
+                 inter_op_num_threads: int = None,
+                 **kwargs) -> None:
+        self.ocr_options = {
+            "intra_op_num_threads": intra_op_num_threads,
+            "inter_op_num_threads": inter_op_num_threads,
+        }
+        TextDetector.__init__(self, presets, default_label, default_lines_count, **kwargs)
+
+    @staticmethod
+    def model_size_mb(detector) -> float:
+        """
+        Size of the exported model file
+        """
+        if detector.path_to_model is None:
+            return 0.
+        return os.path.getsize(detector.path_to_model) / 2 ** 20
@@ -1,4 +1,4 @@
-from typing import Dict
+from typing import Dict, List
 
 from nomeroff_net.pipes.number_plate_text_readers.text_detector import TextDetector
 from .base.ocr_trt import OcrTrt
@@ -8,16 +8,18 @@ class TextDetectorTrt(TextDetector):
     def __init__(self,
                  presets: Dict = None,
                  default_label: str = "eu_ua_2015",
-                 default_lines_count: int = 1) -> None:
-        TextDetector.__init__(self, presets, default_label, default_lines_count, load_models=False)
-        for i, detector_class in enumerate(self.detectors):
-            trt_detector_class = type(f"{detector_class.get_classname()}_trt",
-                                      (OcrTrt, detector_class),
-                                      dict())
-            self.detectors[i] = trt_detector_class()
-            detector_class.__init__(self.detectors[i])
-        for detector, detector_name in zip(self.detectors, self.detectors_names):
-            detector.load(self.presets[detector_name]['model_path'])
+                 default_lines_count: int = 1,
+                 lazy_load: bool = False,
+                 preload: List[str] = None,
+                 memory_budget_mb: float = None,
+                 **_) -> None:
+        TextDetector.__init__(self, presets, default_label, default_lines_count,
+                              lazy_load=lazy_load, preload=preload, memory_budget_mb=memory_budget_mb)
+
+    def build_detector(self, detector_name: str) -> object:
+        detector = self.get_static_module(detector_name)
+        detector.load(self.presets[detector_name]['model_path'])
+        return detector
 
     @staticmethod
     def get_static_module(name: str) -> object:
@@ -5,6 +5,10 @@ from .mcm import (modelhub,
 from .pipeline_tools import chunked_iterable
 from .pipeline_tools import unzip
 from .pipeline_tools import promise_all
+from .pipeline_tools import get_executor
+from .pipeline_tools import shutdown_executors
+from .model_registry import (ModelRegistry,
+                             model_registry)
 from .image_processing import (fline,
                                distance,
                                normalize_color,
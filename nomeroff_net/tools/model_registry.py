@@ -0,0 +1,157 @@
+"""
+Process-wide registry of loaded models, shared between pipeline instances
+
+Examples:
+    >>> from nomeroff_net.tools.model_registry import model_registry
+    >>> from nomeroff_net.pipes.number_plate_keypoints_detectors.bbox_np_points import NpPointsCraft
+    >>> detector = model_registry.load(NpPointsCraft, "latest", "latest")
+    >>> same_detector = model_registry.load(NpPointsCraft, "latest", "latest")
+    >>> detector is same_detector
+    True
+    >>> model_registry.release(detector)
+    True
+    >>> model_registry.release(same_detector)
+    True
+"""
+import os
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable, Tuple
+from .mcm import get_device_torch
+
+logger = logging.getLogger(__name__)
+
+
+def freeze_key(value: Any) -> Hashable:
+    """
+    Hashable form of a model argument, local paths are made absolute so that
+    "./data/model.pt" and "/abs/data/model.pt" resolve to the same key
+    """
+    if isinstance(value, str):
+        return os.path.abspath(value) if os.path.exists(value) else value
+    if isinstance(value, dict):
+        return tuple(sorted((str(key), freeze_key(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        items = [freeze_key(item) for item in value]
+        return tuple(sorted(items, key=repr) if isinstance(value, set) else items)
+    return value
+
+
+def set_inference_mode(instance: Any) -> None:
+    """
+    Put the torch modules held by a model wrapper in eval mode and freeze their weights
+    """
+    try:
+        from torch import nn
+    except ImportError:
+        return
+    for value in vars(instance).values():
+        if isinstance(value, nn.Module):
+            value.eval()
+            for parameter in value.parameters():
+                parameter.requires_grad_(False)
+
+
+class ModelRegistry(object):
+    """
+    Loaded models keyed by (model class, resolved model arguments, device) with reference counting.
+
+    Instances handed out are shared by every pipeline that asked for the same key: they are in eval mode
+    and must be treated as read-only (no training, no load() of other weights). A model is dropped
+    from the registry when its last user releases it.
+    """
+
+    def __init__(self):
+        self._models = {}
+        self._refs = {}
+        self._keys = {}
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    @staticmethod
+    def make_key(model_class: type, *args, device: str = None, **kwargs) -> Tuple:
+        """
+        Registry key of model_class loaded with args and kwargs, on the current torch device by default
+        """
+        if device is None:
+            device = get_device_torch()
+        return (f"{model_class.__module__}.{model_class.__qualname__}",
+                freeze_key(args),
+                freeze_key(kwargs),
+                str(device))
+
+    def acquire(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        The model of key, built with factory() on first request.
+        Concurrent requests for the same key wait for a single load.
+        """
+        with self._lock:
+            if key in self._models:
+                self._refs[key] += 1
+                return self._models[key]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                if key in self._models:
+                    self._refs[key] += 1
+                    return self._models[key]
+            instance = factory()
+            set_inference_mode(instance)
+            with self._lock:
+                self._models[key] = instance
+                self._refs[key] = 1
+                self._keys[id(instance)] = key
+                self._key_locks.pop(key, None)
+        logger.info(f"Loaded shared model {key[0] if isinstance(key, tuple) else key}")
+        return instance
+
+    def load(self, model_class: type, *load_args, init_kwargs: Dict = None, device: str = None,
+             **load_kwargs) -> Any:
+        """
+        Shared model_class(**init_kwargs) with .load(*load_args, **load_kwargs) applied
+        """
+        init_kwargs = init_kwargs or {}
+        key = self.make_key(model_class, *load_args, device=device, init_kwargs=init_kwargs, **load_kwargs)
+
+        def factory():
+            instance = model_class(**init_kwargs)
+            instance.load(*load_args, **load_kwargs)
+            return instance
+        return self.acquire(key, factory)
+
+    def release(self, instance: Any) -> bool:
+        """
+        Drop one reference to a shared model, False for instances the registry does not hold
+        """
+        with self._lock:
+            key = self._keys.get(id(instance))
+            if key is None or self._models.get(key) is not instance:
+                return False
+            self._refs[key] -= 1
+            if self._refs[key] > 0:
+                return True
+            del self._models[key], self._refs[key], self._keys[id(instance)]
+        logger.info(f"Released shared model {key[0] if isinstance(key, tuple) else key}")
+        return True
+
+    def is_shared(self, instance: Any) -> bool:
+        with self._lock:
+            key = self._keys.get(id(instance))
+            return key is not None and self._models.get(key) is instance
+
+    def get_stats(self) -> Dict[Hashable, int]:
+        """
+        Reference count of every loaded model
+        """
+        with self._lock:
+            return dict(self._refs)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._models.clear()
+            self._refs.clear()
+            self._keys.clear()
+
+
+model_registry = ModelRegistry()
@@ -30,6 +30,8 @@ class StrLabelConverter(object):
         self.letters = letters
         self.letters_max = len(self.letters) + 1
         self.max_text_len = max_text_len
+        # token -> character, token 0 is the CTC blank
+        self.lookup = np.array([''] + list(self.letters))
 
     def labels_to_text(self, labels: List) -> str:
         out_best = [k for k, g in itertools.groupby(labels)]
@@ -103,14 +105,66 @@ def decode_prediction(logits: torch.Tensor,
     return text
 
 
-def decode_batch(net_out_value: torch.Tensor,
-                 label_converter: StrLabelConverter) -> str or List:
-    texts = []
-    for i in range(net_out_value.shape[1]):
-        logits = net_out_value[:, i:i+1, :]
-        pred_texts = decode_prediction(logits, label_converter)
-        texts.append(pred_texts)
-    return texts
+def ctc_greedy_decode_batch(net_out_value: torch.Tensor or np.ndarray,
+                            lookup: np.ndarray,
+                            return_confidences: bool = False):
+    """
+    Greedy CTC decoding of a whole [seq_len, batch_size, letters_max] output at once, blank is token 0.
+    One max over the letters axis gives the best tokens, runs of equal tokens are collapsed and blanks
+    dropped with array ops, lookup maps tokens to characters.
+    With return_confidences also returns, from the same max, the softmax probability of every character
+    (the highest over its run) and the mean of those per text (0 for empty texts).
+    """
+    if isinstance(net_out_value, torch.Tensor):
+        net_out_value = net_out_value.detach()
+        best_logits, tokens = net_out_value.max(2)
+        probs = None
+        if return_confidences:
+            probs = (1 / (net_out_value - best_logits.unsqueeze(2)).exp().sum(2)).cpu().numpy()
+        tokens = tokens.cpu().numpy()
+    else:
+        net_out_value = np.asarray(net_out_value, dtype=np.float32)
+        tokens = net_out_value.argmax(2)
+        probs = None
+        if return_confidences:
+            best_logits = np.take_along_axis(net_out_value, tokens[:, :, np.newaxis], 2)
+            probs = 1 / np.exp(net_out_value - best_logits).sum(2)
+
+    seq_len, batch_size = tokens.shape
+    if not seq_len * batch_size:
+        texts = [''] * batch_size
+        if return_confidences:
+            return texts, [np.zeros(0, dtype=np.float32) for _ in range(batch_size)], np.zeros(batch_size)
+        return texts
+
+    # Row major over [batch_size, seq_len], a run starts at every token change and at every row start
+    tokens = tokens.T.reshape(-1)
+    run_starts = np.ones(tokens.shape, dtype=bool)
+    run_starts[1:] = tokens[1:] != tokens[:-1]
+    run_starts[::seq_len] = True
+    run_starts = np.flatnonzero(run_starts)
+    chars = tokens[run_starts] != 0
+    char_rows = run_starts[chars] // seq_len
+    counts = np.bincount(char_rows, minlength=batch_size)
+    splits = np.cumsum(counts)[:-1]
+
+    texts = [''.join(row) for row in np.split(lookup[tokens[run_starts[chars]]], splits)]
+    if not return_confidences:
+        return texts
+
+    run_probs = np.maximum.reduceat(probs.T.reshape(-1), run_starts)[chars]
+    char_confidences = np.split(run_probs, splits)
+    plate_confidences = np.bincount(char_rows, weights=run_probs, minlength=batch_size) / np.maximum(counts, 1)
+    return texts, char_confidences, plate_confidences
+
+
+def decode_batch(net_out_value: torch.Tensor or np.ndarray,
+                 label_converter: StrLabelConverter,
+                 return_confidences: bool = False) -> str or List:
+    """
+    Texts of a [seq_len, batch_size, letters_max] output, see ctc_greedy_decode_batch
+    """
+    return ctc_greedy_decode_batch(net_out_value, label_converter.lookup, return_confidences)
 
 
 def is_valid_str(s: str, letters: List) -> bool:
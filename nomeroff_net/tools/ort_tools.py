@@ -0,0 +1,144 @@
+"""
+ONNX Runtime helpers shared by the *_onnx model classes
+
+Thread counts not given to make_ort_session are read from the ORT_INTRA_OP_NUM_THREADS and
+ORT_INTER_OP_NUM_THREADS environment variables, 0 leaves the choice to ONNX Runtime.
+
+Examples:
+    >>> from nomeroff_net.tools.ort_tools import make_ort_session
+    >>> session = make_ort_session("./data/model_repository/numberplate_options/1/model.onnx",
+    ...                            intra_op_num_threads=4)
+"""
+import os
+import json
+import cv2
+import numpy as np
+from typing import Any, Dict, List, Tuple
+from .mcm import local_storage
+
+
+def default_onnx_path(model_name: str) -> str:
+    """
+    Where the examples/py/model_convertors/convert_*_to_onnx.py scripts save a model by default
+    """
+    return os.path.join(local_storage, "model_repository", model_name, "1", "model.onnx")
+
+
+def resolve_onnx_path(path_to_model: str, model_name: str) -> str:
+    """
+    Local path of an exported model, "latest" stands for the converter's default location
+    """
+    if path_to_model == "latest":
+        path_to_model = default_onnx_path(model_name)
+    if not os.path.exists(path_to_model):
+        raise FileNotFoundError(f"{path_to_model} not found, export the {model_name} model with "
+                                f"examples/py/model_convertors/convert_*_to_onnx.py")
+    return path_to_model
+
+
+def make_ort_session(path_to_model: str,
+                     intra_op_num_threads: int = None,
+                     inter_op_num_threads: int = None,
+                     providers: List[str] = None):
+    """
+    CPU inference session with all graph optimisations enabled.
+    intra_op_num_threads parallelises a single operator, inter_op_num_threads runs independent
+    branches of the graph at once and only matters above 1.
+    """
+    import onnxruntime as ort
+
+    if intra_op_num_threads is None:
+        intra_op_num_threads = int(os.environ.get("ORT_INTRA_OP_NUM_THREADS", 0))
+    if inter_op_num_threads is None:
+        inter_op_num_threads = int(os.environ.get("ORT_INTER_OP_NUM_THREADS", 0))
+
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    options.intra_op_num_threads = intra_op_num_threads
+    options.inter_op_num_threads = inter_op_num_threads
+    if inter_op_num_threads > 1:
+        options.execution_mode = ort.ExecutionMode.ORT_PARALLEL
+    return ort.InferenceSession(path_to_model,
+                                sess_options=options,
+                                providers=providers or ["CPUExecutionProvider"])
+
+
+def get_ort_metadata(session) -> Dict[str, Any]:
+    """
+    Custom metadata written by the convert_*_to_onnx.py scripts, values are JSON decoded when possible
+    """
+    metadata = {}
+    for key, value in session.get_modelmeta().custom_metadata_map.items():
+        try:
+            metadata[key] = json.loads(value)
+        except ValueError:
+            metadata[key] = value
+    return metadata
+
+
+def letterbox(image: np.ndarray,
+              new_shape: Tuple[int, int] = (640, 640),
+              color: Tuple[int, int, int] = (114, 114, 114)) -> Tuple[np.ndarray, float, Tuple[float, float]]:
+    """
+    Resize keeping the aspect ratio and pad to new_shape (height, width) the way ultralytics does
+    for fixed size exported models. Returns the image, the scale and the (left, top) padding.
+    """
+    height, width = image.shape[:2]
+    gain = min(new_shape[0] / height, new_shape[1] / width)
+    new_width, new_height = int(round(width * gain)), int(round(height * gain))
+    pad_w, pad_h = (new_shape[1] - new_width) / 2, (new_shape[0] - new_height) / 2
+
+    if (width, height) != (new_width, new_height):
+        image = cv2.resize(image, (new_width, new_height), interpolation=cv2.INTER_LINEAR)
+    top, bottom = int(round(pad_h - 0.1)), int(round(pad_h + 0.1))
+    left, right = int(round(pad_w - 0.1)), int(round(pad_w + 0.1))
+    image = cv2.copyMakeBorder(image, top, bottom, left, right, cv2.BORDER_CONSTANT, value=color)
+    return image, gain, (pad_w, pad_h)
+
+
+def yolov8_postprocess(output: np.ndarray,
+                       gain: float,
+                       pad: Tuple[float, float],
+                       image_shape: Tuple[int, int],
+                       min_accuracy: float = 0.4,
+                       iou: float = 0.7,
+                       max_det: int = 300) -> List[List[float]]:
+    """
+    [x1, y1, x2, y2, confidence, class] boxes of one image from a [4 + classes, anchors] YOLOv8 output,
+    class agnostic NMS, coordinates scaled back to the original image
+    """
+    predictions = output.T
+    scores = predictions[:, 4:]
+    classes = scores.argmax(axis=1)
+    confidences = scores[np.arange(len(scores)), classes]
+    keep = confidences > min_accuracy
+    predictions, classes, confidences = predictions[keep], classes[keep], confidences[keep]
+    if not len(predictions):
+        return []
+
+    boxes = np.empty((len(predictions), 4), dtype=np.float32)
+    boxes[:, :2] = predictions[:, :2] - predictions[:, 2:4] / 2
+    boxes[:, 2:] = predictions[:, :2] + predictions[:, 2:4] / 2
+    indexes = cv2.dnn.NMSBoxes(np.column_stack([boxes[:, :2], boxes[:, 2:] - boxes[:, :2]]).tolist(),
+                               confidences.tolist(), min_accuracy, iou)
+    indexes = np.array(indexes, dtype=int).reshape(-1)[:max_det]
+
+    boxes = boxes[indexes]
+    boxes[:, [0, 2]] = ((boxes[:, [0, 2]] - pad[0]) / gain).clip(0, image_shape[1])
+    boxes[:, [1, 3]] = ((boxes[:, [1, 3]] - pad[1]) / gain).clip(0, image_shape[0])
+    return [[*box, float(confidence), int(cls)]
+            for box, confidence, cls in zip(boxes.tolist(), confidences[indexes], classes[indexes])]
+
+
+def save_onnx_metadata(model_filepath: str, metadata: Dict[str, Any]) -> None:
+    """
+    Store JSON encoded values in the custom metadata of an exported model, read back by get_ort_metadata
+    """
+    import onnx
+
+    model = onnx.load(model_filepath)
+    for key, value in metadata.items():
+        entry = model.metadata_props.add()
+        entry.key = key
+        entry.value = json.dumps(value)
+    onnx.save(model, model_filepath)
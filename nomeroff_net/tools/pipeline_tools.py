@@ -1,6 +1,15 @@
+import os
+import atexit
 import gevent
 import itertools
+import threading
 from gevent import Greenlet
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+EXECUTORS = ("gevent", "thread", "process")
+
+_executors = {}
+_executors_lock = threading.Lock()
 
 
 def chunked_iterable(iterable, size):
@@ -21,7 +30,36 @@ def process_job(func):
     return res
 
 
-def promise_all(function_list):
+def get_executor(executor, max_workers=None, initializer=None, initargs=()):
+    """
+    Long-lived pool shared by all pipelines, created on first use.
+    "thread" suits OpenCV/numpy work that releases the GIL, "process" pure-Python work
+    whose functions and arguments can be pickled. Pools with an initializer are kept
+    apart per initializer and initargs, so every worker state gets its own pool.
+    """
+    if executor not in ("thread", "process"):
+        raise ValueError(f"executor must be one of {EXECUTORS}, got {executor}")
+    max_workers = max_workers or os.cpu_count() or 1
+    key = (executor, max_workers, initializer, tuple(initargs))
+    with _executors_lock:
+        if key not in _executors:
+            pool_class = ThreadPoolExecutor if executor == "thread" else ProcessPoolExecutor
+            _executors[key] = pool_class(max_workers=max_workers, initializer=initializer, initargs=tuple(initargs))
+        return _executors[key]
+
+
+def shutdown_executors(wait=True):
+    with _executors_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for pool in executors:
+        pool.shutdown(wait=wait)
+
+
+atexit.register(shutdown_executors, wait=False)
+
+
+def promise_all(function_list, executor="gevent", max_workers=None, initializer=None, initargs=()):
     """
     [
         {
@@ -32,7 +70,11 @@ def promise_all(function_list):
     ]
     :return: List response
     """
-    jobs = [Greenlet.spawn(process_job, item) for item in function_list]
-    gevent.joinall(jobs)
-    res = [job.value for job in jobs]
-    return res
+    if executor == "gevent":
+        jobs = [Greenlet.spawn(process_job, item) for item in function_list]
+        gevent.joinall(jobs)
+        res = [job.value for job in jobs]
+        return res
+    pool = get_executor(executor, max_workers, initializer, initargs)
+    futures = [pool.submit(process_job, item) for item in function_list]
+    return [future.result() for future in futures]
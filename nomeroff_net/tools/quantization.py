@@ -0,0 +1,175 @@
+"""
+INT8 post-training quantisation of the OCR and options models for CPU inference
+
+Recurrent and linear layers are quantised dynamically (weights int8, activations quantised on the fly),
+the convolutional backbone statically, with activation ranges calibrated on example numberplate zones.
+Quantised models are saved as TorchScript archives with their metadata, OCR.load and OptionsDetector.load
+recognise them by content, whatever the file name.
+
+Examples:
+    >>> from nomeroff_net.tools.quantization import quantize_ocr_model, save_quantized_model
+    >>> quantized = quantize_ocr_model(ocr.model, calibration_batches)
+    >>> save_quantized_model(quantized, calibration_batches[0], "./ocr-eu-int8.pt", {"letters": ocr.letters})
+"""
+import os
+import copy
+import json
+import zipfile
+import platform
+import logging
+from typing import Any, Dict, Iterable, Tuple
+
+import torch
+from torch import nn
+
+logger = logging.getLogger(__name__)
+
+META_FILE = "nomeroff_meta.json"
+
+
+def default_quantized_engine() -> str:
+    """
+    qnnpack on ARM hosts, fbgemm on x86
+    """
+    if platform.machine().lower() in ("aarch64", "arm64", "armv7l", "armv8l"):
+        return "qnnpack"
+    return "fbgemm"
+
+
+def set_quantized_engine(engine: str) -> None:
+    if engine not in torch.backends.quantized.supported_engines:
+        raise ValueError(f"quantized engine {engine} is not supported here, "
+                         f"available: {torch.backends.quantized.supported_engines}")
+    torch.backends.quantized.engine = engine
+
+
+def quantize_dynamic_layers(model: nn.Module) -> nn.Module:
+    """
+    int8 dynamic quantisation of the LSTM, GRU and Linear layers
+    """
+    return torch.ao.quantization.quantize_dynamic(model, {nn.LSTM, nn.GRU, nn.Linear}, dtype=torch.qint8)
+
+
+@torch.no_grad()
+def quantize_static_module(module: nn.Module,
+                           calibration_batches: Iterable[torch.Tensor],
+                           engine: str = None) -> nn.Module:
+    """
+    FX graph mode post-training static quantisation of a convolutional module,
+    observers are calibrated on the batches it would receive in inference
+    """
+    from torch.ao.quantization import get_default_qconfig_mapping
+    from torch.ao.quantization.quantize_fx import prepare_fx, convert_fx
+
+    engine = engine or default_quantized_engine()
+    set_quantized_engine(engine)
+    calibration_batches = list(calibration_batches)
+    module = copy.deepcopy(module).cpu().eval()
+    prepared = prepare_fx(module, get_default_qconfig_mapping(engine), example_inputs=(calibration_batches[0],))
+    for batch in calibration_batches:
+        prepared(batch)
+    return convert_fx(prepared)
+
+
+class CalibrationRecorder(object):
+    """
+    Records the inputs a submodule receives so that it can be calibrated on real activations
+    """
+    def __init__(self, module: nn.Module):
+        self.inputs = []
+        self.handle = module.register_forward_pre_hook(self.hook)
+
+    def hook(self, module, inputs):
+        self.inputs.append(inputs[0].detach().cpu())
+
+    def remove(self) -> None:
+        self.handle.remove()
+
+
+@torch.no_grad()
+def quantize_submodule(model: nn.Module, name: str,
+                       calibration_batches: Iterable[torch.Tensor], engine: str = None) -> None:
+    """
+    Replace model.<name> with its static quantised version, calibrated on what the full model feeds it
+    """
+    parent_name, _, child_name = name.rpartition(".")
+    parent = model.get_submodule(parent_name) if parent_name else model
+    recorder = CalibrationRecorder(getattr(parent, child_name))
+    try:
+        for batch in calibration_batches:
+            model(batch)
+    finally:
+        recorder.remove()
+    setattr(parent, child_name, quantize_static_module(getattr(parent, child_name), recorder.inputs, engine))
+
+
+def quantize_model(model: nn.Module,
+                   calibration_batches: Iterable[torch.Tensor],
+                   backbone: str,
+                   static: bool = True,
+                   engine: str = None) -> nn.Module:
+    """
+    Copy of model with the backbone submodule statically quantised (when static) and the
+    recurrent and linear layers dynamically quantised
+    """
+    engine = engine or default_quantized_engine()
+    set_quantized_engine(engine)
+    model = copy.deepcopy(model).cpu().eval()
+    if static:
+        quantize_submodule(model, backbone, list(calibration_batches), engine)
+    return quantize_dynamic_layers(model)
+
+
+def quantize_ocr_model(model: nn.Module, calibration_batches: Iterable[torch.Tensor],
+                       static: bool = True, engine: str = None) -> nn.Module:
+    """
+    NPOcrNet: static resnet/efficientnet convolutions, dynamic LSTM and Linear layers
+    """
+    return quantize_model(model, calibration_batches, "conv_nn", static=static, engine=engine)
+
+
+def quantize_options_model(model: nn.Module, calibration_batches: Iterable[torch.Tensor],
+                           static: bool = True, engine: str = None) -> nn.Module:
+    """
+    NPOptionsNet: static efficientnet features, dynamic classifier heads
+    """
+    return quantize_model(model, calibration_batches, "model.features", static=static, engine=engine)
+
+
+@torch.no_grad()
+def save_quantized_model(model: nn.Module, example_input: torch.Tensor, path: str,
+                         meta: Dict[str, Any] = None, engine: str = None) -> None:
+    """
+    Save a quantised model as a TorchScript archive, meta (letters, class_region, sizes, ...)
+    is stored next to the graph and handed back by load_quantized_model
+    """
+    meta = dict(meta or {})
+    meta["quantized_engine"] = engine or torch.backends.quantized.engine
+    traced = torch.jit.trace(model, example_input, check_trace=False)
+    torch.jit.save(traced, path, _extra_files={META_FILE: json.dumps(meta)})
+
+
+def is_quantized_checkpoint(path: str) -> bool:
+    """
+    Archives written by save_quantized_model carry the metadata entry, torch.save and lightning checkpoints do not
+    """
+    if not zipfile.is_zipfile(path):
+        return False
+    with zipfile.ZipFile(path) as archive:
+        return any(name.endswith(META_FILE) for name in archive.namelist())
+
+
+def load_quantized_model(path: str) -> Tuple[torch.jit.ScriptModule, Dict[str, Any]]:
+    """
+    Quantised model saved by save_quantized_model and its metadata, always on CPU.
+    meta["file_size_mb"] is the size of the archive: the packed int8 weights of a TorchScript
+    model are not in its parameters() or buffers()
+    """
+    extra_files = {META_FILE: ""}
+    model = torch.jit.load(path, map_location="cpu", _extra_files=extra_files)
+    meta = json.loads(extra_files[META_FILE] or "{}")
+    meta["file_size_mb"] = os.path.getsize(path) / 2 ** 20
+    set_quantized_engine(meta.get("quantized_engine", default_quantized_engine()))
+    model.eval()
+    logger.info(f"Loaded quantized model {path}")
+    return model, meta
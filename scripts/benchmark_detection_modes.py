@@ -0,0 +1,136 @@
+# scripts/benchmark_detection_modes.py
+"""
+Compare the separate detection path (COCO yolov8n vehicles + nomeroff plate localization, two
+forward passes per frame) with the cascade path (plates localized in vehicle crops) and, when a
+model is given, the unified single-pass vehicle and plate detector.
+
+    python -m scripts.benchmark_detection_modes --model ./models/yolov8n_vehicles_plates.pt \\
+        --images "data/examples/brand_np/*" --batch_size 4 --runs 10
+
+Reports ms per frame for detection alone and with plate reading (key points, classification
+and OCR on the detected boxes), and how well each path agrees with the separate one.
+"""
+
+import time
+import argparse
+import logging
+from glob import glob
+import cv2
+import numpy as np
+from nomeroff_net import pipeline
+from app.detection.vehicle_detector import VehicleObjectDetector
+from app.detection.unified_detector import UnifiedVehiclePlateDetector
+from app.detection.cascade_detector import CascadePlateLocalizer
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark separate, cascade and unified vehicle and plate detection")
+    parser.add_argument("--model", type=str, default=None,
+                        help="Unified detector checkpoint, a path or modelhub://<name>")
+    parser.add_argument("--vehicle_width", type=int, default=640,
+                        help="Frame width the cascade path detects vehicles at")
+    parser.add_argument("--images", type=str, default="data/examples/brand_np/*",
+                        help="Glob of test frames")
+    parser.add_argument("--batch_size", type=int, default=4,
+                        help="Frames per call")
+    parser.add_argument("--runs", type=int, default=10,
+                        help="Timed runs per path")
+    return parser.parse_args()
+
+
+def box_iou(box1, box2):
+    x1, y1 = max(box1[0], box2[0]), max(box1[1], box2[1])
+    x2, y2 = min(box1[2], box2[2]), min(box1[3], box2[3])
+    intersection = max(0., x2 - x1) * max(0., y2 - y1)
+    area1 = (box1[2] - box1[0]) * (box1[3] - box1[1])
+    area2 = (box2[2] - box2[0]) * (box2[3] - box2[1])
+    return intersection / (area1 + area2 - intersection + 1e-9)
+
+
+def mean_best_iou(reference_boxes, boxes):
+    """Mean IoU of every reference box with its best match, 1.0 when there are no reference boxes"""
+    ious = [max([box_iou(ref[:4], box[:4]) for box in boxes], default=0.) for ref in reference_boxes]
+    return float(np.mean(ious)) if ious else 1.
+
+
+def timeit(func, batches, runs):
+    """Milliseconds per frame"""
+    for batch in batches:  # warm up
+        func(batch)
+    frames = sum(len(batch) for batch in batches) * runs
+    start = time.perf_counter()
+    for _ in range(runs):
+        for batch in batches:
+            func(batch)
+    return (time.perf_counter() - start) / frames * 1000
+
+
+def main():
+    args = parse_args()
+    frames = [cv2.imread(path) for path in sorted(glob(args.images))]
+    if not frames:
+        raise SystemExit(f"No images match {args.images}")
+    batches = [frames[i:i + args.batch_size] for i in range(0, len(frames), args.batch_size)]
+
+    reader = pipeline("number_plate_detection_and_reading", image_loader="numpy")
+    vehicle_detector = VehicleObjectDetector(confidence_threshold=0.3)
+    cascade = CascadePlateLocalizer(vehicle_detector, reader.number_plate_localization.detector,
+                                    vehicle_width=args.vehicle_width)
+
+    def separate_detect(batch):
+        images = [reader.image_loader.load(frame) for frame in batch]
+        images_bboxs, images = reader.localize(images)
+        return vehicle_detector.detect_vehicles_batch(batch), images_bboxs, images
+
+    def cascade_detect(batch):
+        images = [reader.image_loader.load(frame) for frame in batch]
+        vehicle_detections, images_bboxs = cascade.detect_batch(batch, images)
+        return vehicle_detections, images_bboxs, images
+
+    paths = {"cascade": cascade_detect}
+    if args.model:
+        unified_detector = UnifiedVehiclePlateDetector(args.model, confidence_threshold=0.3)
+        if not unified_detector.initialized:
+            raise SystemExit(f"Could not load the unified detector from {args.model}")
+
+        def unified_detect(batch):
+            images = [reader.image_loader.load(frame) for frame in batch]
+            vehicle_detections, images_bboxs = unified_detector.detect_batch(batch)
+            return vehicle_detections, images_bboxs, images
+        paths["unified"] = unified_detect
+
+    def with_reading(detect):
+        def run(batch):
+            vehicle_detections, images_bboxs, images = detect(batch)
+            if any(len(bboxs) for bboxs in images_bboxs):
+                reader.read_number_plates(images, images_bboxs)
+        return run
+
+    print(f"\n{len(frames)} frames, batch size {args.batch_size}, {args.runs} runs")
+    for path_name, detect in paths.items():
+        # Agreement, with the separate path as the reference
+        vehicle_ious, plate_ious, counts = [], [], np.zeros(4, dtype=int)
+        for batch in batches:
+            separate_vehicles, separate_plates, _ = separate_detect(batch)
+            path_vehicles, path_plates, _ = detect(batch)
+            for sv, sp, pv, pp in zip(separate_vehicles, separate_plates, path_vehicles, path_plates):
+                vehicle_ious.append(mean_best_iou([v['bbox'] for v in sv], [v['bbox'] for v in pv]))
+                plate_ious.append(mean_best_iou(sp, pp))
+                counts += [len(sv), len(pv), len(sp), len(pp)]
+
+        print(f"\nvehicles: separate {counts[0]}, {path_name} {counts[1]}, mean IoU {np.mean(vehicle_ious):.3f}")
+        print(f"plates:   separate {counts[2]}, {path_name} {counts[3]}, mean IoU {np.mean(plate_ious):.3f}")
+        print(f"{'stage':<24}{'separate ms':>14}{path_name + ' ms':>14}{'speedup':>10}")
+        for name, separate, other in (("detection", separate_detect, detect),
+                                      ("detection + reading", with_reading(separate_detect),
+                                       with_reading(detect))):
+            separate_ms = timeit(separate, batches, args.runs)
+            other_ms = timeit(other, batches, args.runs)
+            print(f"{name:<24}{separate_ms:>14.2f}{other_ms:>14.2f}{separate_ms / other_ms:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+# scripts/benchmark_postgres_inserts.py
+"""
+Compare rows/s of PostgresDB.insert_detection (one INSERT and commit per row) with
+PostgresDB.insert_detections at several batch sizes, against the database from Config.
+
+    python -m scripts.benchmark_postgres_inserts --rows 20000 --batch_sizes 1,100,10000
+
+Rows are written with camera_id 'benchmark' and deleted afterwards.
+"""
+
+import time
+import argparse
+import logging
+from datetime import datetime
+import pytz
+from config import Config
+from app.database.postgres_db import PostgresDB
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+BENCHMARK_CAMERA_ID = 'benchmark'
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark single vs batched detection inserts")
+    parser.add_argument("--rows", type=int, default=20000,
+                        help="Rows written per batched run")
+    parser.add_argument("--single_rows", type=int, default=2000,
+                        help="Rows written one by one with insert_detection")
+    parser.add_argument("--batch_sizes", type=str, default="1,100,10000",
+                        help="Comma separated batch sizes for insert_detections")
+    parser.add_argument("--no_return_ids", action="store_true",
+                        help="Do not fetch the inserted ids in batched runs")
+    return parser.parse_args()
+
+
+def make_detections(count):
+    now = datetime.now(pytz.UTC)
+    local = now.astimezone(pytz.timezone('Africa/Johannesburg'))
+    return [{
+        'text': f"BM{i:06d}",
+        'confidence': 0.9,
+        'timestamp_utc': now,
+        'timestamp_local': local,
+        'camera_id': BENCHMARK_CAMERA_ID,
+        'metadata': {'benchmark': True, 'index': i},
+        'vehicle_details': {
+            'make': 'Toyota',
+            'model': 'Corolla',
+            'color': 'white',
+            'type': 'sedan',
+            'confidence_scores': {'make': 0.8, 'model': 0.7, 'color': 0.9}
+        }
+    } for i in range(count)]
+
+
+def cleanup(db):
+    with db.cursor() as cursor:
+        cursor.execute("DELETE FROM analysis.vehicle_detections WHERE camera_id = %s", (BENCHMARK_CAMERA_ID,))
+
+
+def bench_single(db, count):
+    detections = make_detections(count)
+    start = time.perf_counter()
+    for detection in detections:
+        db.insert_detection(detection)
+    return count / (time.perf_counter() - start)
+
+
+def bench_batched(db, count, batch_size, return_ids):
+    detections = make_detections(count)
+    start = time.perf_counter()
+    for i in range(0, count, batch_size):
+        db.insert_detections(detections[i:i + batch_size], return_ids=return_ids,
+                             page_size=min(batch_size, 1000))
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    args = parse_args()
+    db = PostgresDB(
+        dbname=Config.POSTGRES_DB,
+        user=Config.POSTGRES_USER,
+        password=Config.POSTGRES_PASSWORD,
+        host=Config.POSTGRES_HOST,
+        port=Config.POSTGRES_PORT
+    )
+    db.connect()
+    try:
+        results = [('insert_detection', 1, bench_single(db, args.single_rows))]
+        cleanup(db)
+        for batch_size in [int(size) for size in args.batch_sizes.split(',')]:
+            # Keep the batch size 1 run short, it makes one round-trip per row like insert_detection
+            count = min(args.rows, args.single_rows) if batch_size == 1 else args.rows
+            results.append(('insert_detections', batch_size,
+                            bench_batched(db, count, batch_size, not args.no_return_ids)))
+            cleanup(db)
+
+        print(f"{'method':<20}{'batch size':>12}{'rows/s':>14}")
+        for method, batch_size, rows_per_second in results:
+            print(f"{method:<20}{batch_size:>12}{rows_per_second:>14.0f}")
+    finally:
+        cleanup(db)
+        db.disconnect()
+
+
+if __name__ == '__main__':
+    main()
@@ -4,7 +4,7 @@ import unittest
 import cv2
 import numpy as np
 from pathlib import Path
-from app.recognition import RecognitionType, VehicleRecognizerFactory
+from app.recognition import RecognitionType, VehicleRecognizerFactory, convert_color_batch
 from app.recognition.basic_recognizer import BasicVehicleRecognizer
 
 class TestBasicVehicleRecognizer(unittest.TestCase):
@@ -91,5 +91,29 @@ class TestBasicVehicleRecognizer(unittest.TestCase):
         self.assertIsNotNone(attributes.image_path)
         self.assertTrue(Path(attributes.image_path).exists())
 
+    def test_recognize_batch(self):
+        """Test batched recognition matches recognize() and keeps the order"""
+        image = cv2.imread(str(self.test_image_path))
+        self.assertIsNotNone(image, "Failed to load test image")
+        
+        bboxes = [(25, 25, 75, 75), (0, 0, 0, 0), (0, 0, 20, 100)]
+        
+        batch = self.recognizer.recognize_batch([image] * len(bboxes), bboxes)
+        
+        self.assertEqual(len(batch), len(bboxes))
+        for attributes, bbox in zip(batch, bboxes):
+            single = self.recognizer.recognize(image, bbox)
+            self.assertEqual(attributes.color, single.color)
+            self.assertAlmostEqual(attributes.confidence_scores['color'], single.confidence_scores['color'])
+
+    def test_convert_color_batch(self):
+        """Test batched color conversion equals converting each image"""
+        images = [np.random.randint(0, 256, shape, dtype=np.uint8) for shape in [(5, 7, 3), (40, 3, 3), (1, 1, 3)]]
+        images.append(np.random.randint(0, 256, (30, 30, 3), dtype=np.uint8)[5:20, 3:9])
+        
+        for code in (cv2.COLOR_BGR2LAB, cv2.COLOR_BGR2HSV, cv2.COLOR_BGR2GRAY):
+            for converted, image in zip(convert_color_batch(images, code), images):
+                np.testing.assert_array_equal(converted, cv2.cvtColor(image, code))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
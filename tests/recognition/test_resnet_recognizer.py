@@ -0,0 +1,64 @@
+# tests/recognition/test_resnet_recognizer.py
+
+import unittest
+import numpy as np
+import torch
+from app.recognition.basic_recognizer import BasicVehicleRecognizer
+from app.recognition.resnet_recognizer import ResNetVehicleRecognizer
+
+
+class FakeResNet:
+    """Predicts class 1 for bright crops and class 2 for dark ones, records the batch sizes"""
+    def __init__(self):
+        self.batch_sizes = []
+
+    def __call__(self, batch):
+        self.batch_sizes.append(len(batch))
+        bright = batch.mean(dim=(1, 2, 3)) > 0.5
+        logits = torch.zeros(len(batch), 4)
+        logits[bright, 1] = 5.0
+        logits[~bright, 2] = 5.0
+        return logits
+
+
+def make_recognizer():
+    # skip loading resnet50 weights, the preprocessing only has to give one tensor per crop
+    recognizer = ResNetVehicleRecognizer.__new__(ResNetVehicleRecognizer)
+    recognizer.device = torch.device('cpu')
+    recognizer.model = FakeResNet()
+    recognizer.preprocess = lambda crop: torch.from_numpy(crop[:8, :8].astype(np.float32) / 255).permute(2, 0, 1)
+    recognizer.class_mapping = {"1": "BMW M3 Coupe 2012", "2": "Ford F-150 Regular Cab 2007"}
+    recognizer.color_detector = BasicVehicleRecognizer()
+    return recognizer
+
+
+class TestResNetVehicleRecognizer(unittest.TestCase):
+    def test_recognize_batch_uses_one_forward(self):
+        recognizer = make_recognizer()
+        image = np.zeros((100, 200, 3), dtype=np.uint8)
+        image[:, 100:] = 230
+        bboxes = [(100, 0, 200, 100), (0, 0, 100, 100), (0, 0, 0, 0)]
+
+        results = recognizer.recognize_batch([image] * len(bboxes), bboxes)
+
+        self.assertEqual(recognizer.model.batch_sizes, [2])
+        self.assertEqual((results[0].make, results[0].model, results[0].year, results[0].type),
+                         ("BMW", "M3 Coupe", 2012, "Coupe"))
+        self.assertEqual((results[1].make, results[1].model, results[1].year, results[1].type),
+                         ("Ford", "F-150 Regular Cab", 2007, "Truck"))
+        self.assertGreater(results[0].confidence_scores['make'], 0.9)
+        self.assertNotEqual(results[0].color.lower(), "unknown")
+        # the empty crop falls back on its own
+        self.assertEqual(results[2].make, "Unknown")
+
+    def test_recognize_matches_batch(self):
+        recognizer = make_recognizer()
+        image = np.full((50, 50, 3), 230, dtype=np.uint8)
+        single = recognizer.recognize(image, (0, 0, 50, 50))
+        batch = recognizer.recognize_batch([image], [(0, 0, 50, 50)])[0]
+        self.assertEqual((single.make, single.model, single.color, single.type),
+                         (batch.make, batch.model, batch.color, batch.type))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+# tests/test_association.py
+
+import unittest
+import numpy as np
+from app.detection.association import PlateVehicleAssociator, containment_matrix
+
+
+class TestAssociation(unittest.TestCase):
+    def test_containment_matrix(self):
+        containment = containment_matrix(np.array([[10, 10, 20, 20], [95, 10, 105, 20]]),
+                                         np.array([[0, 0, 100, 100]]))
+        np.testing.assert_allclose(containment, [[1.0], [0.5]])
+        np.testing.assert_allclose(containment_matrix([[95, 10, 105, 20]], [[0, 0, 100, 100]], margin=5), [[1.0]])
+        self.assertEqual(containment_matrix(np.zeros((0, 4)), np.zeros((3, 4))).shape, (0, 3))
+
+    def test_plate_goes_to_the_best_fitting_vehicle(self):
+        # the plate sits at the bottom centre of the small car, inside the larger box behind it as well
+        vehicles = [[100, 0, 600, 400], [100, 150, 300, 350]]
+        plates = [[180, 300, 220, 315]]
+        self.assertEqual(PlateVehicleAssociator(margin=0).associate(plates, vehicles), [1])
+
+    def test_assignment_is_one_to_one(self):
+        vehicles = [[0, 0, 200, 200]]
+        plates = [[80, 150, 120, 165], [0, 0, 20, 10]]
+        for method in ('greedy', 'hungarian'):
+            self.assertEqual(PlateVehicleAssociator(margin=0, method=method).associate(plates, vehicles), [0, None])
+
+    def test_plates_outside_vehicles_are_not_associated(self):
+        associator = PlateVehicleAssociator(margin=20)
+        self.assertEqual(associator.associate([[500, 500, 540, 515]], [[0, 0, 200, 200]]), [None])
+        self.assertEqual(associator.associate([[0, 0, 10, 10]], []), [None])
+        self.assertEqual(associator.associate([], [[0, 0, 200, 200]]), [])
+
+    def test_dense_scene(self):
+        # a 20 x 20 grid of parked cars, each with its plate near the bottom
+        vehicles = np.array([[x * 100, y * 100, x * 100 + 90, y * 100 + 90] for y in range(20) for x in range(20)])
+        plates = np.tile(vehicles[:, :2], 2) + np.array([30, 65, 60, 75])
+        assignment = PlateVehicleAssociator(margin=20).associate(plates[::-1], vehicles)
+        self.assertEqual(assignment, list(range(len(vehicles)))[::-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+# tests/test_cascade_detector.py
+
+import unittest
+import numpy as np
+from app.detection.cascade_detector import CascadePlateLocalizer, downscale, roi_box, suppress_duplicates
+
+
+class FakeVehicleDetector:
+    def __init__(self, boxes):
+        self.boxes = boxes
+        self.shapes = []
+
+    def detect_vehicles_batch(self, images):
+        self.shapes = [image.shape for image in images]
+        return [[{'bbox': box, 'confidence': 0.9, 'class': 'car', 'image': None} for box in self.boxes]
+                for _ in images]
+
+
+class FakePlateDetector:
+    """Finds one plate at (10, 20, 50, 30) in every crop"""
+    def __init__(self):
+        self.calls = []
+
+    def predict(self, images):
+        self.calls.append([image.shape for image in images])
+        return [[[10, 20, 50, 30, 0.8, 0]] for _ in images]
+
+
+class TestCascadeDetector(unittest.TestCase):
+    def test_downscale_and_roi_box(self):
+        small, scale = downscale(np.zeros((1080, 1920, 3), dtype=np.uint8), 640)
+        self.assertEqual(small.shape, (360, 640, 3))
+        self.assertAlmostEqual(scale, 1 / 3)
+        self.assertEqual(downscale(np.zeros((480, 640, 3), dtype=np.uint8), 640)[1], 1.0)
+        self.assertEqual(roi_box((100, 100, 200, 150), 0.1, (1080, 1920)), (90, 95, 210, 155))
+        self.assertEqual(roi_box((0, 0, 100, 100), 0.5, (80, 80)), (0, 0, 80, 80))
+
+    def test_suppress_duplicates_keeps_the_most_confident_box(self):
+        bboxs = suppress_duplicates([[0, 0, 10, 10, 0.5, 0], [1, 0, 11, 10, 0.9, 0], [50, 50, 60, 60, 0.7, 0]])
+        np.testing.assert_allclose(bboxs[:, 4], [0.9, 0.7], rtol=1e-6)
+
+    def test_plates_are_found_in_full_resolution_vehicle_crops(self):
+        frame = np.zeros((1080, 1920, 3), dtype=np.uint8)
+        vehicle_detector = FakeVehicleDetector([(100, 100, 200, 200)])
+        plate_detector = FakePlateDetector()
+        cascade = CascadePlateLocalizer(vehicle_detector, plate_detector, vehicle_width=640, roi_margin=0.0)
+        vehicles, images_bboxs = cascade.detect_batch([frame, frame], [frame, frame])
+
+        self.assertEqual(vehicle_detector.shapes, [(360, 640, 3)] * 2)
+        self.assertEqual(vehicles[0][0]['bbox'], (300, 300, 600, 600))
+        self.assertEqual(vehicles[0][0]['image'].shape, (300, 300, 3))
+        # both crops in a single call, at full resolution
+        self.assertEqual(plate_detector.calls, [[(300, 300, 3), (300, 300, 3)]])
+        np.testing.assert_allclose(images_bboxs[1], [[310, 320, 350, 330, 0.8, 0]], rtol=1e-6)
+
+    def test_frames_without_vehicles_skip_plate_localization(self):
+        plate_detector = FakePlateDetector()
+        cascade = CascadePlateLocalizer(FakeVehicleDetector([]), plate_detector)
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        vehicles, images_bboxs = cascade.detect_batch([frame], [frame])
+        self.assertEqual(plate_detector.calls, [])
+        self.assertEqual(images_bboxs[0].shape, (0, 6))
+
+
+if __name__ == '__main__':
+    unittest.main()
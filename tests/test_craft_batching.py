@@ -0,0 +1,73 @@
+# tests/test_craft_batching.py
+
+import unittest
+import numpy as np
+from nomeroff_net.pipes.number_plate_keypoints_detectors.bbox_np_points import NpPointsCraft
+
+# a black pixel after normalizeMeanVariance, (0 - mean * 255) / (std * 255)
+BLACK = (np.array([0., 0., 0.]) - np.array([0.485, 0.456, 0.406])) / np.array([0.229, 0.224, 0.225])
+
+
+def make_craft():
+    """NpPointsCraft without nets, run_net returns channel 0 and 1 at half resolution and records batch shapes"""
+    craft = NpPointsCraft.__new__(NpPointsCraft)
+    craft.batch_shapes = []
+
+    def run_net(x):
+        craft.batch_shapes.append(x.shape)
+        return x[:, 0, ::2, ::2], x[:, 1, ::2, ::2]
+
+    craft.run_net = run_net
+    return craft
+
+
+def make_crop(height, width, value):
+    crop = np.random.default_rng(int(value)).random((height, width, 3), dtype=np.float32)
+    crop[:, :, 1] = value
+    return crop
+
+
+class TestCraftBatching(unittest.TestCase):
+    def test_pad_batch_fills_with_normalized_black(self):
+        crops = [make_crop(64, 96, 1), make_crop(32, 128, 2)]
+        batch, shapes = NpPointsCraft.pad_batch(crops)
+
+        self.assertEqual(batch.shape, (2, 64, 128, 3))
+        self.assertEqual(shapes, [(64, 96), (32, 128)])
+        np.testing.assert_array_equal(batch[0, :64, :96], crops[0])
+        np.testing.assert_array_equal(batch[1, :32, :128], crops[1])
+        np.testing.assert_allclose(batch[0, :, 96:], np.broadcast_to(BLACK, (64, 32, 3)), atol=1e-4)
+        np.testing.assert_allclose(batch[1, 32:, :], np.broadcast_to(BLACK, (32, 128, 3)), atol=1e-4)
+
+    def test_pad_mode_cuts_maps_back_to_each_crop(self):
+        craft = make_craft()
+        crops = [make_crop(64, 96, 1), make_crop(32, 128, 2), make_crop(96, 32, 3)]
+        outputs = craft.forward_batch([[crop, "extra", i] for i, crop in enumerate(crops)], craft_batch_mode="pad")
+
+        self.assertEqual(craft.batch_shapes, [(3, 3, 96, 128)])
+        for i, (crop, (score_text, score_link, extra, index)) in enumerate(zip(crops, outputs)):
+            self.assertEqual((extra, index), ("extra", i))
+            self.assertEqual(score_text.shape, (crop.shape[0] // 2, crop.shape[1] // 2))
+            np.testing.assert_array_equal(score_text, crop[::2, ::2, 0])
+            np.testing.assert_array_equal(score_link, crop[::2, ::2, 1])
+
+    def test_bucket_mode_groups_identical_shapes_and_keeps_order(self):
+        craft = make_craft()
+        crops = [make_crop(64, 96, 0), make_crop(32, 128, 1), make_crop(64, 96, 2), make_crop(64, 128, 3)]
+        outputs = craft.forward_batch([[crop, i] for i, crop in enumerate(crops)], craft_batch_mode="bucket")
+
+        self.assertEqual(craft.batch_shapes, [(2, 3, 64, 96), (1, 3, 32, 128), (1, 3, 64, 128)])
+        self.assertEqual([index for *_, index in outputs], [0, 1, 2, 3])
+        for crop, (score_text, score_link, _) in zip(crops, outputs):
+            np.testing.assert_array_equal(score_text, crop[::2, ::2, 0])
+            np.testing.assert_array_equal(score_link, crop[::2, ::2, 1])
+
+    def test_batch_size_splits_forwards(self):
+        craft = make_craft()
+        crops = [make_crop(32, 32, i) for i in range(5)]
+        craft.forward_batch([[crop] for crop in crops], craft_batch_mode="pad", craft_batch_size=2)
+        self.assertEqual([shape[0] for shape in craft.batch_shapes], [2, 2, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+# tests/test_ctc_decode.py
+
+import unittest
+import numpy as np
+import torch
+from nomeroff_net.tools.ocr_tools import StrLabelConverter, decode_batch, decode_prediction
+
+LETTERS = "0123456789ABCEHIKMOPTX"
+
+
+def make_logits(seed, seq_len=32, batch_size=16):
+    """Peaky [seq_len, batch_size, letters_max] logits with repeats, blanks and some all-blank rows"""
+    rng = np.random.default_rng(seed)
+    tokens = rng.integers(0, len(LETTERS) + 1, size=(seq_len, batch_size))
+    tokens[rng.random((seq_len, batch_size)) < 0.4] = 0
+    for t in range(1, seq_len):
+        repeat = rng.random(batch_size) < 0.3
+        tokens[t, repeat] = tokens[t - 1, repeat]
+    tokens[:, 0] = 0
+    logits = rng.normal(0, 1, size=(seq_len, batch_size, len(LETTERS) + 1)).astype(np.float32)
+    np.put_along_axis(logits, tokens[:, :, np.newaxis], rng.uniform(3, 8, size=(seq_len, batch_size, 1)), 2)
+    return logits
+
+
+def softmax(logits):
+    exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+class TestCtcDecode(unittest.TestCase):
+    def setUp(self):
+        self.label_converter = StrLabelConverter(LETTERS, 9)
+
+    def reference(self, logits):
+        """One sample at a time through decode_prediction, max probability over each character run"""
+        texts, confidences = [], []
+        for i in range(logits.shape[1]):
+            texts.append(decode_prediction(torch.tensor(logits[:, i:i + 1, :]), self.label_converter))
+            probs = softmax(logits[:, i, :].astype(np.float64))
+            char_confidences, previous = [], 0
+            for token, prob in zip(probs.argmax(1), probs.max(1)):
+                if token != 0 and token != previous:
+                    char_confidences.append(prob)
+                elif token != 0:
+                    char_confidences[-1] = max(char_confidences[-1], prob)
+                previous = token
+            confidences.append(char_confidences)
+        return texts, confidences
+
+    def test_matches_per_sample_decoding(self):
+        for seed in range(5):
+            logits = make_logits(seed)
+            expected_texts, expected_confidences = self.reference(logits)
+            for net_out_value in (logits, torch.tensor(logits)):
+                self.assertEqual(decode_batch(net_out_value, self.label_converter), expected_texts)
+
+                texts, char_confidences, plate_confidences = decode_batch(net_out_value, self.label_converter,
+                                                                          return_confidences=True)
+                self.assertEqual(texts, expected_texts)
+                for text, confidences, plate_confidence, expected in zip(
+                        texts, char_confidences, plate_confidences, expected_confidences):
+                    self.assertEqual(len(confidences), len(text))
+                    np.testing.assert_allclose(confidences, expected, rtol=1e-5)
+                    self.assertAlmostEqual(plate_confidence, float(np.mean(expected)) if expected else 0.0, places=5)
+
+    def test_empty_batch(self):
+        logits = np.zeros((32, 0, len(LETTERS) + 1), dtype=np.float32)
+        self.assertEqual(decode_batch(logits, self.label_converter), [])
+        texts, char_confidences, plate_confidences = decode_batch(logits, self.label_converter,
+                                                                  return_confidences=True)
+        self.assertEqual((texts, char_confidences, len(plate_confidences)), ([], [], 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+# tests/test_data_distributor.py
+
+import time
+import threading
+import unittest
+from datetime import datetime, timezone
+from app.database.distribution.core import DataDistributor, DetectionEvent, OverflowPolicy
+from app.database.distribution.database_consumer import DatabaseConsumer
+
+
+def make_event(text):
+    now = datetime.now(timezone.utc)
+    return DetectionEvent(plate_text=text, confidence=0.9, timestamp_utc=now, timestamp_local=now,
+                          camera_id='cam1', vehicle_details={'make': 'Toyota'})
+
+
+class FakeDatabase:
+    """Stands in for PostgresDB/TimeSeriesDB.insert_detection"""
+
+    def __init__(self, delay=0.0, fail_on=None):
+        self.delay = delay
+        self.fail_on = fail_on
+        self.records = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def insert_detection(self, record):
+        self.release.wait()
+        time.sleep(self.delay)
+        if record['text'] == self.fail_on:
+            self.fail_on = None
+            raise RuntimeError("connection lost")
+        self.records.append(record)
+        return True
+
+
+class FakeBulkDatabase(FakeDatabase):
+    """Stands in for PostgresDB.insert_detections"""
+
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    def insert_detections(self, records, return_ids=True):
+        self.batches.append(len(records))
+        self.records.extend(records)
+        return []
+
+
+class TestDataDistributor(unittest.TestCase):
+    def test_events_are_written_in_batches_and_flushed_on_stop(self):
+        database = FakeDatabase()
+        distributor = DataDistributor(batch_size=10, processing_interval=5.0)
+        distributor.register_consumer('postgres', DatabaseConsumer(database))
+        distributor.start()
+        for i in range(25):
+            distributor.distribute_event(make_event(f"P{i}"))
+        distributor.stop()
+
+        self.assertEqual([record['text'] for record in database.records], [f"P{i}" for i in range(25)])
+        self.assertEqual(database.records[0]['vehicle_details'], {'make': 'Toyota'})
+        status = distributor.get_status()['postgres']
+        self.assertEqual(status['written'], 25)
+        self.assertEqual(status['queue_size'], 0)
+
+    def test_bulk_insert_is_used_when_available(self):
+        database = FakeBulkDatabase()
+        distributor = DataDistributor(batch_size=10, processing_interval=5.0)
+        distributor.register_consumer('postgres', DatabaseConsumer(database))
+        for i in range(25):
+            distributor.distribute_event(make_event(f"P{i}"))
+        distributor.start()
+        distributor.stop()
+
+        self.assertEqual(database.batches, [10, 10, 5])
+        self.assertEqual(len(database.records), 25)
+
+    def test_producer_never_waits_on_a_slow_database(self):
+        database = FakeDatabase()
+        database.release.clear()
+        distributor = DataDistributor(batch_size=2, processing_interval=0.01, max_queue_size=5,
+                                      overflow_policy=OverflowPolicy.DROP_OLDEST)
+        distributor.register_consumer('timeseries', DatabaseConsumer(database))
+        distributor.start()
+
+        start = time.time()
+        for i in range(50):
+            distributor.distribute_event(make_event(f"P{i}"))
+        self.assertLess(time.time() - start, 0.5)
+
+        database.release.set()
+        distributor.stop()
+        status = distributor.get_status()['timeseries']
+        self.assertGreater(status['dropped'], 0)
+        self.assertEqual(status['written'] + status['dropped'], 50)
+        # The newest detections survive
+        self.assertEqual(database.records[-1]['text'], 'P49')
+
+    def test_drop_newest(self):
+        distributor = DataDistributor(max_queue_size=2, overflow_policy=OverflowPolicy.DROP_NEWEST)
+        distributor.register_consumer('postgres', DatabaseConsumer(FakeDatabase()))
+        self.assertTrue(distributor.distribute_event(make_event('P0')))
+        self.assertTrue(distributor.distribute_event(make_event('P1')))
+        self.assertFalse(distributor.distribute_event(make_event('P2')))
+        self.assertEqual([event.plate_text for event in distributor.queues['postgres'].queue], ['P0', 'P1'])
+
+    def test_failed_batch_is_retried_without_duplicates(self):
+        database = FakeDatabase(fail_on='P2')
+        distributor = DataDistributor(batch_size=5, processing_interval=0.05)
+        distributor.register_consumer('postgres', DatabaseConsumer(database))
+        for i in range(5):
+            distributor.distribute_event(make_event(f"P{i}"))
+        distributor.start()
+        distributor.stop()
+
+        self.assertEqual([record['text'] for record in database.records], [f"P{i}" for i in range(5)])
+        status = distributor.get_status()['postgres']
+        self.assertEqual(status['failed_batches'], 1)
+        self.assertEqual(status['written'], 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+# tests/test_det_boxes.py
+
+import unittest
+import cv2
+import numpy as np
+from nomeroff_net.pipes.number_plate_keypoints_detectors.bbox_np_points_tools import (
+    get_det_boxes,
+    label_maxima,
+    _det_boxes_full_image,
+)
+
+
+def make_score_maps(seed, height=150, width=160, blobs=12):
+    """Text blobs of varying strength, some on the border, joined in places by link strokes"""
+    rng = np.random.default_rng(seed)
+    textmap = np.zeros((height, width), dtype=np.float32)
+    linkmap = np.zeros((height, width), dtype=np.float32)
+    centers = []
+    for _ in range(blobs):
+        cx, cy = int(rng.integers(0, width)), int(rng.integers(0, height))
+        axes = (int(rng.integers(2, 12)), int(rng.integers(2, 8)))
+        cv2.ellipse(textmap, (cx, cy), axes, float(rng.uniform(0, 180)), 0, 360,
+                    float(rng.uniform(0.45, 1.0)), -1)
+        centers.append((cx, cy))
+    for (x0, y0), (x1, y1) in zip(centers[::2], centers[1::2]):
+        if rng.random() < 0.5:
+            cv2.line(linkmap, (x0, y0), (x1, y1), 0.9, 2)
+    textmap = cv2.GaussianBlur(textmap, (5, 5), 0)
+    return textmap, linkmap
+
+
+class TestDetBoxes(unittest.TestCase):
+    def test_windowed_fallback_matches_full_image_loop(self):
+        for seed in range(20):
+            textmap, linkmap = make_score_maps(seed)
+            det = get_det_boxes(textmap, linkmap, 0.6, 0.7, 0.4, use_cpp_bindings=False)
+
+            _, text_score = cv2.threshold(textmap, 0.4, 1, 0)
+            _, link_score = cv2.threshold(linkmap, 0.7, 1, 0)
+            n_labels, labels, stats, _ = cv2.connectedComponentsWithStats(
+                np.clip(text_score + link_score, 0, 1).astype(np.uint8), connectivity=4)
+            expected, _ = _det_boxes_full_image(textmap, labels, n_labels, stats, text_score, link_score, 0.6)
+
+            self.assertGreater(len(expected), 0)
+            self.assertEqual(len(det), len(expected))
+            for box, expected_box in zip(det, expected):
+                np.testing.assert_array_equal(box, expected_box)
+
+    def test_label_maxima(self):
+        rng = np.random.default_rng(0)
+        values = rng.random((40, 50))
+        labels = rng.integers(0, 6, size=(40, 50)).astype(np.int32)
+        maxima = label_maxima(values, labels, 7)
+        for k in range(1, 6):
+            self.assertEqual(maxima[k], values[labels == k].max())
+        # Labels without pixels never pass a threshold
+        self.assertEqual(maxima[6], -np.inf)
+
+
+if __name__ == '__main__':
+    unittest.main()
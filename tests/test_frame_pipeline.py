@@ -0,0 +1,91 @@
+# tests/test_frame_pipeline.py
+
+import time
+import unittest
+import threading
+from app.detection.frame_pipeline import FramePipeline, DropPolicy, StageQueue
+
+
+class TestFramePipeline(unittest.TestCase):
+    def _source(self, count):
+        frames = iter(range(count))
+        return lambda: next(frames, None)
+
+    def test_no_drop_policy_delivers_every_frame_in_order(self):
+        """Files must be processed completely and in order"""
+        pipeline = FramePipeline(self._source(20),
+                                 lambda frame: frame * 2,
+                                 encode_frame=lambda frame: frame + 1,
+                                 queue_size=2,
+                                 drop_policy=DropPolicy.NONE).start()
+        results = []
+        while True:
+            item = pipeline.get(timeout=5)
+            if item is None:
+                break
+            results.append(item)
+        pipeline.stop()
+
+        self.assertEqual(results, [i * 2 + 1 for i in range(20)])
+        stats = pipeline.get_stats()
+        self.assertEqual(stats['stages']['inference']['count'], 20)
+        self.assertEqual(stats['queues']['capture']['dropped'], 0)
+
+    def test_latest_policy_drops_stale_frames(self):
+        """A slow inference stage must not stall capture on live sources"""
+        def slow_process(frame):
+            time.sleep(0.02)
+            return frame
+
+        pipeline = FramePipeline(self._source(200),
+                                 slow_process,
+                                 encode_frame=lambda frame: frame,
+                                 queue_size=1,
+                                 drop_policy=DropPolicy.LATEST).start()
+        results = []
+        while True:
+            item = pipeline.get(timeout=5)
+            if item is None:
+                break
+            results.append(item)
+        pipeline.stop()
+
+        self.assertLess(len(results), 200)
+        self.assertEqual(results, sorted(results))
+        self.assertGreater(pipeline.get_stats()['queues']['capture']['dropped'], 0)
+
+    def test_stage_errors_skip_frame(self):
+        """An exception in one frame must not stop the pipeline"""
+        def process(frame):
+            if frame == 3:
+                raise ValueError("bad frame")
+            return frame
+
+        pipeline = FramePipeline(self._source(5), process,
+                                 encode_frame=lambda frame: frame).start()
+        results = []
+        while True:
+            item = pipeline.get(timeout=5)
+            if item is None:
+                break
+            results.append(item)
+        pipeline.stop()
+
+        self.assertEqual(results, [0, 1, 2, 4])
+        self.assertEqual(pipeline.get_stats()['stages']['inference']['errors'], 1)
+
+    def test_stage_queue_tracks_depth(self):
+        stop_event = threading.Event()
+        stage_queue = StageQueue('test', 3, DropPolicy.LATEST)
+        for i in range(5):
+            stage_queue.put(i, stop_event)
+
+        stats = stage_queue.get_stats()
+        self.assertEqual(stats['depth'], 3)
+        self.assertEqual(stats['max_depth'], 3)
+        self.assertEqual(stats['dropped'], 2)
+        self.assertEqual(stage_queue.get(stop_event), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
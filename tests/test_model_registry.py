@@ -0,0 +1,67 @@
+# tests/test_model_registry.py
+
+import threading
+import unittest
+from nomeroff_net.tools.model_registry import ModelRegistry
+
+
+class FakeModel:
+    loads = 0
+
+    def __init__(self, options=None):
+        self.options = options
+        self.path = None
+
+    def load(self, path_to_model="latest", options=None):
+        FakeModel.loads += 1
+        self.path = path_to_model
+
+
+class TestModelRegistry(unittest.TestCase):
+    def setUp(self):
+        FakeModel.loads = 0
+        self.registry = ModelRegistry()
+
+    def test_same_key_shares_one_instance(self):
+        first = self.registry.load(FakeModel, "latest", device="cpu")
+        second = self.registry.load(FakeModel, "latest", device="cpu")
+        self.assertIs(first, second)
+        self.assertEqual(FakeModel.loads, 1)
+        self.assertEqual(list(self.registry.get_stats().values()), [2])
+
+    def test_path_options_and_device_are_part_of_the_key(self):
+        model = self.registry.load(FakeModel, "latest", device="cpu")
+        self.assertIsNot(model, self.registry.load(FakeModel, "other", device="cpu"))
+        self.assertIsNot(model, self.registry.load(FakeModel, "latest", device="cuda"))
+        self.assertIsNot(model, self.registry.load(FakeModel, "latest", device="cpu",
+                                                   init_kwargs={"options": {"class_region": ["ua"]}}))
+        self.assertEqual(FakeModel.loads, 4)
+
+    def test_model_is_dropped_after_last_release(self):
+        first = self.registry.load(FakeModel, "latest", device="cpu")
+        second = self.registry.load(FakeModel, "latest", device="cpu")
+        self.assertTrue(self.registry.release(first))
+        self.assertTrue(self.registry.is_shared(second))
+        self.assertTrue(self.registry.release(second))
+        self.assertFalse(self.registry.is_shared(second))
+        self.assertFalse(self.registry.release(second))
+
+        self.assertIsNot(self.registry.load(FakeModel, "latest", device="cpu"), first)
+        self.assertEqual(FakeModel.loads, 2)
+
+    def test_concurrent_requests_load_once(self):
+        models = []
+
+        def acquire():
+            models.append(self.registry.load(FakeModel, "latest", device="cpu"))
+        threads = [threading.Thread(target=acquire) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(FakeModel.loads, 1)
+        self.assertEqual(len({id(model) for model in models}), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+# tests/test_motion_gate.py
+
+import unittest
+import numpy as np
+from app.detection.motion_gate import MotionGate
+
+
+class TestMotionGate(unittest.TestCase):
+    def setUp(self):
+        self.background = np.full((480, 640, 3), 90, dtype=np.uint8)
+
+    def _with_box(self, x1, y1, x2, y2):
+        frame = self.background.copy()
+        frame[y1:y2, x1:x2] = 250
+        return frame
+
+    def test_static_frames_are_gated(self):
+        gate = MotionGate(threshold=0.01)
+        self.assertTrue(gate.should_process(self.background))  # no reference yet
+        for _ in range(5):
+            self.assertFalse(gate.should_process(self.background))
+
+        stats = gate.get_stats()
+        self.assertEqual(stats['processed'], 1)
+        self.assertEqual(stats['gated'], 5)
+
+    def test_motion_passes(self):
+        gate = MotionGate(threshold=0.01)
+        gate.should_process(self.background)
+        self.assertTrue(gate.should_process(self._with_box(200, 200, 360, 320)))
+
+    def test_motion_outside_roi_is_ignored(self):
+        # Only the lower half of the frame is watched
+        gate = MotionGate(threshold=0.01, roi=(0.0, 0.5, 1.0, 1.0))
+        gate.should_process(self.background)
+        self.assertFalse(gate.should_process(self._with_box(200, 20, 360, 200)))
+        self.assertTrue(gate.should_process(self._with_box(200, 300, 360, 460)))
+
+    def test_mog2_method(self):
+        gate = MotionGate(threshold=0.01, method='mog2')
+        for _ in range(10):
+            gate.should_process(self.background)
+        self.assertFalse(gate.should_process(self.background))
+        self.assertTrue(gate.should_process(self._with_box(200, 200, 360, 320)))
+
+    def test_invalid_configuration(self):
+        with self.assertRaises(ValueError):
+            MotionGate(method='optical_flow')
+        with self.assertRaises(ValueError):
+            MotionGate(roi=(0.5, 0.5, 0.2, 1.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+# tests/test_ort_tools.py
+
+import unittest
+import numpy as np
+from nomeroff_net.tools.ort_tools import letterbox, yolov8_postprocess
+
+
+def make_output(boxes, class_scores):
+    """[4 + classes, anchors] YOLOv8 output from (cx, cy, w, h) boxes and per-class scores"""
+    return np.concatenate([np.array(boxes, dtype=np.float32).T,
+                           np.array(class_scores, dtype=np.float32).T])
+
+
+class TestLetterbox(unittest.TestCase):
+    def test_wide_image_is_padded_top_and_bottom(self):
+        image = np.zeros((640, 1280, 3), dtype=np.uint8)
+        padded, gain, pad = letterbox(image, (640, 640))
+        self.assertEqual(padded.shape, (640, 640, 3))
+        self.assertEqual(gain, 0.5)
+        self.assertEqual(pad, (0.0, 160.0))
+        self.assertTrue((padded[:160] == 114).all())
+        self.assertTrue((padded[160:480] == 0).all())
+        self.assertTrue((padded[480:] == 114).all())
+
+    def test_odd_padding_is_split(self):
+        image = np.zeros((640, 639, 3), dtype=np.uint8)
+        padded, gain, pad = letterbox(image, (640, 640))
+        self.assertEqual(padded.shape, (640, 640, 3))
+        self.assertEqual(pad, (0.5, 0.0))
+
+
+class TestYolov8Postprocess(unittest.TestCase):
+    def test_nms_threshold_and_scaling(self):
+        output = make_output(
+            [(100, 200, 40, 20), (102, 201, 40, 20), (400, 300, 60, 30), (500, 500, 10, 10)],
+            [(0.9, 0.1), (0.1, 0.8), (0.2, 0.6), (0.3, 0.1)])
+        # the image was 640x1280 letterboxed to 640x640
+        boxes = yolov8_postprocess(output, gain=0.5, pad=(0., 160.), image_shape=(640, 1280),
+                                   min_accuracy=0.4, iou=0.7)
+
+        self.assertEqual(len(boxes), 2)
+        np.testing.assert_allclose(boxes[0][:4], [160, 60, 240, 100])
+        self.assertAlmostEqual(boxes[0][4], 0.9, places=6)
+        self.assertEqual(boxes[0][5], 0)
+        np.testing.assert_allclose(boxes[1][:4], [740, 250, 860, 310])
+        self.assertEqual(boxes[1][5], 1)
+
+    def test_boxes_are_clipped_to_the_image(self):
+        output = make_output([(10, 170, 40, 40)], [(0.9,)])
+        boxes = yolov8_postprocess(output, gain=0.5, pad=(0., 160.), image_shape=(640, 1280))
+        np.testing.assert_allclose(boxes[0][:4], [0, 0, 60, 60])
+
+    def test_no_box_above_min_accuracy(self):
+        output = make_output([(10, 10, 5, 5)], [(0.2,)])
+        self.assertEqual(yolov8_postprocess(output, 1., (0., 0.), (64, 64), min_accuracy=0.4), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+# tests/test_pipeline_base.py
+
+import itertools
+import threading
+import unittest
+from nomeroff_net.pipelines.base import Pipeline
+from nomeroff_net.tools.pipeline_tools import EXECUTORS, shutdown_executors
+
+
+class ArithmeticPipeline(Pipeline):
+    """preprocess doubles, forward adds one, postprocess adds the offset parameter"""
+
+    def preprocess(self, inputs, **params):
+        return [x * 2 for x in inputs]
+
+    def forward(self, inputs, **params):
+        return [x + 1 for x in inputs]
+
+    def postprocess(self, inputs, offset=0, **params):
+        return [x + offset for x in inputs]
+
+
+class FailingPipeline(ArithmeticPipeline):
+    """forward raises on the batch holding the input 3"""
+
+    def forward(self, inputs, **params):
+        if 3 * 2 in inputs:
+            raise RuntimeError("forward failed")
+        return super().forward(inputs, **params)
+
+
+class TestPipelineExecutors(unittest.TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutdown_executors()
+
+    def test_outputs_keep_order_and_length(self):
+        pipeline = ArithmeticPipeline("test", offset=100)
+        inputs = list(range(10))
+        expected = [x * 2 + 1 + 100 for x in inputs]
+        for executor in EXECUTORS:
+            with self.subTest(executor=executor):
+                # the last batch of 2 is smaller than num_workers
+                outputs = pipeline(inputs, batch_size=4, num_workers=3, executor=executor)
+                self.assertEqual(outputs, expected)
+
+    def test_single_worker_runs_inline(self):
+        pipeline = ArithmeticPipeline("test", executor="process", offset=1)
+        self.assertEqual(pipeline([1, 2, 3], batch_size=2), [4, 6, 8])
+
+    def test_process_executor_rejects_unpicklable_pipelines(self):
+        with self.assertRaises(ValueError):
+            ArithmeticPipeline("test", executor="process", lock=threading.RLock())
+
+        pipeline = ArithmeticPipeline("test", lock=threading.RLock())
+        with self.assertRaises(ValueError):
+            pipeline([1, 2], batch_size=2, num_workers=2, executor="process")
+        self.assertEqual(pipeline([1, 2], batch_size=2, num_workers=2, executor="thread"), [3, 5])
+
+
+
+class TestPipelineStream(unittest.TestCase):
+    def setUp(self):
+        self.threads = threading.active_count()
+
+    def test_stream_keeps_input_order(self):
+        pipeline = ArithmeticPipeline("test", offset=100)
+        inputs = list(range(23))
+        outputs = list(pipeline.stream(iter(inputs), batch_size=4, prefetch=1))
+        self.assertEqual(outputs, pipeline(inputs, batch_size=4))
+        self.assertEqual(outputs, [x * 2 + 1 + 100 for x in inputs])
+
+    def test_stage_error_reaches_the_consumer(self):
+        pipeline = FailingPipeline("test")
+        outputs = pipeline.stream([1, 2, 3, 4], batch_size=1)
+        self.assertEqual([next(outputs), next(outputs)], [3, 5])
+        with self.assertRaises(RuntimeError):
+            next(outputs)
+        self.assertEqual(threading.active_count(), self.threads)
+
+    def test_early_close_stops_the_stages(self):
+        pipeline = ArithmeticPipeline("test")
+        outputs = pipeline.stream(itertools.count(), batch_size=4, prefetch=1)
+        self.assertEqual([next(outputs) for _ in range(5)], [1, 3, 5, 7, 9])
+        outputs.close()
+        self.assertEqual(threading.active_count(), self.threads)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+# tests/test_plate_consensus.py
+
+import unittest
+import numpy as np
+from app.detection.plate_consensus import PlateConsensus, decode_probs
+
+LETTERS = "0123456789abc"
+
+
+def make_logits(text, confidence=0.9, seq_len=12, noise=None):
+    """CTC style logits: every character followed by a blank, padded with blanks"""
+    size = len(LETTERS) + 1
+    probs = np.full((seq_len, size), (1 - confidence) / (size - 1))
+    probs[:, 0] = confidence
+    for position, char in enumerate(text):
+        row = 2 * position
+        probs[row] = (1 - confidence) / (size - 1)
+        probs[row, LETTERS.index(char.lower()) + 1] = confidence
+    if noise:
+        for row, char in noise.items():
+            probs[row] = (1 - 0.55) / (size - 1)
+            probs[row, LETTERS.index(char) + 1] = 0.55
+    return np.log(probs)
+
+
+class TestPlateConsensus(unittest.TestCase):
+    def test_greedy_decode(self):
+        probs = np.exp(make_logits("ab12"))
+        text, confidences = decode_probs([probs], LETTERS)[0]
+        self.assertEqual(text, "AB12")
+        self.assertEqual(len(confidences), 4)
+        self.assertAlmostEqual(confidences[0], 0.9, places=5)
+
+    def test_repeated_characters_need_a_blank(self):
+        size = len(LETTERS) + 1
+        probs = np.zeros((4, size))
+        probs[[0, 1, 3], LETTERS.index('1') + 1] = 1.0
+        probs[2, 0] = 1.0
+        self.assertEqual(decode_probs([probs], LETTERS)[0][0], "11")
+
+    def test_noisy_frames_are_outvoted(self):
+        for method in PlateConsensus.METHODS:
+            consensus = PlateConsensus(method=method, stable_frames=3, min_confidence=0.5)
+            consensus.add(make_logits("ab123"), LETTERS)
+            consensus.add(make_logits("ab123", noise={2: '8'}), LETTERS)
+            text, confidence = consensus.add(make_logits("ab123"), LETTERS)
+            self.assertEqual(text, "AB123", method)
+            self.assertGreater(confidence, 0.5)
+
+    def test_weights_favour_confident_frames(self):
+        consensus = PlateConsensus(method='vote')
+        consensus.add(make_logits("ab123"), LETTERS, weight=0.9)
+        text, _ = consensus.add(make_logits("ab128"), LETTERS, weight=0.2)
+        self.assertEqual(text, "AB123")
+
+    def test_stability(self):
+        consensus = PlateConsensus(stable_frames=3, min_confidence=0.8)
+        consensus.add(make_logits("ab123"), LETTERS)
+        consensus.add(make_logits("ab123"), LETTERS)
+        self.assertFalse(consensus.is_stable)
+        consensus.add(make_logits("ab123"), LETTERS)
+        self.assertTrue(consensus.is_stable)
+        self.assertEqual(consensus.get_stats()['observations'], 3)
+
+        # Low confidence readings never become stable
+        unsure = PlateConsensus(stable_frames=2, min_confidence=0.8)
+        for _ in range(4):
+            unsure.add(make_logits("ab123", confidence=0.5), LETTERS)
+        self.assertEqual(unsure.text, "AB123")
+        self.assertFalse(unsure.is_stable)
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            PlateConsensus(method='median')
+
+
+if __name__ == '__main__':
+    unittest.main()
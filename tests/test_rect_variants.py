@@ -0,0 +1,125 @@
+# tests/test_rect_variants.py
+
+import math
+import unittest
+import collections
+from collections import OrderedDict
+import cv2
+import numpy as np
+from nomeroff_net.tools.image_processing import (distance,
+                                                 find_distances,
+                                                 get_y_by_matrix,
+                                                 get_cv_zone_rgb,
+                                                 reshape_points)
+from nomeroff_net.pipes.number_plate_keypoints_detectors.bbox_np_points_tools import (
+    add_point_offsets,
+    make_rect_variants,
+    make_rect_variants_array,
+    make_perspective_images,
+    normalize_perspective_images,
+    detect_best_perspective,
+)
+
+QUALITY_PROFILES = [[1, 0, 0, 0], [3, 1, 0, 0], [3, 1, 1, 0], [5, 2, 2, 0], [3, 1, 0, 1], [2, 1, 1, 1]]
+
+
+def reference_make_rect_variants(propably_points, quality_profile):
+    """make_rect_variants before vectorisation"""
+    steps, steps_plus, steps_minus = quality_profile[:3]
+    step = 1
+    step_adaptive = quality_profile[3] > 0
+    distanses = find_distances(propably_points)
+    point_centre_left = [propably_points[0][0] + (propably_points[1][0] - propably_points[0][0]) / 2,
+                         propably_points[0][1] + (propably_points[1][1] - propably_points[0][1]) / 2]
+    if distanses[3]["matrix"][1] == 0:
+        return [propably_points]
+    point_bottom_left = [point_centre_left[0], get_y_by_matrix(distanses[3]["matrix"], point_centre_left[0])]
+    dx = propably_points[0][0] - point_bottom_left[0]
+    dy = propably_points[0][1] - point_bottom_left[1]
+    dx_step = dx / steps
+    dy_step = dy / steps
+    if step_adaptive:
+        d_max = distance(point_centre_left, propably_points[0])
+        dd = math.sqrt(dx ** 2 + dy ** 2)
+        steps_all = int(d_max / dd)
+        step = int((steps_all * 2) / steps)
+        if step < 1:
+            step = 1
+        steps_minus = steps_all + steps_minus * step
+        steps_plus = steps_all + steps_plus * step
+    return [add_point_offsets(propably_points, i * dx_step, i * dy_step)
+            for i in range(-steps_minus, steps + steps_plus + 1, step)]
+
+
+def reference_detect_best_perspective(bw_images):
+    """detect_best_perspective before vectorisation"""
+    idx = 0
+    diff = 1000000
+    diff_cnt = 0
+    for i, img in enumerate(bw_images):
+        img_stat_dict = OrderedDict(collections.Counter(np.sum(img, axis=0)).most_common())
+        max_stat = max(img_stat_dict, key=int)
+        max_stat_count = img_stat_dict[max_stat]
+        min_stat = min(img_stat_dict, key=int)
+        min_stat_count = img_stat_dict[min_stat]
+        if min_stat < diff:
+            idx = i
+            diff = min_stat
+        if min_stat == diff and max_stat_count + min_stat_count > diff_cnt:
+            idx = i
+            diff_cnt = max_stat_count + min_stat_count
+    return idx
+
+
+def make_plate(rng):
+    """Slanted plate quad (bottom-left, top-left, top-right, bottom-right) on a noisy image with characters"""
+    image = rng.integers(0, 80, size=(240, 320, 3), dtype=np.uint8)
+    x0, y0 = rng.uniform(40, 90), rng.uniform(120, 170)
+    width, height, slope = rng.uniform(120, 180), rng.uniform(30, 50), rng.uniform(-0.15, 0.15)
+    shear = rng.uniform(-8, 8)
+    points = np.array([[x0, y0],
+                       [x0 + shear, y0 - height],
+                       [x0 + shear + width, y0 - height + slope * width],
+                       [x0 + width, y0 + slope * width]])
+    cv2.fillPoly(image, [points.astype(np.int32)], (230, 230, 230))
+    for i in range(6):
+        cv2.putText(image, "A", (int(x0 + shear / 2 + 8 + i * width / 7), int(y0 - height / 4)),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.9, (20, 20, 20), 2)
+    return image, points
+
+
+class TestRectVariants(unittest.TestCase):
+    def test_rect_variants_match_reference(self):
+        rng = np.random.default_rng(0)
+        for _ in range(20):
+            _, points = make_plate(rng)
+            for quality_profile in QUALITY_PROFILES:
+                expected = reference_make_rect_variants(points, quality_profile)
+                self.assertEqual(make_rect_variants(points, quality_profile), np.array(expected).tolist())
+                np.testing.assert_array_equal(make_rect_variants_array(points, quality_profile),
+                                              np.array(expected))
+
+    def test_vertical_bottom_side_gives_one_variant(self):
+        points = [[10.0, 50.0], [10.0, 20.0], [90.0, 20.0], [10.0, 60.0]]
+        self.assertEqual(make_rect_variants(points), [points])
+        np.testing.assert_array_equal(make_rect_variants_array(points), np.array([points]))
+
+    def test_best_perspective_matches_reference(self):
+        rng = np.random.default_rng(1)
+        for _ in range(20):
+            image, points = make_plate(rng)
+            for quality_profile in QUALITY_PROFILES:
+                variants = reference_make_rect_variants(points, quality_profile)
+                expected_images = normalize_perspective_images(
+                    [get_cv_zone_rgb(image, reshape_points(rect, 1)) for rect in variants])
+                bw_images = make_perspective_images(image, make_rect_variants_array(points, quality_profile))
+
+                self.assertEqual(len(bw_images), len(expected_images))
+                for bw_image, expected_image in zip(bw_images, expected_images):
+                    np.testing.assert_array_equal(bw_image, expected_image)
+                self.assertEqual(detect_best_perspective(bw_images),
+                                 reference_detect_best_perspective(expected_images))
+
+
+if __name__ == '__main__':
+    unittest.main()
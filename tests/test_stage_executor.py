@@ -0,0 +1,58 @@
+# tests/test_stage_executor.py
+
+import time
+import unittest
+from app.detection.stage_executor import StageExecutor
+
+
+class TestStageExecutor(unittest.TestCase):
+    def setUp(self):
+        self.executor = StageExecutor(max_workers=4)
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def test_independent_stages_overlap(self):
+        start = time.perf_counter()
+        results = self.executor.run({
+            'vehicles': (lambda: time.sleep(0.2) or 'v', ()),
+            'plates': (lambda: time.sleep(0.2) or 'p', ()),
+        })
+        self.assertLess(time.perf_counter() - start, 0.35)
+        self.assertEqual(results, {'vehicles': 'v', 'plates': 'p'})
+
+    def test_dependencies_receive_results(self):
+        order = []
+        results = self.executor.run({
+            'join': (lambda a, b: order.append('join') or a + b, ('a', 'b')),
+            'a': (lambda: order.append('a') or 1, ()),
+            'b': (lambda: order.append('b') or 2, ()),
+        })
+        self.assertEqual(results['join'], 3)
+        self.assertEqual(order[-1], 'join')
+
+    def test_map_keeps_order_and_records_timings(self):
+        self.assertEqual(self.executor.map('square', lambda x: x * x, range(5)), [0, 1, 4, 9, 16])
+        stats = self.executor.get_stats()['square']
+        self.assertEqual(stats['count'], 5)
+        self.assertEqual(stats['errors'], 0)
+
+    def test_errors_and_bad_graphs(self):
+        with self.assertRaises(ZeroDivisionError):
+            self.executor.run({'fail': (lambda: 1 / 0, ())})
+        self.assertEqual(self.executor.get_stats()['fail']['errors'], 1)
+        with self.assertRaises(ValueError):
+            self.executor.run({'a': (lambda: 1, ('missing',))})
+        with self.assertRaises(ValueError):
+            self.executor.run({'a': (lambda b: 1, ('b',)), 'b': (lambda a: 1, ('a',))})
+
+    def test_single_worker_runs_inline(self):
+        executor = StageExecutor(max_workers=1)
+        self.assertIsNone(executor.pool)
+        results = executor.run({'a': (lambda: 1, ()), 'b': (lambda a: a + 1, ('a',))})
+        self.assertEqual(results, {'a': 1, 'b': 2})
+        self.assertEqual(executor.map('x', str, [1, 2]), ['1', '2'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+# tests/test_stream_manager.py
+
+import time
+import shutil
+import tempfile
+import unittest
+import cv2
+import numpy as np
+from pathlib import Path
+from app.detection.stream_manager import StreamManager, is_live_source
+
+
+class FakeDetector:
+    """Stands in for LicensePlateDetector.process_frames"""
+
+    def __init__(self):
+        self.batches = []
+
+    def process_frames(self, frames, camera_ids=None):
+        self.batches.append(list(camera_ids))
+        return [(frame, [{'text': f"PLATE-{camera_id}", 'camera_id': camera_id}])
+                for frame, camera_id in zip(frames, camera_ids)]
+
+    def flush_tracks(self, camera_id=None):
+        pass
+
+
+class TestStreamManager(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = Path(tempfile.mkdtemp())
+        cls.video_path = str(cls.temp_dir / "test.avi")
+        writer = cv2.VideoWriter(cls.video_path, cv2.VideoWriter_fourcc(*'MJPG'), 10, (64, 48))
+        for i in range(10):
+            writer.write(np.full((48, 64, 3), i * 20, dtype=np.uint8))
+        writer.release()
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.temp_dir)
+
+    def _wait_finished(self, manager, timeout=10):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            streams = manager.get_stats()['streams'].values()
+            if all(stream['finished'] for stream in streams):
+                return
+            time.sleep(0.05)
+        self.fail("Streams did not finish")
+
+    def test_live_source_detection(self):
+        self.assertTrue(is_live_source('rtsp://10.0.0.2/stream'))
+        self.assertTrue(is_live_source(0))
+        self.assertTrue(is_live_source('picamera'))
+        self.assertFalse(is_live_source('uploads/video.mp4'))
+
+    def test_frames_from_all_cameras_share_batches(self):
+        detector = FakeDetector()
+        manager = StreamManager(detector, batch_size=4)
+        manager.add_stream('cam1', self.video_path)
+        manager.add_stream('cam2', self.video_path)
+        self._wait_finished(manager)
+        stats = manager.get_stats()
+        manager.stop()
+
+        # Files are not dropped: every frame of both cameras was processed
+        self.assertEqual(stats['streams']['cam1']['processed'], 10)
+        self.assertEqual(stats['streams']['cam2']['processed'], 10)
+        # No batch holds two frames of the same camera
+        for camera_ids in detector.batches:
+            self.assertEqual(len(camera_ids), len(set(camera_ids)))
+        self.assertTrue(any(len(camera_ids) == 2 for camera_ids in detector.batches))
+
+    def test_detections_are_kept_per_camera(self):
+        manager = StreamManager(FakeDetector())
+        stream = manager.add_stream('gate', self.video_path, frame_skip=2)
+        self._wait_finished(manager)
+        manager.stop()
+
+        self.assertEqual(stream.processed, 5)
+        self.assertEqual(stream.skipped, 5)
+        self.assertEqual(stream.detected_plates, [{'text': 'PLATE-gate', 'camera_id': 'gate'}])
+
+    def test_duplicate_camera_id_is_rejected(self):
+        manager = StreamManager(FakeDetector())
+        manager.add_stream('cam1', self.video_path)
+        with self.assertRaises(ValueError):
+            manager.add_stream('cam1', self.video_path)
+        manager.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
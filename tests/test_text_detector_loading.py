@@ -0,0 +1,106 @@
+# tests/test_text_detector_loading.py
+
+import unittest
+import numpy as np
+from types import SimpleNamespace
+from nomeroff_net.pipes.number_plate_text_readers.text_detector import TextDetector
+from nomeroff_net.tools.errors import TextDetectorError
+
+PRESETS = {
+    "eu": {"for_regions": ["eu", "xx_unknown"], "model_path": "latest"},
+    "ru": {"for_regions": ["ru"], "model_path": "latest"},
+    "kz": {"for_regions": ["kz"], "model_path": "latest"},
+    "ge": {"for_regions": ["ge"], "model_path": "latest"},
+}
+
+
+class FakeOCR:
+    size_mb = 10.
+
+    def __init__(self, name):
+        self.name = name
+
+    def preprocess(self, zones, need_preprocess=True):
+        return zones
+
+    def forward(self, xs):
+        return xs
+
+    def postprocess(self, ys, return_acc=False):
+        return [self.name] * len(ys)
+
+
+class FakeTextDetector(TextDetector):
+    """Counts model creations instead of downloading and loading OCR weights"""
+
+    def __init__(self, *args, **kwargs):
+        self.created = []
+        super().__init__(PRESETS, "eu", *args, **kwargs)
+
+    def create_detector(self, detector_name):
+        self.created.append(detector_name)
+        return FakeOCR(detector_name)
+
+    @staticmethod
+    def model_size_mb(detector):
+        return detector.size_mb
+
+
+class TestTextDetectorLoading(unittest.TestCase):
+    def route(self, text_detector, labels):
+        zones = [np.zeros((8, 8, 3), dtype=np.uint8) for _ in labels]
+        return text_detector.define_order_detector(zones, labels)
+
+    def test_eager_loading_loads_every_preset(self):
+        text_detector = FakeTextDetector()
+        self.assertEqual(text_detector.created, ["eu", "ru", "kz", "ge"])
+
+    def test_lazy_loading_on_first_routed_zone(self):
+        text_detector = FakeTextDetector(lazy_load=True, preload=["eu"])
+        self.assertEqual(text_detector.created, ["eu"])
+
+        self.route(text_detector, ["ru", "ru", "xx_unknown"])
+        self.route(text_detector, ["ru"])
+        self.assertEqual(text_detector.created, ["eu", "ru"])
+        self.assertEqual(text_detector.get_module("ru").name, "ru")
+
+    def test_least_recently_used_model_is_evicted(self):
+        text_detector = FakeTextDetector(lazy_load=True, preload=["xx_unknown"], memory_budget_mb=25)
+        self.route(text_detector, ["ru"])
+        self.route(text_detector, ["kz"])
+        # eu is pinned through its region, ru was used least recently
+        self.assertEqual(list(text_detector.get_loaded_models()), ["eu", "kz"])
+        self.assertIsNone(text_detector.detectors[1])
+
+        self.route(text_detector, ["ru"])
+        self.assertEqual(text_detector.created, ["eu", "ru", "kz", "ru"])
+        self.assertEqual(list(text_detector.get_loaded_models()), ["eu", "ru"])
+
+    def test_models_of_one_batch_are_kept_over_budget(self):
+        text_detector = FakeTextDetector(lazy_load=True, memory_budget_mb=15)
+        predicted = self.route(text_detector, ["ru", "kz", "ge"])
+        for key in predicted:
+            self.assertIsNotNone(text_detector.detectors[key])
+        self.assertEqual(len(text_detector.get_loaded_models()), 3)
+
+    def test_over_budget_batch_loads_each_model_once(self):
+        text_detector = FakeTextDetector(lazy_load=True, memory_budget_mb=15)
+        zones = [np.zeros((8, 8, 3), dtype=np.uint8) for _ in range(3)]
+        predicted = text_detector.preprocess(zones, ["ru", "kz", "ru"])
+        texts = text_detector.postprocess(text_detector.forward(predicted))
+
+        self.assertEqual(texts, ["ru", "kz", "ru"])
+        self.assertEqual(text_detector.created, ["ru", "kz"])
+
+    def test_recorded_size_is_used_for_quantized_models(self):
+        # the packed weights of a quantised TorchScript model are not in parameters()
+        self.assertEqual(TextDetector.model_size_mb(SimpleNamespace(size_mb=3.5, model=object())), 3.5)
+        self.assertEqual(TextDetector.model_size_mb(SimpleNamespace(size_mb=None, model=None)), 0.)
+
+    def test_unknown_preload_is_rejected(self):
+        with self.assertRaises(TextDetectorError):
+            FakeTextDetector(lazy_load=True, preload=["nowhere"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+# tests/test_timeseries_write_stats.py
+
+import unittest
+from app.database.timeseries_db import TimeSeriesDB
+
+
+class FakeWriteApi:
+    def __init__(self):
+        self.records = []
+        self.closed = False
+
+    def write(self, bucket, org, record):
+        self.records.extend(record)
+
+    def close(self):
+        self.closed = True
+
+
+def make_db(batching=True):
+    events = []
+    db = TimeSeriesDB("http://localhost:8086", "token", "org", "bucket", batching=batching,
+                      metrics_callback=lambda event, stats: events.append((event, stats)))
+    db.client = object()
+    db.write_api = FakeWriteApi()
+    return db, events
+
+
+class TestTimeSeriesWriteStats(unittest.TestCase):
+    def test_count_lines(self):
+        self.assertEqual(TimeSeriesDB._count_lines(b"a v=1 1\nb v=2 2\n"), 2)
+        self.assertEqual(TimeSeriesDB._count_lines("a v=1 1\n\n  \nb v=2 2"), 2)
+        self.assertEqual(TimeSeriesDB._count_lines(""), 0)
+
+    def test_batched_writes_are_pending_until_the_callbacks(self):
+        db, events = make_db()
+        db._write_points(["p1", "p2", "p3", "p4", "p5"])
+        self.assertEqual(db.get_write_stats(),
+                         {'queued': 5, 'written': 0, 'failed': 0, 'retries': 0, 'pending': 5})
+
+        db._on_write_retry(None, b"p1\np2", Exception("timeout"))
+        db._on_write_success(None, b"p1\np2\np3")
+        db._on_write_error(None, "p4", Exception("gave up"))
+
+        self.assertEqual(db.get_write_stats(),
+                         {'queued': 5, 'written': 3, 'failed': 1, 'retries': 1, 'pending': 1})
+        self.assertEqual([event for event, _ in events], ['retry', 'written', 'failed'])
+        self.assertEqual(events[-1][1]['pending'], 1)
+
+    def test_synchronous_writes_count_as_written(self):
+        db, _ = make_db(batching=False)
+        db._write_points(["p1", "p2"])
+        self.assertEqual(db.get_write_stats(),
+                         {'queued': 0, 'written': 2, 'failed': 0, 'retries': 0, 'pending': 0})
+
+    def test_disconnect_without_client_drops_the_write_api(self):
+        db, _ = make_db()
+        write_api = db.write_api
+        db.client = None
+        db.disconnect()
+        self.assertTrue(write_api.closed)
+        self.assertIsNone(db.write_api)
+
+
+if __name__ == '__main__':
+    unittest.main()
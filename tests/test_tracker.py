@@ -0,0 +1,67 @@
+# tests/test_tracker.py
+
+import unittest
+import numpy as np
+from app.detection.tracker import SortTracker, iou_matrix, greedy_match
+
+
+class TestTracker(unittest.TestCase):
+    def test_iou_matrix(self):
+        iou = iou_matrix(np.array([[0, 0, 10, 10]]), np.array([[0, 0, 10, 10], [5, 0, 15, 10], [20, 20, 30, 30]]))
+        np.testing.assert_allclose(iou, [[1.0, 50 / 150, 0.0]])
+        self.assertEqual(iou_matrix(np.zeros((0, 4)), np.zeros((3, 4))).shape, (0, 3))
+
+    def test_greedy_match_prefers_highest_iou(self):
+        iou = np.array([[0.9, 0.5],
+                        [0.8, 0.1]])
+        self.assertEqual(greedy_match(iou, 0.3), [(0, 0)])
+        self.assertEqual(greedy_match(iou, 0.05), [(0, 0), (1, 1)])
+
+    def test_moving_box_keeps_its_track_id(self):
+        tracker = SortTracker(iou_threshold=0.3, max_age=2)
+        track_ids = []
+        for step in range(10):
+            x = 100 + step * 8
+            tracks, finished = tracker.update(np.array([[x, 200, x + 80, 230, 0.9]]))
+            track_ids.append(tracks[0].track_id)
+            self.assertEqual(finished, [])
+        self.assertEqual(set(track_ids), {track_ids[0]})
+        self.assertEqual(tracker.tracks[0].hits, 10)
+
+    def test_two_objects_get_separate_tracks(self):
+        tracker = SortTracker()
+        tracks, _ = tracker.update(np.array([[0, 0, 50, 20, 0.9], [300, 300, 350, 320, 0.8]]))
+        self.assertNotEqual(tracks[0].track_id, tracks[1].track_id)
+        tracks_again, _ = tracker.update(np.array([[302, 301, 352, 321, 0.8], [2, 1, 52, 21, 0.9]]))
+        self.assertIs(tracks_again[0], tracks[1])
+        self.assertIs(tracks_again[1], tracks[0])
+
+    def test_track_finishes_after_max_age(self):
+        tracker = SortTracker(max_age=2)
+        tracks, _ = tracker.update(np.array([[0, 0, 50, 20, 0.9]]))
+        self.assertEqual(tracker.update(np.zeros((0, 5)))[1], [])
+        self.assertEqual(tracker.update(np.zeros((0, 5)))[1], [])
+        _, finished = tracker.update(np.zeros((0, 5)))
+        self.assertEqual(finished, [tracks[0]])
+        self.assertEqual(tracker.tracks, [])
+
+    def test_recognition_refresh_interval(self):
+        tracker = SortTracker()
+        track = tracker.update(np.array([[0, 0, 50, 20, 0.9]]))[0][0]
+        self.assertTrue(track.needs_recognition(tracker.frame_index, 3))
+        track.mark_recognized(tracker.frame_index)
+        for _ in range(2):
+            tracker.update(np.array([[0, 0, 50, 20, 0.9]]))
+            self.assertFalse(track.needs_recognition(tracker.frame_index, 3))
+        tracker.update(np.array([[0, 0, 50, 20, 0.9]]))
+        self.assertTrue(track.needs_recognition(tracker.frame_index, 3))
+
+    def test_flush_ends_all_tracks(self):
+        tracker = SortTracker()
+        tracker.update(np.array([[0, 0, 50, 20, 0.9], [100, 0, 150, 20, 0.9]]))
+        self.assertEqual(len(tracker.flush()), 2)
+        self.assertEqual(tracker.tracks, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+# tests/test_unified_detector.py
+
+import unittest
+from types import SimpleNamespace
+import numpy as np
+from app.detection.unified_detector import UnifiedVehiclePlateDetector
+
+
+class FakeTensor:
+    def __init__(self, values):
+        self.values = np.asarray(values)
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self.values
+
+
+def make_result(rows):
+    rows = np.asarray(rows, dtype=np.float32).reshape(-1, 6)
+    return SimpleNamespace(boxes=SimpleNamespace(xyxy=FakeTensor(rows[:, :4]),
+                                                 conf=FakeTensor(rows[:, 4]),
+                                                 cls=FakeTensor(rows[:, 5])))
+
+
+def make_detector():
+    # skip model loading, only the class maps and thresholds are needed to parse results
+    detector = UnifiedVehiclePlateDetector.__new__(UnifiedVehiclePlateDetector)
+    detector.confidence_threshold = 0.3
+    detector.plate_confidence_threshold = 0.4
+    detector.vehicle_classes = {2: 'car', 7: 'truck'}
+    detector.plate_classes = {80: 'numberplate'}
+    return detector
+
+
+class TestUnifiedDetector(unittest.TestCase):
+    def test_result_is_split_into_vehicles_and_plates(self):
+        image = np.zeros((480, 640, 3), dtype=np.uint8)
+        result = make_result([[10, 20, 300, 400, 0.9, 2],
+                              [100, 300, 180, 330, 0.8, 80],
+                              [0, 0, 50, 50, 0.9, 0],       # person
+                              [400, 20, 600, 400, 0.2, 7],  # vehicle below threshold
+                              [420, 300, 500, 330, 0.35, 80]])  # plate below threshold
+        vehicles, plates = make_detector()._parse_result(result, image)
+
+        self.assertEqual(len(vehicles), 1)
+        self.assertEqual(vehicles[0]['bbox'], (10, 20, 300, 400))
+        self.assertEqual(vehicles[0]['class'], 'car')
+        self.assertEqual(vehicles[0]['image'].shape, (380, 290, 3))
+        np.testing.assert_allclose(plates, [[100, 300, 180, 330, 0.8, 80]], rtol=1e-6)
+
+    def test_empty_result(self):
+        vehicles, plates = make_detector()._parse_result(make_result([]), np.zeros((10, 10, 3), dtype=np.uint8))
+        self.assertEqual(vehicles, [])
+        self.assertEqual(plates.shape, (0, 6))
+
+
+if __name__ == '__main__':
+    unittest.main()